@@ -0,0 +1,128 @@
+import base64
+import json
+import uuid
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique sort key, e.g. (created_at, id).
+
+    The cursor holds the sort key of the last row served, and the next page is
+    `WHERE key < cursor` (or `>` ascending) on an index, so every page costs the
+    same regardless of how deep it is and rows inserted meanwhile don't shift
+    pages. Sorting by a score leaves out jobs that have no score yet.
+    """
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    page_size_query_param = 'page_size'
+
+    # Public ordering -> sort key, all in one direction and ending in unique `id`
+    orderings = {
+        '-created_at': ('created_at', 'id'),
+        'created_at': ('created_at', 'id'),
+        '-cv_match_rate': ('cv_match_rate', 'created_at', 'id'),
+        'cv_match_rate': ('cv_match_rate', 'created_at', 'id'),
+        '-project_score': ('project_score', 'created_at', 'id'),
+        'project_score': ('project_score', 'created_at', 'id'),
+    }
+    default_ordering = '-created_at'
+    nullable_keys = ('cv_match_rate', 'project_score')
+
+    def get_page_size(self, request) -> int:
+        default = getattr(settings, 'JOB_LIST_PAGE_SIZE', 50)
+        maximum = getattr(settings, 'JOB_LIST_MAX_PAGE_SIZE', 200)
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            raise ValidationError({self.page_size_query_param: "Ukuran halaman harus berupa angka"})
+        return max(1, min(size, maximum))
+
+    def get_ordering(self, request) -> str:
+        ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if ordering not in self.orderings:
+            raise ValidationError({
+                self.ordering_query_param: f"Urutan tidak dikenal (pilihan: {', '.join(self.orderings)})",
+            })
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(request)
+        self.page_size = self.get_page_size(request)
+        keys = self.orderings[self.ordering]
+        descending = self.ordering.startswith('-')
+
+        queryset = queryset.filter(**{f"{key}__isnull": False for key in keys if key in self.nullable_keys})
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(keys, self.decode_cursor(cursor, keys), descending))
+        queryset = queryset.order_by(*(f"-{key}" if descending else key for key in keys))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.last_values = [getattr(rows[-1], key) for key in keys] if rows else None
+        return rows
+
+    @staticmethod
+    def after(keys, values, descending) -> Q:
+        """Rows strictly past `values` in sort order: (a < x) OR (a = x AND b < y) OR ..."""
+        lookup = 'lt' if descending else 'gt'
+        clauses = []
+        for index, key in enumerate(keys):
+            equal = {prefix: value for prefix, value in zip(keys[:index], values[:index])}
+            clauses.append(Q(**equal, **{f"{key}__{lookup}": values[index]}))
+        return reduce(lambda left, right: left | right, clauses)
+
+    def encode_cursor(self, values) -> str:
+        payload = [self.ordering, [value.isoformat() if hasattr(value, 'isoformat') else
+                                   str(value) if isinstance(value, uuid.UUID) else value for value in values]]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str, keys) -> list:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            ordering, raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if ordering != self.ordering or len(raw) != len(keys):
+                raise ValueError(cursor)
+            values = []
+            for key, value in zip(keys, raw):
+                if key == 'created_at':
+                    value = parse_datetime(value)
+                    if value is None:
+                        raise ValueError(cursor)
+                elif key == 'id':
+                    value = uuid.UUID(value)
+                else:
+                    value = float(value)
+                values.append(value)
+            return values
+        except (TypeError, ValueError, AttributeError):
+            raise ValidationError({self.cursor_query_param: "Cursor tidak valid"})
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_values))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
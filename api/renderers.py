@@ -0,0 +1,15 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets clients negotiate `text/event-stream`. Successful responses stream their
+    own events; anything rendered here is an error payload sent as a single event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        payload = JSONRenderer().render(data).decode()
+        return f"event: error\ndata: {payload}\n\n".encode()
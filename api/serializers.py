@@ -1,14 +1,17 @@
 from rest_framework import serializers
 from django.conf import settings
-from core.domain.models import UploadedFile, EvaluationJob
+from django.db.models import Count
+from core.domain.models import UploadedFile, EvaluationBatch, EvaluationJob
+from core.infra.persistence.scheduler import FairShareScheduler
+from core.infra.uploads import digest_upload
 
 class UploadedFileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UploadedFile
-        fields = ['id', 'file', 'uploaded_at']
+        fields = ['id', 'file', 'uploaded_at', 'sha256']
 
     def validate_file(self, file):
-        """Validate uploaded file size and content type."""
+        """Validate uploaded file size, and its content type as sniffed from its magic bytes."""
         max_size = getattr(settings, 'FILE_UPLOAD_MAX_MEMORY_SIZE', 2 * 1024 * 1024)
         if file.size > max_size:
             raise serializers.ValidationError(f"File terlalu besar (max {max_size // 1024} KB)")
@@ -18,8 +21,8 @@ class UploadedFileSerializer(serializers.ModelSerializer):
             'application/msword',
             'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
         ]
-        content_type = getattr(file, 'content_type', None)
-        if content_type and content_type not in allowed:
+        # The client-supplied content type is not trusted
+        if digest_upload(file).sniffed_content_type not in allowed:
             raise serializers.ValidationError("Tipe file tidak diizinkan")
 
         return file
@@ -29,7 +32,129 @@ class EvaluationJobSerializer(serializers.ModelSerializer):
         model = EvaluationJob
         fields = '__all__'
 
+    def to_representation(self, job):
+        """Adds `queue_position` and `estimated_start` while the job is waiting to run."""
+        data = super().to_representation(job)
+        queue_info = FairShareScheduler().queue_info(job)
+        data['queue_position'] = queue_info['queue_position']
+        data['estimated_start'] = serializers.DateTimeField().to_representation(queue_info['estimated_start']) \
+            if queue_info['estimated_start'] else None
+        return data
+
+class EvaluationJobListSerializer(serializers.ModelSerializer):
+    """Listing representation: scores and metadata, without the feedback texts."""
+
+    class Meta:
+        model = EvaluationJob
+        fields = [
+            'id', 'job_title', 'status', 'priority', 'batch', 'cv', 'project_report',
+            'cv_match_rate', 'project_score', 'prescreen_score', 'created_at', 'updated_at',
+        ]
+
+class EvaluationJobListWithFeedbackSerializer(EvaluationJobListSerializer):
+    class Meta(EvaluationJobListSerializer.Meta):
+        fields = EvaluationJobListSerializer.Meta.fields + ['cv_feedback', 'project_feedback', 'overall_summary']
+
+class JobListQuerySerializer(serializers.Serializer):
+    """Filters of GET /api/jobs/."""
+    status = serializers.ChoiceField(choices=EvaluationJob.STATUS_CHOICES, required=False)
+    job_title = serializers.CharField(max_length=255, required=False)
+    batch = serializers.UUIDField(required=False)
+    min_cv_match_rate = serializers.FloatField(required=False, min_value=0.0, max_value=1.0)
+    max_cv_match_rate = serializers.FloatField(required=False, min_value=0.0, max_value=1.0)
+    min_project_score = serializers.FloatField(required=False, min_value=1.0, max_value=5.0)
+    max_project_score = serializers.FloatField(required=False, min_value=1.0, max_value=5.0)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    include_feedback = serializers.BooleanField(required=False, default=False)
+
+    # Query parameter -> queryset lookup
+    LOOKUPS = {
+        'status': 'status',
+        'job_title': 'job_title',
+        'batch': 'batch_id',
+        'min_cv_match_rate': 'cv_match_rate__gte',
+        'max_cv_match_rate': 'cv_match_rate__lte',
+        'min_project_score': 'project_score__gte',
+        'max_project_score': 'project_score__lte',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lt',
+    }
+
+    def filters(self) -> dict:
+        return {
+            lookup: self.validated_data[param]
+            for param, lookup in self.LOOKUPS.items() if param in self.validated_data
+        }
+
 class EvaluationRequestSerializer(serializers.Serializer):
     job_title = serializers.CharField(max_length=255)
     cv_id = serializers.UUIDField()
     project_report_id = serializers.UUIDField()
+    # Re-run even if an identical request already has a completed result
+    force = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        """Resolve both uploads, so the view can hash their contents."""
+        file_ids = {attrs['cv_id'], attrs['project_report_id']}
+        uploads = UploadedFile.objects.in_bulk(file_ids)
+        missing = file_ids - set(uploads)
+        if missing:
+            raise serializers.ValidationError(
+                f"File tidak ditemukan: {', '.join(sorted(str(file_id) for file_id in missing))}"
+            )
+        attrs['cv'] = uploads[attrs['cv_id']]
+        attrs['project_report'] = uploads[attrs['project_report_id']]
+        return attrs
+
+class BatchCandidateSerializer(serializers.Serializer):
+    cv_id = serializers.UUIDField()
+    project_report_id = serializers.UUIDField()
+
+class ShortlistQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=200)
+
+class BatchEvaluationRequestSerializer(serializers.Serializer):
+    job_title = serializers.CharField(max_length=255)
+    candidates = BatchCandidateSerializer(many=True, allow_empty=False)
+    # Defaults to the EVALUATION_PRESCREEN setting
+    prescreen = serializers.ChoiceField(choices=EvaluationBatch.PRESCREEN_CHOICES, required=False)
+
+    def validate_candidates(self, candidates):
+        """Validate batch size and that every referenced file exists, in a single query."""
+        max_size = getattr(settings, 'EVALUATION_BATCH_MAX_SIZE', 500)
+        if len(candidates) > max_size:
+            raise serializers.ValidationError(f"Batch terlalu besar (max {max_size} kandidat)")
+
+        file_ids = set()
+        for candidate in candidates:
+            file_ids.add(candidate['cv_id'])
+            file_ids.add(candidate['project_report_id'])
+        found = set(UploadedFile.objects.filter(id__in=file_ids).values_list('id', flat=True))
+        missing = file_ids - found
+        if missing:
+            raise serializers.ValidationError(
+                f"File tidak ditemukan: {', '.join(sorted(str(file_id) for file_id in missing))}"
+            )
+
+        return candidates
+
+class EvaluationBatchSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EvaluationBatch
+        fields = ['id', 'job_title', 'created_at', 'prescreen', 'prescreened_at', 'progress']
+
+    def get_progress(self, batch):
+        """Aggregate job counts per status with one grouped query."""
+        counts = {choice: 0 for choice, _ in EvaluationJob.STATUS_CHOICES}
+        for row in batch.jobs.values('status').annotate(count=Count('id')).order_by():
+            counts[row['status']] = row['count']
+        total = sum(counts.values())
+        done = sum(counts[status] for status in EvaluationJob.TERMINAL_STATUSES)
+        return {
+            'total': total,
+            **counts,
+            'percent_done': round(100 * done / total, 1) if total else 0.0,
+        }
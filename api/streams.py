@@ -0,0 +1,41 @@
+import threading
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TooManyStreams(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Terlalu banyak koneksi terbuka, coba lagi nanti'
+    default_code = 'too_many_streams'
+    # DRF's exception handler turns `wait` into a Retry-After header
+    wait = 5
+
+
+class StreamSlots:
+    """
+    Per-process cap on requests held open by long-polls and event streams.
+
+    Each one occupies a Gunicorn thread for up to its timeout, so the cap
+    (`RESULT_MAX_OPEN_STREAMS`) is kept below the worker's thread count to leave
+    threads free for ordinary requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = 0
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self._open >= getattr(settings, 'RESULT_MAX_OPEN_STREAMS', 6):
+                return False
+            self._open += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._open -= 1
+
+
+stream_slots = StreamSlots()
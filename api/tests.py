@@ -1,13 +1,27 @@
 from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib import admin
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
 from rest_framework import status
 from io import BytesIO
+from unittest import mock
+import datetime
+import hashlib
 import json
+import tempfile
+import threading
+import time
+import zipfile
 
-from core.domain.models import UploadedFile, EvaluationJob
+from core.domain.models import UploadedFile, EvaluationBatch, EvaluationJob
 from api.serializers import UploadedFileSerializer, EvaluationRequestSerializer
+from api.views import BatchEvaluateView, EvaluateView, UploadView
+from core.infra.events import get_job_event_bus
+from core.infra.persistence.django_repository import DjangoEvaluationRepository
+from core.infra.persistence.result_cache import get_result_cache
 
 
 class UploadViewThrottleTests(TestCase):
@@ -120,6 +134,69 @@ class FileUploadValidationTests(TestCase):
         serializer = UploadedFileSerializer(data={'file': file})
 
 
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+@mock.patch.object(UploadView, 'throttle_classes', [])
+class ContentAddressedUploadTests(TestCase):
+    """Test hashing, type sniffing and content-addressed storage of uploads."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, name, content, content_type='application/pdf'):
+        return self.client.post('/api/upload/', {'file': SimpleUploadedFile(name, content, content_type=content_type)})
+
+    def test_identical_uploads_share_one_stored_file(self):
+        """Test that the same bytes uploaded twice get two records but one file named by their hash."""
+        content = b'%PDF-1.4\n' + b'x' * (200 * 1024)
+        first = self.upload('first.pdf', content)
+        second = self.upload('second.PDF', content)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(first.data['id'], second.data['id'])
+        self.assertEqual(first.data['sha256'], hashlib.sha256(content).hexdigest())
+        uploads = UploadedFile.objects.all()
+        self.assertEqual({upload.file.name for upload in uploads},
+                         {f"uploads/{first.data['sha256'][:2]}/{first.data['sha256']}.pdf"})
+
+    def test_type_is_sniffed_from_content(self):
+        """Test that a file whose bytes are not a document is rejected despite its declared type."""
+        response = self.upload('resume.pdf', b'MZ\x90\x00 not a pdf')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', response.data)
+
+    def test_only_zip_files_with_word_parts_count_as_docx(self):
+        """Test that a DOCX is accepted and another ZIP container (e.g. xlsx) is rejected."""
+        def zipped(part):
+            buffer = BytesIO()
+            with zipfile.ZipFile(buffer, 'w') as archive:
+                archive.writestr('[Content_Types].xml', '<Types/>')
+                archive.writestr(part, '<document/>')
+            return buffer.getvalue()
+
+        docx_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        docx = self.upload('resume.docx', zipped('word/document.xml'), content_type=docx_type)
+        xlsx = self.upload('resume.docx', zipped('xl/workbook.xml'), content_type=docx_type)
+
+        self.assertEqual(docx.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(UploadedFile.objects.get(id=docx.data['id']).file.name.endswith('.docx'))
+        self.assertEqual(xlsx.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_file_saved_in_code_is_hashed_and_content_addressed(self):
+        """Test that `upload.file.save()` names the file after its content and records its hash."""
+        content = b'%PDF-1.4 created in code'
+        sha256 = hashlib.sha256(content).hexdigest()
+        upload = UploadedFile()
+        upload.file.save('report.pdf', ContentFile(content))
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.sha256, sha256)
+        self.assertEqual(upload.file.name, f"uploads/{sha256[:2]}/{sha256}.pdf")
+
+
 class UnauthenticatedAccessTests(TestCase):
     """Test that unauthenticated users cannot access protected endpoints."""
 
@@ -144,3 +221,494 @@ class UnauthenticatedAccessTests(TestCase):
             content_type='application/json'
         )
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BatchEvaluateViewTests(TestCase):
+    """Test bulk job creation through the batch evaluation endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.batch_url = '/api/evaluate/batch/'
+        self.files = [
+            UploadedFile.objects.create(file=f'uploads/file_{i}.pdf') for i in range(4)
+        ]
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_batch_creates_bulk_jobs_dispatched_by_scheduler(self, mock_apply_async):
+        """Test that every candidate becomes a bulk job that the fair-share scheduler sends to the bulk queue."""
+        data = {
+            'job_title': 'Backend Developer',
+            'candidates': [
+                {'cv_id': str(self.files[0].id), 'project_report_id': str(self.files[1].id)},
+                {'cv_id': str(self.files[2].id), 'project_report_id': str(self.files[3].id)},
+            ],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.batch_url, data=json.dumps(data), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['progress']['total'], 2)
+        self.assertEqual(response.data['progress']['queued'], 2)
+        jobs = EvaluationJob.objects.filter(batch_id=response.data['id'])
+        self.assertEqual(jobs.count(), 2)
+        self.assertEqual(set(jobs.values_list('priority', 'owner')), {('bulk', self.user.id)})
+        self.assertEqual(mock_apply_async.call_count, 2)
+        self.assertEqual(mock_apply_async.call_args.kwargs['queue'], 'bulk')
+
+    def test_batch_rejects_unknown_files(self):
+        """Test that a batch referencing a missing upload is rejected as a whole."""
+        import uuid
+        data = {
+            'job_title': 'Backend Developer',
+            'candidates': [{'cv_id': str(self.files[0].id), 'project_report_id': str(uuid.uuid4())}],
+        }
+        response = self.client.post(self.batch_url, data=json.dumps(data), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(EvaluationBatch.objects.exists())
+
+    def test_batch_progress_aggregates_statuses(self):
+        """Test that batch progress counts jobs per status."""
+        batch = EvaluationBatch.objects.create(job_title='Backend Developer')
+        for job_status in ['completed', 'failed', 'processing', 'queued']:
+            EvaluationJob.objects.create(
+                batch=batch, job_title='Backend Developer', status=job_status,
+                cv=self.files[0], project_report=self.files[1],
+            )
+
+        response = self.client.get(f'{self.batch_url}{batch.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['progress']['total'], 4)
+        self.assertEqual(response.data['progress']['percent_done'], 50.0)
+
+    @mock.patch.object(BatchEvaluateView, 'throttle_classes', [])
+    @mock.patch('api.views.dispatch_bulk_jobs')
+    @mock.patch('api.views.prescreen_batch.apply_async')
+    def test_prescreened_batch_is_scored_before_dispatch(self, mock_prescreen, mock_dispatch):
+        """Test that a pre-screened batch goes to the pre-screen task, on the bulk queue, instead of the scheduler."""
+        data = {
+            'job_title': 'Backend Developer',
+            'prescreen': 'filter',
+            'candidates': [{'cv_id': str(self.files[0].id), 'project_report_id': str(self.files[1].id)}],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.batch_url, data=json.dumps(data), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['prescreen'], 'filter')
+        mock_prescreen.assert_called_once_with(args=[str(response.data['id'])], queue='bulk')
+        mock_dispatch.assert_not_called()
+
+    def test_shortlist_ranks_evaluated_jobs_then_prescreen_scores(self):
+        """Test that the shortlist leaves out failed and screened-out jobs and ranks the rest."""
+        batch = EvaluationBatch.objects.create(job_title='Backend Developer', prescreen='filter')
+        rows = [
+            ('completed', 0.7, 4.5, 0.9),
+            ('queued', None, None, 0.8),
+            ('completed', 0.9, 4.0, 0.5),
+            ('failed', None, None, 0.95),
+            ('prescreened_out', None, None, 0.1),
+        ]
+        jobs = [
+            EvaluationJob.objects.create(
+                batch=batch, job_title='Backend Developer', status=job_status, cv=self.files[0],
+                project_report=self.files[1], cv_match_rate=match_rate, project_score=score, prescreen_score=prescreen,
+            )
+            for job_status, match_rate, score, prescreen in rows
+        ]
+
+        response = self.client.get(f'{self.batch_url}{batch.id}/shortlist/')
+        limited = self.client.get(f'{self.batch_url}{batch.id}/shortlist/?limit=1')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [str(jobs[2].id), str(jobs[0].id), str(jobs[1].id)])
+        self.assertEqual([row['rank'] for row in response.data['results']], [1, 2, 3])
+        self.assertEqual(len(limited.data['results']), 1)
+        self.assertEqual(self.client.get(f'{self.batch_url}not-a-uuid/shortlist/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RetryEvaluationViewTests(TestCase):
+    """Test requeueing failed jobs through the retry endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        upload = UploadedFile.objects.create(file='uploads/file.pdf')
+        self.job = EvaluationJob.objects.create(
+            job_title='Backend Developer', cv=upload, project_report=upload,
+            status='failed', overall_summary='An error occurred: timeout',
+        )
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_failed_job_is_requeued(self, mock_apply_async):
+        """Test that retrying a failed job queues it again and dispatches the task."""
+        response = self.client.post(f'/api/result/{self.job.id}/retry/')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'queued')
+        self.assertIsNone(self.job.overall_summary)
+        mock_apply_async.assert_called_once_with(args=[str(self.job.id)], queue='interactive')
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_unfinished_job_cannot_be_retried(self, mock_apply_async):
+        """Test that only failed jobs can be retried."""
+        EvaluationJob.objects.filter(id=self.job.id).update(status='processing')
+
+        response = self.client.post(f'/api/result/{self.job.id}/retry/')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        mock_apply_async.assert_not_called()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+@mock.patch.object(EvaluateView, 'throttle_classes', [])
+class EvaluateViewDedupeTests(TestCase):
+    """Test that identical evaluation requests share one job."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.cv = UploadedFile.objects.create(file=ContentFile(b'%PDF-1.4 cv', name='cv.pdf'))
+        self.report = UploadedFile.objects.create(file=ContentFile(b'%PDF-1.4 report', name='report.pdf'))
+        # A re-upload of the same CV under a new id
+        self.cv_copy = UploadedFile.objects.create(file=ContentFile(b'%PDF-1.4 cv', name='cv_copy.pdf'))
+
+    def evaluate(self, cv, **extra):
+        return self.client.post('/api/evaluate/', {
+            'job_title': 'Backend Developer', 'cv_id': str(cv.id),
+            'project_report_id': str(self.report.id), **extra,
+        }, format='json')
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_duplicate_attaches_to_in_flight_job(self, mock_apply_async):
+        """Test that a duplicate of a queued job returns that job without dispatching again."""
+        first = self.evaluate(self.cv)
+        second = self.client.post('/api/evaluate/', {
+            'job_title': '  backend   developer', 'cv_id': str(self.cv_copy.id),
+            'project_report_id': str(self.report.id),
+        }, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(first.data['deduplicated'])
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(second.data['deduplicated'])
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(EvaluationJob.objects.count(), 1)
+        mock_apply_async.assert_called_once()
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_duplicate_of_completed_job_returns_result(self, mock_apply_async):
+        """Test that a completed duplicate is returned immediately with its result."""
+        job_id = self.evaluate(self.cv).data['id']
+        EvaluationJob.objects.filter(id=job_id).update(status='completed', cv_match_rate=0.8)
+
+        response = self.evaluate(self.cv_copy)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['deduplicated'])
+        self.assertEqual(str(response.data['id']), str(job_id))
+        self.assertEqual(response.data['cv_match_rate'], 0.8)
+        mock_apply_async.assert_called_once()
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_duplicates_are_not_shared_between_users(self, mock_apply_async):
+        """Test that another user's identical request gets its own job instead of the first user's result."""
+        job_id = self.evaluate(self.cv).data['id']
+        EvaluationJob.objects.filter(id=job_id).update(status='completed', cv_feedback='Private feedback')
+        other = User.objects.create_user(username='otheruser', password='testpass')
+        self.client.force_authenticate(user=other)
+
+        response = self.evaluate(self.cv_copy)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(response.data['deduplicated'])
+        self.assertNotEqual(str(response.data['id']), str(job_id))
+        self.assertNotIn('cv_feedback', response.data)
+        self.assertEqual(EvaluationJob.objects.get(id=response.data['id']).owner, other)
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_force_reevaluates_completed_request(self, mock_apply_async):
+        """Test that `force` creates a new job instead of reusing a completed one."""
+        job_id = self.evaluate(self.cv).data['id']
+        EvaluationJob.objects.filter(id=job_id).update(status='completed')
+
+        response = self.evaluate(self.cv, force=True)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(response.data['deduplicated'])
+        self.assertNotEqual(str(response.data['id']), str(job_id))
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+    @mock.patch('evaluations.tasks.evaluate_documents.apply_async')
+    def test_duplicate_of_stale_job_replaces_it(self, mock_apply_async):
+        """Test that a duplicate of a job whose worker was lost fails that job and creates a new one."""
+        job_id = self.evaluate(self.cv).data['id']
+        long_ago = timezone.now() - datetime.timedelta(seconds=900)
+        EvaluationJob.objects.filter(id=job_id).update(status='processing', started_at=long_ago, updated_at=long_ago)
+
+        with override_settings(EVALUATION_STALE_JOB_SECONDS=600):
+            response = self.evaluate(self.cv_copy)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(response.data['deduplicated'])
+        self.assertNotEqual(str(response.data['id']), str(job_id))
+        self.assertEqual(EvaluationJob.objects.get(id=job_id).status, 'failed')
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+
+class JobListViewTests(TestCase):
+    """Test filtering and keyset pagination of the job listing."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        upload = UploadedFile.objects.create(file='uploads/file.pdf')
+        rates = [0.9, 0.4, 0.7, None, 0.7]
+        self.jobs = [
+            EvaluationJob.objects.create(
+                job_title='Backend Developer', cv=upload, project_report=upload,
+                status='completed' if rate is not None else 'queued',
+                cv_match_rate=rate, cv_feedback='Long feedback text.', owner=self.user,
+            )
+            for rate in rates
+        ]
+        EvaluationJob.objects.create(job_title='Data Engineer', cv=upload, project_report=upload,
+                                     status='completed', cv_match_rate=0.95, owner=self.user)
+        other = User.objects.create_user(username='otheruser', password='testpass')
+        self.other_job = EvaluationJob.objects.create(job_title='Backend Developer', cv=upload, project_report=upload,
+                                                      status='completed', cv_match_rate=0.99, owner=other)
+
+    def test_filters_and_score_ordering(self):
+        """Test that jobs for one role are ranked by match rate, without feedback by default."""
+        response = self.client.get('/api/jobs/', {
+            'job_title': 'Backend Developer', 'status': 'completed',
+            'min_cv_match_rate': 0.5, 'ordering': '-cv_match_rate',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['cv_match_rate'] for job in response.data['results']], [0.9, 0.7, 0.7])
+        self.assertNotIn('cv_feedback', response.data['results'][0])
+        self.assertIsNone(response.data['next'])
+
+        with_feedback = self.client.get('/api/jobs/', {
+            'job_title': 'Backend Developer', 'status': 'completed', 'include_feedback': 'true',
+        })
+        self.assertEqual(with_feedback.data['results'][0]['cv_feedback'], 'Long feedback text.')
+
+    def test_cursor_walks_every_job_once(self):
+        """Test that following `next` pages through all of the user's jobs, including ties on created_at."""
+        EvaluationJob.objects.update(created_at=self.jobs[0].created_at)
+        seen, url = [], '/api/jobs/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(job['id'] for job in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(set(seen), {
+            str(job_id) for job_id in EvaluationJob.objects.filter(owner=self.user).values_list('id', flat=True)
+        })
+        self.assertNotIn(str(self.other_job.id), seen)
+
+    def test_invalid_parameters_are_rejected(self):
+        """Test that bad filters and tampered cursors return client errors."""
+        self.assertEqual(self.client.get('/api/jobs/', {'status': 'done'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get('/api/jobs/', {'ordering': 'cv_feedback'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get('/api/jobs/', {'cursor': 'bm90LWEtY3Vyc29y'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(JOB_EVENTS_BACKEND='local')
+class ResultPushTests(TestCase):
+    """Test long-poll and server-sent event delivery of job results."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        upload = UploadedFile.objects.create(file='uploads/cv.pdf')
+        self.job = EvaluationJob.objects.create(job_title='Backend Developer', cv=upload, project_report=upload)
+
+    def test_wait_returns_immediately_when_status_already_changed(self):
+        """Test that a client with a stale status gets the current row without waiting."""
+        self.job.status = 'processing'
+        self.job.save()
+
+        started = time.monotonic()
+        response = self.client.get(f'/api/result/{self.job.id}/wait/?status=queued&timeout=5')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'processing')
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_wait_is_released_by_a_status_event(self):
+        """Test that a held request returns as soon as the job's status is published."""
+        publisher = threading.Timer(0.1, get_job_event_bus().publish, args=(str(self.job.id), 'processing'))
+        publisher.start()
+
+        started = time.monotonic()
+        response = self.client.get(f'/api/result/{self.job.id}/wait/?status=queued&timeout=5')
+        publisher.join()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_wait_sleeps_through_progress_events(self):
+        """Test that progress writes within the known status do not release a held request."""
+        self.job.status = 'processing'
+        self.job.save()
+        bus = get_job_event_bus()
+        publisher = threading.Timer(0.1, bus.publish, args=(str(self.job.id), 'processing'),
+                                    kwargs={'event': 'progress'})
+        publisher.start()
+
+        started = time.monotonic()
+        response = self.client.get(f'/api/result/{self.job.id}/wait/?status=processing&timeout=0.5')
+        publisher.join()
+
+        self.assertEqual(response.data['status'], 'processing')
+        self.assertGreaterEqual(time.monotonic() - started, 0.5)
+
+    @override_settings(RESULT_MAX_OPEN_STREAMS=0)
+    def test_wait_returns_at_once_when_streams_are_capped(self):
+        """Test that a long-poll over the open-stream cap answers without waiting."""
+        started = time.monotonic()
+        response = self.client.get(f'/api/result/{self.job.id}/wait/?status=queued&timeout=5')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertLess(time.monotonic() - started, 1)
+
+    @override_settings(RESULT_MAX_OPEN_STREAMS=0)
+    def test_event_stream_over_the_cap_is_rejected(self):
+        """Test that an event stream over the open-stream cap gets a 503 with Retry-After."""
+        response = self.client.get(f'/api/result/{self.job.id}/events/', HTTP_ACCEPT='text/event-stream')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+
+    def test_event_stream_releases_its_slot(self):
+        """Test that a finished event stream frees its open-stream slot."""
+        self.job.status = 'completed'
+        self.job.save()
+
+        with override_settings(RESULT_MAX_OPEN_STREAMS=1):
+            for _ in range(2):
+                response = self.client.get(f'/api/result/{self.job.id}/events/', HTTP_ACCEPT='text/event-stream')
+                b''.join(response.streaming_content)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_event_stream_ends_for_finished_job(self):
+        """Test that the event stream sends the final status and closes."""
+        self.job.status = 'completed'
+        self.job.save()
+
+        response = self.client.get(f'/api/result/{self.job.id}/events/', HTTP_ACCEPT='text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(body.count('event: status'), 1)
+        self.assertIn('"status":"completed"', body)
+
+
+@override_settings(RESULT_CACHE_ALIAS='default')
+class ResultViewConditionalGetTests(TestCase):
+    """Test ETag handling and result caching on ResultView."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        upload = UploadedFile.objects.create(file='uploads/cv.pdf')
+        self.job = EvaluationJob.objects.create(job_title='Backend Developer', cv=upload, project_report=upload)
+        self.url = f'/api/result/{self.job.id}/'
+        get_result_cache().clear()
+
+    def test_unchanged_job_returns_not_modified(self):
+        """Test that a poll with the current ETag gets a 304."""
+        EvaluationJob.objects.filter(id=self.job.id).update(status='processing')
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Last-Modified', first)
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_admin_edit_invalidates_cached_result(self):
+        """Test that saving a finished job in the admin drops its cached response."""
+        self.job.status = 'completed'
+        self.job.overall_summary = 'Strong candidate.'
+        DjangoEvaluationRepository().update(self.job)
+        self.client.get(self.url)
+
+        admin_user = User.objects.create_superuser(username='admin', password='adminpass')
+        self.job.overall_summary = 'Edited by an admin.'
+        site_admin = admin.site._registry[EvaluationJob]
+        site_admin.save_model(mock.Mock(user=admin_user), self.job, None, True)
+
+        self.assertEqual(self.client.get(self.url).data['overall_summary'], 'Edited by an admin.')
+
+    def test_changed_job_returns_new_body(self):
+        """Test that an update invalidates the previous ETag."""
+        first = self.client.get(self.url)
+        self.job.status = 'processing'
+        DjangoEvaluationRepository().update(self.job)
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['status'], 'processing')
+
+    def test_finished_job_is_served_from_cache_until_updated(self):
+        """Test that terminal results skip the database and are invalidated by the repository."""
+        self.job.status = 'completed'
+        self.job.overall_summary = 'Strong candidate.'
+        DjangoEvaluationRepository().update(self.job)
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.data['overall_summary'], 'Strong candidate.')
+
+        self.job.overall_summary = 'Re-evaluated.'
+        DjangoEvaluationRepository().update(self.job)
+        self.assertEqual(self.client.get(self.url).data['overall_summary'], 'Re-evaluated.')
+
+    def test_queued_job_etag_follows_queue_position(self):
+        """Test that a queued job's ETag changes when a job ahead of it starts."""
+        ahead = EvaluationJob.objects.create(
+            job_title='Backend Developer', cv=self.job.cv, project_report=self.job.project_report,
+        )
+        EvaluationJob.objects.filter(id=ahead.id).update(created_at=self.job.created_at.replace(year=2000))
+        first = self.client.get(self.url)
+        self.assertEqual(first.data['queue_position'], 1)
+
+        EvaluationJob.objects.filter(id=ahead.id).update(status='processing')
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['queue_position'], 0)
+        self.assertIsNotNone(second.data['estimated_start'])
+
+    def test_progress_write_changes_etag_and_body(self):
+        """Test that streamed partial output is visible to a client polling with its ETag."""
+        first = self.client.get(self.url)
+        DjangoEvaluationRepository().save_progress(self.job.id, {
+            'cv': {'status': 'running', 'text': 'Match Rate: 0.8'},
+            'project': {'status': 'pending'},
+            'summary': {'status': 'pending'},
+        })
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['progress']['cv'], {'status': 'running', 'text': 'Match Rate: 0.8'})
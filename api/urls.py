@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import UploadView, EvaluateView, ResultView
+from .views import UploadView, EvaluateView, BatchEvaluateView, BatchProgressView, BatchShortlistView, JobListView, ResultView, ResultWaitView, ResultEventsView, RetryEvaluationView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -10,5 +10,12 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('upload/', UploadView.as_view(), name='upload'),
     path('evaluate/', EvaluateView.as_view(), name='evaluate'),
+    path('evaluate/batch/', BatchEvaluateView.as_view(), name='evaluate_batch'),
+    path('evaluate/batch/<str:batch_id>/', BatchProgressView.as_view(), name='evaluate_batch_progress'),
+    path('evaluate/batch/<str:batch_id>/shortlist/', BatchShortlistView.as_view(), name='evaluate_batch_shortlist'),
+    path('jobs/', JobListView.as_view(), name='job_list'),
     path('result/<str:job_id>/', ResultView.as_view(), name='result'),
+    path('result/<str:job_id>/wait/', ResultWaitView.as_view(), name='result_wait'),
+    path('result/<str:job_id>/events/', ResultEventsView.as_view(), name='result_events'),
+    path('result/<str:job_id>/retry/', RetryEvaluationView.as_view(), name='result_retry'),
 ]
@@ -1,10 +1,37 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.db.models import Case, F, Value, When
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .serializers import UploadedFileSerializer, EvaluationJobSerializer, EvaluationRequestSerializer
-from core.domain.models import UploadedFile, EvaluationJob
-from evaluations.tasks import evaluate_documents
-from core.throttles import CVUploadRateThrottle, EvaluationRateThrottle
+from rest_framework.renderers import JSONRenderer
+from .pagination import KeysetPagination
+from .renderers import EventStreamRenderer
+from .streams import TooManyStreams, stream_slots
+from .serializers import (
+    UploadedFileSerializer,
+    EvaluationJobSerializer,
+    EvaluationRequestSerializer,
+    BatchEvaluationRequestSerializer,
+    EvaluationBatchSerializer,
+    EvaluationJobListSerializer,
+    EvaluationJobListWithFeedbackSerializer,
+    JobListQuerySerializer,
+    ShortlistQuerySerializer,
+)
+from core.domain.models import UploadedFile, EvaluationBatch, EvaluationJob
+from evaluations.tasks import dispatch_bulk_jobs, enqueue_interactive, prescreen_batch, retry_jobs
+from core.application.interfaces import STATUS_EVENT
+from core.infra.events import get_job_event_bus
+from core.infra.persistence.dedupe import create_or_attach, evaluation_dedupe_key
+from core.infra.persistence.result_cache import get_result_cache, result_cache_key
+from core.infra.persistence.scheduler import FairShareScheduler
+from core.throttles import CVUploadRateThrottle, EvaluationRateThrottle, BatchEvaluationRateThrottle
 
 class UploadView(generics.CreateAPIView):
     queryset = UploadedFile.objects.all()
@@ -20,19 +47,304 @@ class EvaluateView(generics.GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            # This is where the async task will be triggered
-            job = EvaluationJob.objects.create(
-                job_title=serializer.validated_data['job_title'],
-                cv_id=serializer.validated_data['cv_id'],
-                project_report_id=serializer.validated_data['project_report_id'],
+            data = serializer.validated_data
+            # Identical requests (same role, same file contents) share one job
+            job, created = create_or_attach(
+                evaluation_dedupe_key(data['job_title'], data['cv'], data['project_report'], request.user.id),
+                force=data['force'],
+                job_title=data['job_title'],
+                cv=data['cv'],
+                project_report=data['project_report'],
+                owner=request.user,
+                priority='interactive',
+            )
+            if created:
+                enqueue_interactive(job.id)
+            body = EvaluationJobSerializer(job).data
+            if job.status == 'completed':
+                return Response({**body, 'deduplicated': True}, status=status.HTTP_200_OK)
+            return Response(
+                {**{key: body[key] for key in ('id', 'status', 'queue_position', 'estimated_start')},
+                 'deduplicated': not created},
+                status=status.HTTP_202_ACCEPTED,
             )
-            evaluate_documents.delay(job.id)
-            return Response({'id': job.id, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class BatchEvaluateView(generics.GenericAPIView):
+    serializer_class = BatchEvaluationRequestSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [BatchEvaluationRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        job_title = serializer.validated_data['job_title']
+        prescreen = serializer.validated_data.get('prescreen') or getattr(settings, 'EVALUATION_PRESCREEN', None) or 'off'
+        with transaction.atomic():
+            batch = EvaluationBatch.objects.create(job_title=job_title, prescreen=prescreen)
+            jobs = EvaluationJob.objects.bulk_create([
+                EvaluationJob(
+                    batch=batch,
+                    job_title=job_title,
+                    cv_id=candidate['cv_id'],
+                    project_report_id=candidate['project_report_id'],
+                    owner=request.user,
+                    priority='bulk',
+                )
+                for candidate in serializer.validated_data['candidates']
+            ])
+            job_ids = [str(job.id) for job in jobs]
+            if prescreen == 'off':
+                # Bulk jobs are handed to Celery a few at a time, taking turns with other users
+                transaction.on_commit(dispatch_bulk_jobs)
+            else:
+                # Scored (and possibly screened out) first; the task then dispatches them
+                transaction.on_commit(lambda: prescreen_batch.apply_async(
+                    args=[str(batch.id)], queue=getattr(settings, 'EVALUATION_BULK_QUEUE', 'bulk'),
+                ))
+
+        data = EvaluationBatchSerializer(batch).data
+        data['job_ids'] = job_ids
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+class BatchProgressView(generics.RetrieveAPIView):
+    queryset = EvaluationBatch.objects.all()
+    serializer_class = EvaluationBatchSerializer
+    lookup_field = 'id'
+    lookup_url_kwarg = 'batch_id'
+    permission_classes = [IsAuthenticated]
+
+class BatchShortlistView(generics.GenericAPIView):
+    """
+    A batch's best candidates: evaluated jobs by CV match rate and project score,
+    followed by jobs still waiting or running, by pre-screen score. Failed and
+    screened-out jobs are left out.
+    """
+    serializer_class = EvaluationJobListSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, batch_id):
+        query = ShortlistQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        try:
+            batch = EvaluationBatch.objects.filter(id=batch_id).first()
+        except (TypeError, ValueError, ValidationError):
+            batch = None
+        if batch is None:
+            raise Http404
+
+        jobs = batch.jobs.exclude(status__in=('failed', 'prescreened_out')).annotate(
+            evaluated=Case(When(status='completed', then=Value(0)), default=Value(1)),
+        ).order_by(
+            'evaluated',
+            F('cv_match_rate').desc(nulls_last=True),
+            F('project_score').desc(nulls_last=True),
+            F('prescreen_score').desc(nulls_last=True),
+            'created_at',
+        ).only(*self.serializer_class.Meta.fields)[:query.validated_data['limit']]
+
+        results = [
+            {'rank': rank, **data}
+            for rank, data in enumerate(self.get_serializer(jobs, many=True).data, start=1)
+        ]
+        return Response({'batch': str(batch.id), 'job_title': batch.job_title, 'results': results})
+
+class JobListView(generics.ListAPIView):
+    """
+    Filtered listing of the requesting user's evaluation jobs, newest first by
+    default, with keyset pagination. Feedback texts are only loaded and returned
+    with `include_feedback=true`.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_query(self):
+        if not hasattr(self, '_query'):
+            self._query = JobListQuerySerializer(data=self.request.query_params)
+            self._query.is_valid(raise_exception=True)
+        return self._query
+
+    def get_serializer_class(self):
+        if self.get_query().validated_data['include_feedback']:
+            return EvaluationJobListWithFeedbackSerializer
+        return EvaluationJobListSerializer
+
+    def get_queryset(self):
+        query = self.get_query()
+        return EvaluationJob.objects.filter(owner=self.request.user, **query.filters()).only(
+            *self.get_serializer_class().Meta.fields,
+        )
+
 class ResultView(generics.RetrieveAPIView):
+    """
+    Job status and results with conditional GET support.
+
+    The ETag comes from `updated_at` to the microsecond, so an unchanged poll is
+    answered with 304 after a two-column lookup. There is no Last-Modified: its
+    one-second resolution would hide changes made within the same second. Finished
+    jobs never change again, so their serialized response is cached until the
+    repository updates them. A queued job's position moves without the row
+    changing, so its ETag also carries the position.
+    """
     queryset = EvaluationJob.objects.all()
     serializer_class = EvaluationJobSerializer
     lookup_field = 'id'
     lookup_url_kwarg = 'job_id'
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+
+    def get_validators(self, job_id):
+        try:
+            row = self.get_queryset().filter(id=job_id).values(
+                'updated_at', 'status', 'priority', 'created_at', 'owner_id', 'dispatched_at', 'prescreen_score',
+            ).first()
+        except (TypeError, ValueError, ValidationError):
+            row = None
+        if row is None:
+            raise Http404
+        updated_at = row['updated_at']
+        if row['status'] == 'queued':
+            position = FairShareScheduler().queue_position(EvaluationJob(id=job_id, **row))
+            return quote_etag(f"{job_id}-{updated_at.timestamp():.6f}-q{position}")
+        return quote_etag(f"{job_id}-{updated_at.timestamp():.6f}")
+
+    def retrieve(self, request, *args, **kwargs):
+        job_id = kwargs['job_id']
+        cache = get_result_cache()
+        cached = cache.get(result_cache_key(job_id))
+        etag = cached['etag'] if cached is not None else self.get_validators(job_id)
+
+        not_modified = get_conditional_response(request._request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        if cached is not None:
+            data = cached['data']
+        else:
+            job = self.get_object()
+            data = self.get_serializer(job).data
+            if job.status in EvaluationJob.TERMINAL_STATUSES:
+                cache.set(result_cache_key(job_id), {'data': data, 'etag': etag})
+
+        response = Response(data)
+        response['ETag'] = etag
+        return response
+
+class RetryEvaluationView(generics.GenericAPIView):
+    """
+    Requeue a failed job. Stages that finished before the failure are checkpointed,
+    so the retry only repeats the work that didn't complete.
+    """
+    queryset = EvaluationJob.objects.all()
+    lookup_field = 'id'
+    lookup_url_kwarg = 'job_id'
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        job = self.get_object()
+        if not retry_jobs([job.id]):
+            return Response(
+                {'detail': 'Hanya job yang gagal yang dapat diulang.', 'status': job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({'id': job.id, 'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+
+class ResultWaitView(generics.RetrieveAPIView):
+    """
+    Long-poll variant of ResultView. With `?status=<last seen status>` the request
+    is held until the job moves to another status (or `timeout` seconds pass)
+    instead of the client polling repeatedly. When the process already holds
+    `RESULT_MAX_OPEN_STREAMS` requests open, the current row is returned at once.
+    """
+    queryset = EvaluationJob.objects.all()
+    serializer_class = EvaluationJobSerializer
+    lookup_field = 'id'
+    lookup_url_kwarg = 'job_id'
+    permission_classes = [IsAuthenticated]
+
+    def get_timeout(self):
+        max_timeout = getattr(settings, 'RESULT_LONG_POLL_TIMEOUT', 25)
+        try:
+            return max(0.0, min(float(self.request.query_params.get('timeout', max_timeout)), max_timeout))
+        except ValueError:
+            return max_timeout
+
+    def retrieve(self, request, *args, **kwargs):
+        known_status = request.query_params.get('status')
+        # Subscribe before reading the row so a transition in between isn't missed.
+        with get_job_event_bus().subscribe(kwargs['job_id']) as subscription:
+            job = self.get_object()
+            if (job.status == known_status and job.status not in EvaluationJob.TERMINAL_STATUSES
+                    and stream_slots.acquire()):
+                try:
+                    if self.wait_for_status_change(subscription, known_status):
+                        job.refresh_from_db()
+                finally:
+                    stream_slots.release()
+        return Response(self.get_serializer(job).data)
+
+    def wait_for_status_change(self, subscription, known_status) -> bool:
+        """Sleep through progress events and repeats of `known_status`; False on timeout."""
+        deadline = time.monotonic() + self.get_timeout()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            received = subscription.wait(remaining)
+            if received is None:
+                return False
+            event, job_status = received
+            if event == STATUS_EVENT and job_status != known_status:
+                return True
+
+class ResultEventsView(generics.RetrieveAPIView):
+    """
+    Server-sent events stream of a job: `status` events on transitions and
+    `progress` events on progress writes, closed once the job is finished.
+    Answers 503 when the process already holds `RESULT_MAX_OPEN_STREAMS` open.
+    """
+    queryset = EvaluationJob.objects.all()
+    serializer_class = EvaluationJobSerializer
+    lookup_field = 'id'
+    lookup_url_kwarg = 'job_id'
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+    keep_alive_interval = 15
+
+    def retrieve(self, request, *args, **kwargs):
+        if not stream_slots.acquire():
+            raise TooManyStreams()
+        subscription = get_job_event_bus().subscribe(kwargs['job_id'])
+        try:
+            job = self.get_object()
+        except Exception:
+            subscription.close()
+            stream_slots.release()
+            raise
+        response = StreamingHttpResponse(self.stream(job, subscription), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def event(self, job, event: str = STATUS_EVENT):
+        payload = JSONRenderer().render(self.get_serializer(job).data).decode()
+        return f"event: {event}\ndata: {payload}\n\n"
+
+    def stream(self, job, subscription):
+        deadline = time.monotonic() + getattr(settings, 'RESULT_EVENT_STREAM_TIMEOUT', 300)
+        try:
+            yield self.event(job)
+            while job.status not in EvaluationJob.TERMINAL_STATUSES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                received = subscription.wait(min(self.keep_alive_interval, remaining))
+                if received is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                job.refresh_from_db()
+                yield self.event(job, received[0])
+        finally:
+            subscription.close()
+            stream_slots.release()
@@ -1,33 +1,231 @@
+import re
 from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+
+@dataclass
+class ExtractedText:
+    text: str
+    pages: int = 0
+    truncated: bool = False
+
+class LLMOutput(str):
+    """LLM response text that also carries the size of the prompt sent for it."""
+
+    def __new__(cls, text: str, prompt_tokens: int = 0):
+        output = super().__new__(cls, text)
+        output.prompt_tokens = prompt_tokens
+        return output
+
+_CV_RESULT = re.compile(r"Match Rate:\s*([-+]?[0-9]*\.?[0-9]+)\s*Feedback:\s*(.*)", re.DOTALL)
+_PROJECT_RESULT = re.compile(r"Score:\s*([-+]?[0-9]*\.?[0-9]+)\s*Feedback:\s*(.*)", re.DOTALL)
+
+@dataclass
+class EvaluationResult:
+    """Validated outcome of evaluating one candidate, whichever way the LLM was called."""
+    cv_match_rate: float
+    cv_feedback: str
+    project_score: float
+    project_feedback: str
+    overall_summary: str
+    prompt_tokens: int = 0
+
+    def validate(self):
+        """Raise ValueError unless every field is within the range the rubric defines."""
+        self._check_cv_match_rate(self.cv_match_rate)
+        self._check_project_score(self.project_score)
+        for name in ('cv_feedback', 'project_feedback', 'overall_summary'):
+            if not getattr(self, name).strip():
+                raise ValueError(f"{name} is empty")
+        return self
+
+    @staticmethod
+    def _check_cv_match_rate(value: float):
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"CV match rate {value} is outside 0.0-1.0")
+
+    @staticmethod
+    def _check_project_score(value: float):
+        if not 1.0 <= value <= 5.0:
+            raise ValueError(f"Project score {value} is outside 1.0-5.0")
+
+    @classmethod
+    def parse_cv(cls, text: str):
+        """(match rate, feedback) from a 'Match Rate: ... Feedback: ...' response."""
+        match = _CV_RESULT.search(text)
+        if match is None:
+            raise ValueError("CV evaluation is not in the 'Match Rate: / Feedback:' format")
+        cls._check_cv_match_rate(float(match.group(1)))
+        return float(match.group(1)), match.group(2).strip()
+
+    @classmethod
+    def parse_project(cls, text: str):
+        """(score, feedback) from a 'Score: ... Feedback: ...' response."""
+        match = _PROJECT_RESULT.search(text)
+        if match is None:
+            raise ValueError("Project evaluation is not in the 'Score: / Feedback:' format")
+        cls._check_project_score(float(match.group(1)))
+        return float(match.group(1)), match.group(2).strip()
+
+    @classmethod
+    def from_text(cls, cv_result: str, project_result: str, summary: str, prompt_tokens: int = 0):
+        cv_match_rate, cv_feedback = cls.parse_cv(cv_result)
+        project_score, project_feedback = cls.parse_project(project_result)
+        return cls(
+            cv_match_rate=cv_match_rate,
+            cv_feedback=cv_feedback,
+            project_score=project_score,
+            project_feedback=project_feedback,
+            overall_summary=summary.strip(),
+            prompt_tokens=prompt_tokens,
+        ).validate()
 
 class IVectorStore(ABC):
     @abstractmethod
     def get_retriever(self):
         pass
 
+# Reference context sections each prompt stage is filled with
+STAGE_CONTEXT_SECTIONS = {
+    'cv': ('job_description', 'cv_rubric'),
+    'project': ('case_study_brief', 'project_rubric'),
+    'candidate': ('job_description', 'cv_rubric', 'case_study_brief', 'project_rubric'),
+}
+
+@dataclass
+class RoleContext:
+    """Reference context of one role, assembled ahead of time instead of retrieved per job."""
+    title: str
+    job_description: str
+    cv_rubric: str
+    case_study_brief: str
+    project_rubric: str
+
+    def for_stage(self, stage: str) -> dict:
+        sections = asdict(self)
+        return {name: sections[name] for name in STAGE_CONTEXT_SECTIONS.get(stage, ())}
+
+@dataclass
+class RoleRetriever:
+    """Vector store retriever for a role without a context bundle; its title steers the job description query."""
+    title: str
+    retriever: object
+
+    def get_relevant_documents(self, query: str):
+        return self.retriever.get_relevant_documents(query)
+
+class IRoleContextRegistry(ABC):
+    @abstractmethod
+    def get(self, job_title: str):
+        """The RoleContext of a job title, or None if the role is unknown."""
+        pass
+
 class ILLMService(ABC):
+    """
+    The per-stage methods take an optional `on_chunk` callable; services that
+    stream call it with each piece of the response as it arrives.
+    """
+    # Identifies the underlying model; part of response cache keys.
+    model_name = None
+
     @abstractmethod
-    def evaluate_cv(self, cv_content: str, retriever):
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
         pass
 
     @abstractmethod
-    def evaluate_project(self, project_content: str, retriever):
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
         pass
 
     @abstractmethod
-    def generate_summary(self, cv_evaluation: str, project_evaluation: str):
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
         pass
 
+    def evaluate_candidate(self, cv_content: str, project_content: str, retriever) -> EvaluationResult:
+        """
+        Evaluate CV and project report and summarize them in one structured call.
+        Services without such a call make the three stage calls instead.
+        """
+        cv_result = self.evaluate_cv(cv_content, retriever)
+        project_result = self.evaluate_project(project_content, retriever)
+        summary = self.generate_summary(str(cv_result), str(project_result))
+        return EvaluationResult.from_text(
+            str(cv_result), str(project_result), str(summary),
+            prompt_tokens=sum(getattr(result, 'prompt_tokens', 0) for result in (cv_result, project_result, summary)),
+        )
+
+    def prompt_template(self, stage: str) -> str:
+        """Prompt template of a stage ('cv', 'project', 'summary' or 'candidate')."""
+        return ""
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        """
+        Reference context the stage's prompt is filled with. `retriever` is a
+        vector store retriever (a RoleRetriever names the job's role), or a
+        RoleContext whose sections are used as is.
+        """
+        if isinstance(retriever, RoleContext):
+            return retriever.for_stage(stage)
+        return {}
+
 class IFileParser(ABC):
     @abstractmethod
     def parse(self, file_path: str) -> str:
         pass
 
+    def extract(self, file_path: str) -> ExtractedText:
+        """Parse and report whether the text was cut short; parsers with limits override this."""
+        return ExtractedText(text=self.parse(file_path))
+
 class IEvaluationRepository(ABC):
     @abstractmethod
     def get_by_id(self, job_id: str):
         pass
 
     @abstractmethod
-    def update(self, job):
+    def update(self, job, fields=None):
+        """Persist `fields` of the job, or all of them when `fields` is None."""
+        pass
+
+    def transition(self, job, from_status: str, to_status: str, fields=()) -> bool:
+        """
+        Move the job from `from_status` to `to_status`, writing `fields` with it.
+        Returns False, changing nothing, if the job was no longer in `from_status`;
+        with concurrent callers only one of them wins.
+        """
+        if job.status != from_status:
+            return False
+        job.status = to_status
+        self.update(job, fields=['status', *fields])
+        return True
+
+    def get_checkpoints(self, job_id: str) -> dict:
+        """Stage outputs saved by earlier attempts of the job, keyed by stage name."""
+        return {}
+
+    def save_checkpoint(self, job_id: str, stage: str, payload):
+        pass
+
+    def clear_checkpoints(self, job_id: str):
+        pass
+
+    def save_progress(self, job_id: str, progress: dict):
+        """Write only the job's per-stage progress, without touching its other fields."""
+        pass
+
+class RetryLater(Exception):
+    """
+    A shared resource (e.g. the LLM request budget) is saturated. The job goes
+    back to the queue and runs again after `retry_after` seconds instead of failing.
+    """
+
+    def __init__(self, message: str = "", retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Kinds of job event: a status transition, or a progress write within the current status
+STATUS_EVENT = 'status'
+PROGRESS_EVENT = 'progress'
+
+class IJobEventPublisher(ABC):
+    @abstractmethod
+    def publish(self, job_id: str, status: str, event: str = STATUS_EVENT):
         pass
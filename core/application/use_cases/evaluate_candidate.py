@@ -1,10 +1,103 @@
+import copy
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict
+from datetime import datetime, timezone
+
 from core.application.interfaces import (
+    EvaluationResult,
+    ExtractedText,
     IEvaluationRepository,
     IFileParser,
+    IJobEventPublisher,
     ILLMService,
+    IRoleContextRegistry,
     IVectorStore,
+    LLMOutput,
+    PROGRESS_EVENT,
+    RetryLater,
+    RoleRetriever,
 )
 
+logger = logging.getLogger(__name__)
+
+# One LLM call per document plus a summary call, or one structured call for everything.
+MULTI_CALL = 'multi_call'
+SINGLE_CALL = 'single_call'
+
+# Progress is reported per LLM stage; the checkpoint of each stage's result.
+PROGRESS_STAGES = {'cv': 'cv_result', 'project': 'project_result', 'summary': 'summary'}
+
+# Columns written when a job completes; everything else was written earlier or is unchanged.
+RESULT_FIELDS = (
+    'cv_truncated', 'project_report_truncated', 'cv_match_rate', 'cv_feedback',
+    'project_score', 'project_feedback', 'overall_summary', 'prompt_tokens',
+)
+
+class StageProgress:
+    """
+    Status and partial LLM output of each stage, kept on `job.progress`.
+
+    Streamed chunks may arrive on the evaluation threads; the state is only written
+    from the thread that created the tracker, and at most once per `interval`
+    seconds apart from stage starts and ends.
+    """
+
+    def __init__(self, job, write, interval: float):
+        self.job = job
+        self.write = write
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._owner = threading.get_ident()
+        self._dirty = False
+        self._force = False
+        self._last_write = 0.0
+        job.progress = {stage: {'status': 'pending'} for stage in PROGRESS_STAGES}
+
+    def _set(self, stage: str, force: bool = False, **state):
+        with self._lock:
+            self.job.progress[stage] = state
+            self._dirty = True
+            self._force = self._force or force
+        self.flush()
+
+    def start(self, stage: str):
+        self._set(stage, force=True, status='running', text='')
+
+    def append(self, stage: str, chunk: str):
+        with self._lock:
+            self.job.progress[stage]['text'] += chunk
+            self._dirty = True
+        self.flush()
+
+    def finish(self, stage: str, status: str = 'done'):
+        self._set(stage, force=True, status=status)
+
+    def run(self, stage: str, method, *args):
+        """Call an ILLMService method, streaming its output into the stage's progress."""
+        self.start(stage)
+        try:
+            result = method(*args, on_chunk=lambda chunk: self.append(stage, chunk))
+        except Exception:
+            self.finish(stage, 'failed')
+            raise
+        self.finish(stage)
+        return result
+
+    def flush(self):
+        if threading.get_ident() != self._owner:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty or (not self._force and now - self._last_write < self.interval):
+                return
+            snapshot = copy.deepcopy(self.job.progress)
+            self._dirty = self._force = False
+            self._last_write = now
+        self.write(snapshot)
+
 class EvaluateCandidateUseCase:
     def __init__(
         self,
@@ -13,38 +106,204 @@ class EvaluateCandidateUseCase:
         project_parser: IFileParser,
         llm_service: ILLMService,
         vector_store: IVectorStore,
+        parallel_evaluation: bool = True,
+        event_publisher: IJobEventPublisher = None,
+        evaluation_mode: str = MULTI_CALL,
+        progress_interval: float = 1.0,
+        role_contexts: IRoleContextRegistry = None,
     ):
         self.evaluation_repository = evaluation_repository
         self.cv_parser = cv_parser
         self.project_parser = project_parser
         self.llm_service = llm_service
         self.vector_store = vector_store
+        self.parallel_evaluation = parallel_evaluation
+        self.event_publisher = event_publisher
+        if evaluation_mode not in (MULTI_CALL, SINGLE_CALL):
+            raise ValueError(f"Unknown evaluation mode {evaluation_mode!r}")
+        self.evaluation_mode = evaluation_mode
+        self.progress_interval = progress_interval
+        self.role_contexts = role_contexts
 
-    def execute(self, job_id: str):
+    def execute(self, job_id: str, can_defer: bool = False):
+        """
+        Evaluate a queued job. With `can_defer`, a RetryLater (e.g. no LLM request
+        slot) puts the job back in `queued`, keeping its checkpoints, and is raised
+        for the caller to schedule the next attempt; otherwise the job fails.
+        """
         job = self.evaluation_repository.get_by_id(job_id)
-        job.status = 'processing'
-        self.evaluation_repository.update(job)
+        job.started_at = datetime.now(timezone.utc)
+        progress = StageProgress(job, lambda state: self._save_progress(job, state), self.progress_interval)
+        # Only one worker can claim a queued job; a duplicate delivery stops here
+        if not self._transition(job, 'queued', 'processing', ['started_at', 'progress']):
+            logger.warning("Job %s is %s, not queued; not evaluating it", job.id, job.status)
+            return
 
         try:
-            retriever = self.vector_store.get_retriever()
+            # Outputs of stages finished by an earlier attempt are reused, not recomputed
+            checkpoints = self.evaluation_repository.get_checkpoints(job.id)
+            for stage, checkpoint in PROGRESS_STAGES.items():
+                if checkpoint in checkpoints or 'evaluation' in checkpoints:
+                    progress.finish(stage)
+            retriever = self._reference_context(job)
 
-            cv_text = self.cv_parser.parse(job.cv.file.path)
-            project_report_text = self.project_parser.parse(job.project_report.file.path)
+            cv = self._extract(job, checkpoints, 'cv_text', self.cv_parser, job.cv.file.path)
+            project_report = self._extract(
+                job, checkpoints, 'project_report_text', self.project_parser, job.project_report.file.path
+            )
+            job.cv_truncated = cv.truncated
+            job.project_report_truncated = project_report.truncated
 
-            cv_result = self.llm_service.evaluate_cv(cv_text, retriever)
-            project_result = self.llm_service.evaluate_project(project_report_text, retriever)
-            summary_result = self.llm_service.generate_summary(cv_result, project_result)
+            if self.evaluation_mode == SINGLE_CALL:
+                result = self._evaluate_single_call(job, checkpoints, progress, cv.text, project_report.text, retriever)
+            else:
+                result = self._evaluate_multi_call(job, checkpoints, progress, cv.text, project_report.text, retriever)
 
-            # Parse results and update job
-            job.cv_match_rate = float(cv_result.split("Match Rate:")[1].split("Feedback:")[0].strip())
-            job.cv_feedback = cv_result.split("Feedback:")[1].strip()
-            job.project_score = float(project_result.split("Score:")[1].split("Feedback:")[0].strip())
-            job.project_feedback = project_result.split("Feedback:")[1].strip()
-            job.overall_summary = summary_result.strip()
-            job.status = 'completed'
-            self.evaluation_repository.update(job)
+            job.cv_match_rate = result.cv_match_rate
+            job.cv_feedback = result.cv_feedback
+            job.project_score = result.project_score
+            job.project_feedback = result.project_feedback
+            job.overall_summary = result.overall_summary
+            job.prompt_tokens = result.prompt_tokens
+            if self._transition(job, 'processing', 'completed', RESULT_FIELDS):
+                self.evaluation_repository.clear_checkpoints(job.id)
 
+        except RetryLater as e:
+            if can_defer and self._transition(job, 'processing', 'queued', ['progress']):
+                raise
+            job.overall_summary = f"An error occurred: {str(e)}"
+            self._transition(job, 'processing', 'failed', ['overall_summary'])
         except Exception as e:
-            job.status = 'failed'
             job.overall_summary = f"An error occurred: {str(e)}"
-            self.evaluation_repository.update(job)
+            self._transition(job, 'processing', 'failed', ['overall_summary'])
+
+    def _reference_context(self, job):
+        """The role's precomputed context bundle, or a retriever over the vector store, named after the role, for unknown roles."""
+        if self.role_contexts is not None:
+            role_context = self.role_contexts.get(job.job_title)
+            if role_context is not None:
+                return role_context
+        return RoleRetriever(job.job_title, self.vector_store.get_retriever())
+
+    def _transition(self, job, from_status: str, to_status: str, fields) -> bool:
+        """Conditionally move the job to its next status and tell anyone waiting on it."""
+        if not self.evaluation_repository.transition(job, from_status, to_status, fields):
+            return False
+        if self.event_publisher is None:
+            return True
+        try:
+            self.event_publisher.publish(str(job.id), job.status)
+        except Exception:
+            logger.exception("Could not publish status of job %s", job.id)
+        return True
+
+    def _save_progress(self, job, progress: dict):
+        """Targeted write of the progress column; a failure here must not fail the job."""
+        try:
+            self.evaluation_repository.save_progress(job.id, progress)
+            if self.event_publisher is not None:
+                # A progress event, so long-polls waiting for a status change sleep on
+                self.event_publisher.publish(str(job.id), job.status, event=PROGRESS_EVENT)
+        except Exception:
+            logger.exception("Could not save progress of job %s", job.id)
+
+    def _checkpoint(self, job, checkpoints: dict, stage: str, compute):
+        if stage not in checkpoints:
+            checkpoints[stage] = compute()
+            self.evaluation_repository.save_checkpoint(job.id, stage, checkpoints[stage])
+        return checkpoints[stage]
+
+    def _evaluate_single_call(self, job, checkpoints: dict, progress: StageProgress,
+                              cv_text: str, project_report_text: str, retriever):
+        def call():
+            # The structured answer is only usable once complete, so stages aren't streamed
+            for stage in PROGRESS_STAGES:
+                progress.start(stage)
+            try:
+                result = self.llm_service.evaluate_candidate(cv_text, project_report_text, retriever).validate()
+            except Exception:
+                for stage in PROGRESS_STAGES:
+                    progress.finish(stage, 'failed')
+                raise
+            for stage in PROGRESS_STAGES:
+                progress.finish(stage)
+            return asdict(result)
+        return EvaluationResult(**self._checkpoint(job, checkpoints, 'evaluation', call))
+
+    def _evaluate_multi_call(self, job, checkpoints: dict, progress: StageProgress,
+                             cv_text: str, project_report_text: str, retriever):
+        cv_result, project_result = self._evaluate_documents(
+            job, checkpoints, progress, cv_text, project_report_text, retriever
+        )
+        summary_result = self._evaluate(
+            job, checkpoints, 'summary',
+            lambda: progress.run('summary', self.llm_service.generate_summary, cv_result, project_result),
+        )
+        return EvaluationResult.from_text(
+            cv_result, project_result, summary_result,
+            prompt_tokens=sum(result.prompt_tokens for result in (cv_result, project_result, summary_result)),
+        )
+
+    def _evaluate(self, job, checkpoints: dict, stage: str, call, parse=None) -> LLMOutput:
+        def compute():
+            result = call()
+            # Malformed responses fail the job before they are checkpointed, so a retry asks again
+            if parse is not None:
+                parse(result)
+            return self._llm_payload(result)
+        payload = self._checkpoint(job, checkpoints, stage, compute)
+        return self._llm_output(payload)
+
+    @staticmethod
+    def _llm_payload(result) -> dict:
+        return {'text': str(result), 'prompt_tokens': getattr(result, 'prompt_tokens', 0)}
+
+    @staticmethod
+    def _llm_output(payload) -> LLMOutput:
+        if isinstance(payload, str):
+            return LLMOutput(payload)
+        return LLMOutput(payload['text'], payload['prompt_tokens'])
+
+    def _extract(self, job, checkpoints: dict, stage: str, parser: IFileParser, file_path: str) -> ExtractedText:
+        payload = self._checkpoint(job, checkpoints, stage, lambda: asdict(parser.extract(file_path)))
+        return ExtractedText(**payload)
+
+    def _evaluate_documents(self, job, checkpoints: dict, progress: StageProgress,
+                            cv_text: str, project_report_text: str, retriever):
+        """
+        Run the CV and project evaluations that have no checkpoint yet. They don't
+        depend on each other, so by default both LLM calls are in flight at the same
+        time and the summary can start as soon as the slower of the two returns. A
+        result that succeeded is checkpointed even if the other call failed.
+        """
+        parsers = {'cv_result': EvaluationResult.parse_cv, 'project_result': EvaluationResult.parse_project}
+        calls = {}
+        if 'cv_result' not in checkpoints:
+            calls['cv_result'] = lambda: progress.run('cv', self.llm_service.evaluate_cv, cv_text, retriever)
+        if 'project_result' not in checkpoints:
+            calls['project_result'] = lambda: progress.run(
+                'project', self.llm_service.evaluate_project, project_report_text, retriever
+            )
+
+        if not self.parallel_evaluation or len(calls) < 2:
+            for stage, call in calls.items():
+                self._evaluate(job, checkpoints, stage, call, parsers[stage])
+            return self._llm_output(checkpoints['cv_result']), self._llm_output(checkpoints['project_result'])
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='llm-eval') as executor:
+            futures = {stage: executor.submit(call) for stage, call in calls.items()}
+            # Streamed output is written from this thread while the calls run
+            pending = set(futures.values())
+            while pending:
+                _, pending = wait(pending, timeout=max(self.progress_interval, 0.05))
+                progress.flush()
+
+        errors = []
+        for stage, future in futures.items():
+            try:
+                self._evaluate(job, checkpoints, stage, future.result, parsers[stage])
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+        return self._llm_output(checkpoints['cv_result']), self._llm_output(checkpoints['project_result'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='cv_truncated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='project_report_truncated',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0002_evaluationjob_truncated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('job_title', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='domain.evaluationbatch'),
+        ),
+    ]
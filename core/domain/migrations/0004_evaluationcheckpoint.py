@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0003_evaluationbatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=50)),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='domain.evaluationjob')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'stage'), name='unique_checkpoint_per_job_stage')],
+            },
+        ),
+    ]
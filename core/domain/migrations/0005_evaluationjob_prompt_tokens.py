@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0004_evaluationcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
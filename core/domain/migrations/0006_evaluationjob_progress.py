@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0005_evaluationjob_prompt_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
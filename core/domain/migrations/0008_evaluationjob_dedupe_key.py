@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0007_evaluationjob_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='dedupe_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='evaluationjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ('queued', 'processing'))), fields=('dedupe_key',), name='unique_in_flight_evaluation'),
+        ),
+    ]
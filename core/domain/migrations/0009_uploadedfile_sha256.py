@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:25
+
+import core.infra.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0008_evaluationjob_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadedfile',
+            name='file',
+            field=models.FileField(storage=core.infra.uploads.ContentAddressedStorage, upload_to=core.infra.uploads.content_addressed_name),
+        ),
+    ]
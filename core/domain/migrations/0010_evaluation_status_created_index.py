@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0009_uploadedfile_sha256'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['status', 'created_at'], name='evaluation_status_created'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0010_evaluation_status_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['created_at', 'id'], name='evaluation_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['job_title', 'status', 'created_at', 'id'], name='evaluation_title_created'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['job_title', 'status', 'cv_match_rate', 'created_at', 'id'], name='evaluation_title_match_rate'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['job_title', 'status', 'project_score', 'created_at', 'id'], name='evaluation_title_score'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0011_job_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationbatch',
+            name='prescreen',
+            field=models.CharField(choices=[('off', 'Off'), ('rank', 'Rank'), ('filter', 'Filter')], default='off', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='evaluationbatch',
+            name='prescreened_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='prescreen_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='embedding_model',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='evaluationjob',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('prescreened_out', 'Prescreened out')], default='queued', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['batch', 'status', 'prescreen_score'], name='evaluation_batch_prescreen'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0012_prescreen'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='evaluationjob',
+            name='evaluation_created_id',
+        ),
+        migrations.RemoveIndex(
+            model_name='evaluationjob',
+            name='evaluation_title_created',
+        ),
+        migrations.RemoveIndex(
+            model_name='evaluationjob',
+            name='evaluation_title_match_rate',
+        ),
+        migrations.RemoveIndex(
+            model_name='evaluationjob',
+            name='evaluation_title_score',
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='evaluation_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['owner', 'job_title', 'status', 'created_at', 'id'], name='evaluation_title_created'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['owner', 'job_title', 'status', 'cv_match_rate', 'created_at', 'id'], name='evaluation_title_match_rate'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationjob',
+            index=models.Index(fields=['owner', 'job_title', 'status', 'project_score', 'created_at', 'id'], name='evaluation_title_score'),
+        ),
+    ]
@@ -1,30 +1,89 @@
 import uuid
+from django.conf import settings
 from django.db import models
 
+from core.infra.uploads import ContentAddressedStorage, content_addressed_name, digest_upload, sha256_of_name
+
 class UploadedFile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    file = models.FileField(upload_to='uploads/')
+    # Stored under its content hash, so identical uploads share one file
+    file = models.FileField(upload_to=content_addressed_name, storage=ContentAddressedStorage)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    sha256 = models.CharField(max_length=64, null=True, blank=True, db_index=True, editable=False)
+    # float32 embedding of the extracted text, computed once by the pre-screen
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    embedding_model = models.CharField(max_length=100, null=True, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        if self.file and not self.sha256:
+            if self.file._committed:
+                # Stored by FieldFile.save(): the storage named the file after its content
+                self.sha256 = sha256_of_name(self.file.name)
+            else:
+                # Set by HashingFileUploadHandler for HTTP uploads; hashed here for files created in code
+                self.sha256 = digest_upload(self.file.file).sha256
+        super().save(*args, **kwargs)
+
+    def release_file(self):
+        """Delete the stored file unless another upload shares the same content."""
+        if not UploadedFile.objects.filter(file=self.file.name).exclude(id=self.id).exists():
+            self.file.delete(save=False)
 
     def __str__(self):
         return str(self.id)
 
+class EvaluationBatch(models.Model):
+    # 'rank' orders the batch's jobs by CV/role embedding similarity; 'filter' also
+    # screens out those below a percentile before any LLM call
+    PRESCREEN_CHOICES = [
+        ('off', 'Off'),
+        ('rank', 'Rank'),
+        ('filter', 'Filter'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_title = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    prescreen = models.CharField(max_length=10, choices=PRESCREEN_CHOICES, default='off')
+    # Jobs of a pre-screened batch are not dispatched before this is set
+    prescreened_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Batch {self.id} - {self.job_title}"
+
 class EvaluationJob(models.Model):
     STATUS_CHOICES = [
         ('queued', 'Queued'),
         ('processing', 'Processing'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
+        ('prescreened_out', 'Prescreened out'),
+    ]
+    TERMINAL_STATUSES = ('completed', 'failed', 'prescreened_out')
+
+    # Interactive jobs are dispatched at once; bulk jobs by the fair-share scheduler
+    PRIORITY_CHOICES = [
+        ('interactive', 'Interactive'),
+        ('bulk', 'Bulk'),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     job_title = models.CharField(max_length=255)
     cv = models.ForeignKey(UploadedFile, related_name='evaluation_cv', on_delete=models.CASCADE)
     project_report = models.ForeignKey(UploadedFile, related_name='evaluation_project_report', on_delete=models.CASCADE)
+    batch = models.ForeignKey(EvaluationBatch, related_name='jobs', on_delete=models.SET_NULL, null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Scheduling
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='evaluation_jobs', on_delete=models.SET_NULL, null=True, blank=True,
+    )
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='interactive')
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+
     # Result fields
     cv_match_rate = models.FloatField(null=True, blank=True)
     cv_feedback = models.TextField(null=True, blank=True)
@@ -32,5 +91,52 @@ class EvaluationJob(models.Model):
     project_feedback = models.TextField(null=True, blank=True)
     overall_summary = models.TextField(null=True, blank=True)
 
+    # Set when extraction stopped at the configured page/character budget
+    cv_truncated = models.BooleanField(default=False)
+    project_report_truncated = models.BooleanField(default=False)
+    # Estimated prompt tokens sent to the LLM across all stages
+    prompt_tokens = models.PositiveIntegerField(null=True, blank=True)
+    # Per-stage ('cv', 'project', 'summary') status and streamed partial output
+    progress = models.JSONField(default=dict, blank=True)
+    # Cosine similarity of the CV to the role's job description, set by the pre-screen
+    prescreen_score = models.FloatField(null=True, blank=True)
+    # Hash of the owner, the normalized job title and both files' contents, for deduplicating requests
+    dedupe_key = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='evaluation_status_created'),
+            # Keyset pagination of GET /api/jobs/: each ordering's key, behind the owner and common filters
+            models.Index(fields=['owner', 'created_at', 'id'], name='evaluation_created_id'),
+            models.Index(fields=['owner', 'job_title', 'status', 'created_at', 'id'], name='evaluation_title_created'),
+            models.Index(fields=['owner', 'job_title', 'status', 'cv_match_rate', 'created_at', 'id'],
+                         name='evaluation_title_match_rate'),
+            models.Index(fields=['owner', 'job_title', 'status', 'project_score', 'created_at', 'id'],
+                         name='evaluation_title_score'),
+            models.Index(fields=['batch', 'status', 'prescreen_score'], name='evaluation_batch_prescreen'),
+        ]
+        constraints = [
+            # At most one queued/processing job per request: concurrent duplicates attach to it
+            models.UniqueConstraint(
+                fields=['dedupe_key'], condition=models.Q(status__in=('queued', 'processing')),
+                name='unique_in_flight_evaluation',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Evaluation {self.id} - {self.status}"
+
+class EvaluationCheckpoint(models.Model):
+    """Output of one completed pipeline stage, so a retried job resumes where it stopped."""
+    job = models.ForeignKey(EvaluationJob, related_name='checkpoints', on_delete=models.CASCADE)
+    stage = models.CharField(max_length=50)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'stage'], name='unique_checkpoint_per_job_stage'),
+        ]
+
     def __str__(self):
-        return f"Evaluation {self.id} - {self.status}"
\ No newline at end of file
+        return f"Checkpoint {self.job_id} - {self.stage}"
@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+
+from core.application.interfaces import STATUS_EVENT, IJobEventPublisher
+
+CHANNEL_PREFIX = "evaluation-job:"
+
+
+def encode_event(event: str, status: str) -> str:
+    return f"{event}:{status}"
+
+
+def decode_event(data: str):
+    """(event, status) of a message; a bare status is a status event."""
+    event, separator, status = data.partition(":")
+    return (event, status) if separator else (STATUS_EVENT, data)
+
+
+class LocalJobSubscription:
+    def __init__(self, bus, job_id: str):
+        self.bus = bus
+        self.job_id = job_id
+        self.queue = queue.Queue()
+
+    def wait(self, timeout: float):
+        """Block until the job's next event; returns (event, status) or None on timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalJobEventBus(IJobEventPublisher):
+    """
+    In-process stand-in for the Redis bus. Only delivers events published in the
+    same process, e.g. in tests or when Celery runs tasks eagerly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, job_id: str) -> LocalJobSubscription:
+        subscription = LocalJobSubscription(self, str(job_id))
+        with self._lock:
+            self._subscriptions.setdefault(subscription.job_id, []).append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.job_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.job_id, None)
+
+    def publish(self, job_id: str, status: str, event: str = STATUS_EVENT):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(str(job_id), []))
+        for subscription in subscriptions:
+            subscription.queue.put((event, status))
+
+
+class RedisJobSubscription:
+    def __init__(self, client, job_id: str):
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(CHANNEL_PREFIX + str(job_id))
+
+    def wait(self, timeout: float):
+        """Block until the job's next event; returns (event, status) or None on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            message = self.pubsub.get_message(timeout=remaining)
+            if message and message['type'] == 'message':
+                data = message['data']
+                return decode_event(data.decode() if isinstance(data, bytes) else data)
+
+    def close(self):
+        self.pubsub.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RedisJobEventBus(IJobEventPublisher):
+    """Publishes job status transitions and progress writes on a per-job Redis pub/sub channel."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def subscribe(self, job_id: str) -> RedisJobSubscription:
+        return RedisJobSubscription(self.client, job_id)
+
+    def publish(self, job_id: str, status: str, event: str = STATUS_EVENT):
+        self.client.publish(CHANNEL_PREFIX + str(job_id), encode_event(event, status))
+
+
+_buses = {}
+_buses_lock = threading.Lock()
+
+
+def get_job_event_bus():
+    """Process-wide bus selected by the JOB_EVENTS_BACKEND setting ('redis' or 'local')."""
+    from django.conf import settings
+
+    backend = getattr(settings, 'JOB_EVENTS_BACKEND', 'local')
+    with _buses_lock:
+        if backend not in _buses:
+            if backend == 'redis':
+                url = getattr(settings, 'JOB_EVENTS_REDIS_URL', None) or settings.CELERY_BROKER_URL
+                _buses[backend] = RedisJobEventBus(url)
+            else:
+                _buses[backend] = LocalJobEventBus()
+        return _buses[backend]
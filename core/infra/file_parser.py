@@ -1,11 +1,116 @@
+import billiard
 from PyPDF2 import PdfReader
-from core.application.interfaces import IFileParser
+from core.application.interfaces import ExtractedText, IFileParser
+from core.infra.hashing import content_hash
+
+def _extract_in_child(conn, parser, file_path):
+    try:
+        conn.send((True, parser.extract_inline(file_path)))
+    except Exception as e:
+        conn.send((False, e))
+    finally:
+        conn.close()
 
 class PdfParser(IFileParser):
-    def parse(self, file_path: str) -> str:
+    """
+    Extracts text page by page, stopping at a page or character budget.
+
+    With a `timeout`, extraction runs in a child process that is killed once the
+    deadline passes, so a pathological PDF can't hold a worker for the task's
+    whole time limit. The child is started with billiard, Celery's fork of
+    multiprocessing, because prefork pool workers are daemonic and
+    multiprocessing refuses to start children from them.
+    """
+
+    def __init__(self, max_pages=None, max_chars=None, timeout=None):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.timeout = timeout
+
+    @property
+    def version(self) -> str:
+        # Bump the leading number whenever extraction output changes so cached texts are not reused.
+        return f"2:{self.max_pages}:{self.max_chars}"
+
+    def iter_pages(self, file_path: str):
+        """Yield the text of each page without holding the whole document's text."""
         with open(file_path, 'rb') as f:
             pdf = PdfReader(f)
-            text = ""
             for page in pdf.pages:
-                text += page.extract_text()
-        return text
+                yield page.extract_text() or ""
+
+    def extract_inline(self, file_path: str) -> ExtractedText:
+        parts = []
+        chars = 0
+        pages = 0
+        truncated = False
+        for page_text in self.iter_pages(file_path):
+            if self.max_pages is not None and pages >= self.max_pages:
+                truncated = True
+                break
+            if self.max_chars is not None and chars + len(page_text) > self.max_chars:
+                parts.append(page_text[:self.max_chars - chars])
+                pages += 1
+                truncated = True
+                break
+            parts.append(page_text)
+            chars += len(page_text)
+            pages += 1
+        return ExtractedText(text="".join(parts), pages=pages, truncated=truncated)
+
+    def extract(self, file_path: str) -> ExtractedText:
+        if not self.timeout:
+            return self.extract_inline(file_path)
+
+        parent_conn, child_conn = billiard.Pipe(duplex=False)
+        process = billiard.Process(
+            target=_extract_in_child, args=(child_conn, self, file_path), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        try:
+            if not parent_conn.poll(self.timeout):
+                raise TimeoutError(f"PDF extraction exceeded {self.timeout}s")
+            ok, result = parent_conn.recv()
+        finally:
+            parent_conn.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        if not ok:
+            raise result
+        return result
+
+    def parse(self, file_path: str) -> str:
+        return self.extract(file_path).text
+
+class CachingFileParser(IFileParser):
+    """
+    Content-addressed cache in front of another parser.
+
+    Texts are keyed by the SHA-256 of the file bytes and the wrapped parser's
+    version, so the same document uploaded several times is only extracted once.
+    `cache` is any object with the Django cache API (`get`/`set`); eviction and
+    size bounds are those of the configured backend.
+    """
+
+    def __init__(self, parser: IFileParser, cache, timeout=None):
+        self.parser = parser
+        self.cache = cache
+        self.timeout = timeout
+
+    def cache_key(self, file_path: str) -> str:
+        parser_name = type(self.parser).__name__
+        parser_version = getattr(self.parser, 'version', '0')
+        return f"parse:{parser_name}:{parser_version}:{content_hash(file_path)}"
+
+    def extract(self, file_path: str) -> ExtractedText:
+        key = self.cache_key(file_path)
+        extracted = self.cache.get(key)
+        if extracted is None:
+            extracted = self.parser.extract(file_path)
+            self.cache.set(key, extracted, self.timeout)
+        return extracted
+
+    def parse(self, file_path: str) -> str:
+        return self.extract(file_path).text
@@ -0,0 +1,25 @@
+import hashlib
+import os
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+
+def sha256_file(file_path: str) -> str:
+    """Hex SHA-256 of a file, read in fixed-size chunks to keep memory flat."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_SHA256_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+
+def content_hash(file_path: str) -> str:
+    """SHA-256 of a file, taken from the name of a content-addressed upload or else computed."""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    if _SHA256_NAME.match(stem):
+        return stem
+    return sha256_file(file_path)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import threading
+from dataclasses import asdict, replace
+
+from core.application.interfaces import EvaluationResult, ILLMService, LLMOutput
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+# Checks a response must pass to be cached: the same parsing the use case applies,
+# so a malformed or out-of-range answer is asked again on retry instead of replayed
+VALIDATORS = {
+    'cv': EvaluationResult.parse_cv,
+    'project': EvaluationResult.parse_project,
+}
+
+
+class CachedLLMService(ILLMService):
+    """
+    Response cache around any ILLMService.
+
+    A response is reused when the model, the prompt template, the retrieved
+    context and the document text all match. `backend` is any object with the
+    Django cache API: an in-process `LRUCache`, or a configured Django cache
+    alias (file-based, Redis, ...) to share responses between workers. Only
+    responses that pass `VALIDATORS` are stored, and a stored one that no longer
+    does is dropped and asked again.
+    """
+
+    def __init__(self, llm_service: ILLMService, backend, timeout=None):
+        self.llm_service = llm_service
+        self.backend = backend
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model_name(self):
+        return self.llm_service.model_name
+
+    def prompt_template(self, stage: str) -> str:
+        return self.llm_service.prompt_template(stage)
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        return self.llm_service.retrieve_context(stage, retriever)
+
+    def cache_key(self, stage: str, context: dict, document: str) -> str:
+        return ":".join([
+            "llm",
+            stage,
+            str(self.model_name),
+            _digest(self.prompt_template(stage)),
+            _digest(json.dumps(context, sort_keys=True)),
+            _digest(document),
+        ])
+
+    @staticmethod
+    def is_valid(stage: str, response) -> bool:
+        if not str(response).strip():
+            return False
+        validate = VALIDATORS.get(stage)
+        if validate is None:
+            return True
+        try:
+            validate(str(response))
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def is_valid_result(cached) -> bool:
+        try:
+            EvaluationResult(**cached).validate()
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def _get(self, key: str, is_valid):
+        """The cached value of `key`, counted as a hit, or None; an invalid entry is evicted."""
+        cached = self.backend.get(key)
+        if cached is not None and not is_valid(cached):
+            self.backend.delete(key)
+            cached = None
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def _cached(self, stage: str, context: dict, document: str, call, on_chunk=None):
+        key = self.cache_key(stage, context, document)
+        result = self._get(key, lambda cached: self.is_valid(stage, cached))
+        if result is not None:
+            if on_chunk is not None:
+                on_chunk(result)
+            # Nothing was sent to the model for a cached response
+            return LLMOutput(result)
+        result = call()
+        if self.is_valid(stage, result):
+            self.backend.set(key, str(result), self.timeout)
+        return result
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        context = self.retrieve_context('cv', retriever)
+        return self._cached('cv', context, cv_content,
+                            lambda: self.llm_service.evaluate_cv(cv_content, retriever, on_chunk=on_chunk),
+                            on_chunk)
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        context = self.retrieve_context('project', retriever)
+        return self._cached('project', context, project_content,
+                            lambda: self.llm_service.evaluate_project(project_content, retriever, on_chunk=on_chunk),
+                            on_chunk)
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        document = json.dumps([cv_evaluation, project_evaluation])
+        return self._cached('summary', {}, document,
+                            lambda: self.llm_service.generate_summary(cv_evaluation, project_evaluation,
+                                                                      on_chunk=on_chunk),
+                            on_chunk)
+
+    def evaluate_candidate(self, cv_content: str, project_content: str, retriever) -> EvaluationResult:
+        key = self.cache_key('candidate', self.retrieve_context('candidate', retriever),
+                             json.dumps([cv_content, project_content]))
+        cached = self._get(key, self.is_valid_result)
+        if cached is not None:
+            return EvaluationResult(**{**cached, 'prompt_tokens': 0})
+        result = self.llm_service.evaluate_candidate(cv_content, project_content, retriever)
+        payload = asdict(replace(result, prompt_tokens=0))
+        if self.is_valid_result(payload):
+            self.backend.set(key, payload, self.timeout)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
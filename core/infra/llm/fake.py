@@ -0,0 +1,96 @@
+import random
+import threading
+import time
+
+from core.application.interfaces import EvaluationResult, ILLMService, RoleContext
+from core.infra.llm.google import CV_RUBRIC_QUERY, CASE_STUDY_QUERY, PROJECT_RUBRIC_QUERY, job_description_query
+
+CANNED_CV_RESULT = "Match Rate: 0.82\nFeedback: Strong backend experience with Python and Django; limited exposure to LLM tooling."
+CANNED_PROJECT_RESULT = "Score: 4.1\nFeedback: Clean architecture and good error handling; retries and observability could be stronger."
+CANNED_SUMMARY = "The candidate is a solid backend engineer with a well-structured project. Recommended for the next round."
+
+
+class FakeLLMService(ILLMService):
+    """
+    Offline stand-in for GoogleLLMService with canned outputs in the same format.
+
+    Each call sleeps for `latency` seconds plus uniform `jitter`, and still performs
+    the real context retrieval, so the rest of the pipeline can be benchmarked
+    without network access or API cost.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed=None,
+                 cv_result: str = CANNED_CV_RESULT,
+                 project_result: str = CANNED_PROJECT_RESULT,
+                 summary: str = CANNED_SUMMARY):
+        self.model_name = "fake-llm"
+        self.latency = latency
+        self.jitter = jitter
+        self.cv_result = cv_result
+        self.project_result = project_result
+        self.summary = summary
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _respond(self, output: str, on_chunk=None) -> str:
+        """Sleep for the call's latency; when streaming, spread it over the output's words."""
+        if on_chunk is None:
+            self._sleep()
+            return output
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        words = output.split(" ")
+        for index, word in enumerate(words):
+            if delay > 0:
+                time.sleep(delay / len(words))
+            on_chunk(word if index == 0 else " " + word)
+        return output
+
+    def prompt_template(self, stage: str) -> str:
+        return f"fake-{stage}"
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        if isinstance(retriever, RoleContext):
+            return retriever.for_stage(stage)
+        if stage == 'cv':
+            queries = (job_description_query(retriever), CV_RUBRIC_QUERY)
+        elif stage == 'project':
+            queries = (CASE_STUDY_QUERY, PROJECT_RUBRIC_QUERY)
+        elif stage == 'candidate':
+            queries = (job_description_query(retriever), CV_RUBRIC_QUERY, CASE_STUDY_QUERY, PROJECT_RUBRIC_QUERY)
+        else:
+            return {}
+        return {
+            query: " ".join(doc.page_content for doc in retriever.get_relevant_documents(query))
+            for query in queries
+        }
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        self.retrieve_context('cv', retriever)
+        return self._respond(self.cv_result, on_chunk)
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        self.retrieve_context('project', retriever)
+        return self._respond(self.project_result, on_chunk)
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        return self._respond(self.summary, on_chunk)
+
+    def evaluate_candidate(self, cv_content: str, project_content: str, retriever) -> EvaluationResult:
+        self.retrieve_context('candidate', retriever)
+        self._sleep()
+        cv_match_rate, cv_feedback = EvaluationResult.parse_cv(self.cv_result)
+        project_score, project_feedback = EvaluationResult.parse_project(self.project_result)
+        return EvaluationResult(
+            cv_match_rate=cv_match_rate,
+            cv_feedback=cv_feedback,
+            project_score=project_score,
+            project_feedback=project_feedback,
+            overall_summary=self.summary,
+        )
@@ -1,89 +1,169 @@
-from langchain_google_genai import GoogleGenerativeAI
+from functools import cached_property
+
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from core.application.interfaces import ILLMService
+from core.application.interfaces import EvaluationResult, ILLMService, LLMOutput, RoleContext
+from core.infra.llm.prompt_budget import estimate_tokens
+from core.infra.llm.schemas import CandidateEvaluation
 
-class GoogleLLMService(ILLMService):
-    def __init__(self, model_name="gemini-pro"):
-        self.llm = GoogleGenerativeAI(model=model_name)
+JOB_DESCRIPTION_QUERY = "Backend Developer Job Description"
+CV_RUBRIC_QUERY = "CV Evaluation Scoring Rubric"
+CASE_STUDY_QUERY = "Case Study Brief"
+PROJECT_RUBRIC_QUERY = "Project Deliverable Evaluation Scoring Rubric"
 
-    def evaluate_cv(self, cv_content: str, retriever):
-        prompt = PromptTemplate(
-            template="""
+# Reference context retrieved for every job; warmed into the retrieval cache at worker start.
+CONTEXT_QUERIES = (JOB_DESCRIPTION_QUERY, CV_RUBRIC_QUERY, CASE_STUDY_QUERY, PROJECT_RUBRIC_QUERY)
+
+
+def job_description_query(retriever) -> str:
+    """Query for the job description of the retriever's role, else of the default role."""
+    title = getattr(retriever, 'title', None)
+    return f"{title} Job Description" if title else JOB_DESCRIPTION_QUERY
+
+PROMPT_TEMPLATES = {
+    'cv': """
             Based on the following job description and scoring rubric, evaluate the candidate's CV.
-            
+
             Job Description: {job_description}
-            
+
             CV Scoring Rubric: {cv_rubric}
-            
+
             Candidate CV: {cv_text}
-            
+
             Provide a match rate (0.0 to 1.0) and feedback.
             Format your response as:
             Match Rate: [rate]
             Feedback: [feedback]
             """,
-            input_variables=["job_description", "cv_rubric", "cv_text"]
-        )
-        
-        job_description_docs = retriever.get_relevant_documents("Backend Developer Job Description")
-        cv_rubric_docs = retriever.get_relevant_documents("CV Evaluation Scoring Rubric")
-        
-        chain = prompt | self.llm | StrOutputParser()
-        result = chain.invoke({
-            "job_description": " ".join([doc.page_content for doc in job_description_docs]),
-            "cv_rubric": " ".join([doc.page_content for doc in cv_rubric_docs]),
-            "cv_text": cv_content
-        })
-        return result
-
-    def evaluate_project(self, project_content: str, retriever):
-        prompt = PromptTemplate(
-            template="""
+    'project': """
             Based on the following case study brief and scoring rubric, evaluate the candidate's project report.
-            
+
             Case Study Brief: {case_study_brief}
-            
+
             Project Scoring Rubric: {project_rubric}
-            
+
             Candidate Project Report: {project_report_text}
-            
+
             Provide a score (1.0 to 5.0) and feedback.
             Format your response as:
             Score: [score]
             Feedback: [feedback]
             """,
-            input_variables=["case_study_brief", "project_rubric", "project_report_text"]
-        )
-        
-        case_study_docs = retriever.get_relevant_documents("Case Study Brief")
-        project_rubric_docs = retriever.get_relevant_documents("Project Deliverable Evaluation Scoring Rubric")
-        
-        chain = prompt | self.llm | StrOutputParser()
-        result = chain.invoke({
-            "case_study_brief": " ".join([doc.page_content for doc in case_study_docs]),
-            "project_rubric": " ".join([doc.page_content for doc in project_rubric_docs]),
-            "project_report_text": project_content
-        })
-        return result
-
-    def generate_summary(self, cv_evaluation: str, project_evaluation: str):
-        prompt = PromptTemplate(
-            template="""
+    'summary': """
             Based on the CV evaluation and project report evaluation, provide a concise overall summary of the candidate.
-            
+
             CV Evaluation: {cv_evaluation}
-            
+
             Project Report Evaluation: {project_evaluation}
-            
+
             Provide a 3-5 sentence summary.
             """,
-            input_variables=["cv_evaluation", "project_evaluation"]
+    'candidate': """
+            Evaluate the candidate's CV and project report, then summarize the candidate.
+
+            Job Description: {job_description}
+
+            CV Scoring Rubric: {cv_rubric}
+
+            Candidate CV: {cv_text}
+
+            Case Study Brief: {case_study_brief}
+
+            Project Scoring Rubric: {project_rubric}
+
+            Candidate Project Report: {project_report_text}
+
+            Give a CV match rate (0.0 to 1.0) with feedback, a project score (1.0 to 5.0)
+            with feedback, and a 3-5 sentence overall summary.
+            """,
+}
+
+class GoogleLLMService(ILLMService):
+    def __init__(self, model_name="gemini-pro", prompt_budget=None):
+        self.model_name = model_name
+        self.llm = GoogleGenerativeAI(model=model_name)
+        self.prompt_budget = prompt_budget
+
+    def prompt_template(self, stage: str) -> str:
+        return PROMPT_TEMPLATES[stage]
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        if isinstance(retriever, RoleContext):
+            return retriever.for_stage(stage)
+        if stage == 'cv':
+            job_description_docs = retriever.get_relevant_documents(job_description_query(retriever))
+            cv_rubric_docs = retriever.get_relevant_documents(CV_RUBRIC_QUERY)
+            return {
+                "job_description": " ".join([doc.page_content for doc in job_description_docs]),
+                "cv_rubric": " ".join([doc.page_content for doc in cv_rubric_docs]),
+            }
+        if stage == 'project':
+            case_study_docs = retriever.get_relevant_documents(CASE_STUDY_QUERY)
+            project_rubric_docs = retriever.get_relevant_documents(PROJECT_RUBRIC_QUERY)
+            return {
+                "case_study_brief": " ".join([doc.page_content for doc in case_study_docs]),
+                "project_rubric": " ".join([doc.page_content for doc in project_rubric_docs]),
+            }
+        if stage == 'candidate':
+            return {**self.retrieve_context('cv', retriever), **self.retrieve_context('project', retriever)}
+        return {}
+
+    @cached_property
+    def structured_llm(self):
+        """Chat model constrained to answer with the CandidateEvaluation JSON schema."""
+        return ChatGoogleGenerativeAI(model=self.model_name).with_structured_output(
+            CandidateEvaluation, method="json_schema",
+        )
+
+    def _prompt(self, stage: str, inputs: dict):
+        count_tokens = estimate_tokens
+        if self.prompt_budget is not None:
+            inputs = self.prompt_budget.assemble(inputs)
+            count_tokens = self.prompt_budget.count_tokens
+        prompt = PromptTemplate(
+            template=self.prompt_template(stage),
+            input_variables=list(inputs),
         )
-        
+        return prompt, inputs, count_tokens(prompt.format(**inputs))
+
+    def _run(self, stage: str, inputs: dict, on_chunk=None) -> LLMOutput:
+        prompt, inputs, prompt_tokens = self._prompt(stage, inputs)
         chain = prompt | self.llm | StrOutputParser()
-        result = chain.invoke({
+        if on_chunk is None:
+            return LLMOutput(chain.invoke(inputs), prompt_tokens)
+
+        chunks = []
+        for chunk in chain.stream(inputs):
+            chunks.append(chunk)
+            on_chunk(chunk)
+        return LLMOutput("".join(chunks), prompt_tokens)
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        return self._run('cv', {
+            **self.retrieve_context('cv', retriever),
+            "cv_text": cv_content,
+        }, on_chunk)
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        return self._run('project', {
+            **self.retrieve_context('project', retriever),
+            "project_report_text": project_content,
+        }, on_chunk)
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        return self._run('summary', {
             "cv_evaluation": cv_evaluation,
-            "project_evaluation": project_evaluation
+            "project_evaluation": project_evaluation,
+        }, on_chunk)
+
+    def evaluate_candidate(self, cv_content: str, project_content: str, retriever) -> EvaluationResult:
+        prompt, inputs, prompt_tokens = self._prompt('candidate', {
+            **self.retrieve_context('candidate', retriever),
+            "cv_text": cv_content,
+            "project_report_text": project_content,
         })
-        return result
+        evaluation = (prompt | self.structured_llm).invoke(inputs)
+        if evaluation is None:
+            raise ValueError("The model did not return an evaluation matching the schema")
+        return evaluation.to_result(prompt_tokens)
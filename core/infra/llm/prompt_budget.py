@@ -0,0 +1,127 @@
+import math
+import re
+from collections import Counter
+
+# Rough characters-per-token ratio of Gemini/GPT style tokenizers on English text.
+CHARS_PER_TOKEN = 4
+
+# Sections of long documents are ranked against the rubric and brief of their stage.
+RANK_AGAINST = {
+    'cv_text': ('cv_rubric', 'job_description'),
+    'project_report_text': ('project_rubric', 'case_study_brief'),
+}
+
+OMISSION_MARKER = "\n[...]\n"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _terms(text: str) -> list:
+    return _WORD.findall(text.lower())
+
+
+class PromptBudget:
+    """
+    Fits prompt inputs into per-section token budgets.
+
+    A section within its budget is passed through. A longer one is split into
+    chunks of about `chunk_tokens` tokens; for candidate documents the chunks are
+    ranked by term overlap with the stage's rubric (IDF-weighted over the
+    document's own chunks) and the best ones that fit are kept, in their original
+    order. Other sections keep their leading chunks.
+    """
+
+    def __init__(self, budgets: dict, count_tokens=estimate_tokens, chunk_tokens: int = 200):
+        self.budgets = budgets
+        self.count_tokens = count_tokens
+        self.chunk_tokens = chunk_tokens
+
+    def assemble(self, inputs: dict) -> dict:
+        fitted = {}
+        for section, text in inputs.items():
+            budget = self.budgets.get(section)
+            if budget is None or not isinstance(text, str):
+                fitted[section] = text
+                continue
+            query = " ".join(inputs.get(name, "") for name in RANK_AGAINST.get(section, ()))
+            fitted[section] = self.fit(text, budget, query)
+        return fitted
+
+    def fit(self, text: str, budget: int, query: str = "") -> str:
+        if self.count_tokens(text) <= budget:
+            return text
+
+        chunks = self.chunk(text)
+        sizes = [self.count_tokens(chunk) for chunk in chunks]
+        if query:
+            scores = self.rank(chunks, query)
+            order = sorted(range(len(chunks)), key=lambda index: (-scores[index], index))
+        else:
+            order = range(len(chunks))
+
+        selected, used = [], 0
+        for index in order:
+            if used + sizes[index] <= budget:
+                selected.append(index)
+                used += sizes[index]
+            elif not query:
+                break
+        selected.sort()
+
+        parts = []
+        for position, index in enumerate(selected):
+            if position and index != selected[position - 1] + 1:
+                parts.append(OMISSION_MARKER)
+            elif position:
+                parts.append("\n")
+            parts.append(chunks[index])
+        return "".join(parts)
+
+    def chunk(self, text: str) -> list:
+        """Split on line boundaries into pieces of at most about `chunk_tokens` tokens."""
+        chunks, current, current_tokens = [], [], 0
+        for line in self._lines(text):
+            tokens = self.count_tokens(line)
+            if current and current_tokens + tokens > self.chunk_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(line)
+            current_tokens += tokens
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def _lines(self, text: str):
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if self.count_tokens(line) <= self.chunk_tokens:
+                yield line
+                continue
+            # A single overlong line (common in PDF extraction) is split on words.
+            words, piece = line.split(), []
+            for word in words:
+                piece.append(word)
+                if self.count_tokens(" ".join(piece)) >= self.chunk_tokens:
+                    yield " ".join(piece)
+                    piece = []
+            if piece:
+                yield " ".join(piece)
+
+    def rank(self, chunks: list, query: str) -> list:
+        query_terms = set(_terms(query))
+        chunk_terms = [Counter(_terms(chunk)) for chunk in chunks]
+        document_frequency = Counter(term for terms in chunk_terms for term in terms)
+        scores = []
+        for terms in chunk_terms:
+            overlap = sum(
+                (1 + math.log(count)) * math.log(1 + len(chunks) / document_frequency[term])
+                for term, count in terms.items() if term in query_terms
+            )
+            scores.append(overlap / math.sqrt(sum(terms.values()) or 1))
+        return scores
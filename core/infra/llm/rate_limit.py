@@ -0,0 +1,215 @@
+import re
+import time
+
+from core.application.interfaces import EvaluationResult, ILLMService, RetryLater
+
+# GCRA over a hash holding the theoretical arrival time ('tat') and the current
+# adaptive rate ('rate', requests per minute). Returns {allowed, seconds to wait}.
+# ARGV: max rate, burst, state ttl, now (0 = use the Redis clock)
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[4])
+if now <= 0 then
+    local t = redis.call('TIME')
+    now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+end
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate') or ARGV[1])
+local burst = tonumber(ARGV[2])
+local interval = 60 / rate
+local tat = tonumber(redis.call('HGET', KEYS[1], 'tat') or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if allow_at > now then
+    return {0, tostring(allow_at - now)}
+end
+redis.call('HSET', KEYS[1], 'tat', tostring(new_tat))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return {1, '0'}
+"""
+
+# Additive increase / multiplicative decrease of the shared rate.
+# ARGV: max rate, min rate, event ('throttled' or 'success'), decrease factor,
+#       increase step, decrease cooldown, increase interval, state ttl, now
+ADAPT_SCRIPT = """
+local now = tonumber(ARGV[9])
+if now <= 0 then
+    local t = redis.call('TIME')
+    now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+end
+local max_rate = tonumber(ARGV[1])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate') or max_rate)
+local changed_at = tonumber(redis.call('HGET', KEYS[1], 'changed_at') or 0)
+local new_rate = rate
+if ARGV[3] == 'throttled' then
+    if now - changed_at >= tonumber(ARGV[6]) then
+        new_rate = math.max(tonumber(ARGV[2]), rate * tonumber(ARGV[4]))
+    end
+elseif rate < max_rate and now - changed_at >= tonumber(ARGV[7]) then
+    new_rate = math.min(max_rate, rate + tonumber(ARGV[5]))
+end
+if new_rate ~= rate then
+    redis.call('HSET', KEYS[1], 'rate', tostring(new_rate), 'changed_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[8]))
+end
+return tostring(new_rate)
+"""
+
+
+_HTTP_429 = re.compile(r"\b429\b")
+
+
+class RateLimitTimeout(RetryLater):
+    """No request slot became free within the limiter's wait budget."""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception (or anything it wraps) is a provider quota/429 response."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if type(error).__name__ in ('ResourceExhausted', 'TooManyRequests', 'RateLimitError'):
+            return True
+        if 429 in (getattr(error, 'code', None), getattr(error, 'status_code', None)):
+            return True
+        message = str(error)
+        if 'RESOURCE_EXHAUSTED' in message or _HTTP_429.search(message):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class RedisRateLimiter:
+    """
+    Cluster-wide request limiter for the LLM provider, shared through Redis.
+
+    Admission is GCRA: requests are spaced 60/rate seconds apart, with up to
+    `burst` sent back to back. The rate adapts to the provider: each throttling
+    response multiplies it by `decrease_factor` (at most once per
+    `decrease_cooldown` seconds, so one burst of 429s counts once), and while
+    calls succeed it grows by `increase_step` per `increase_interval` seconds
+    back up to `max_rate`.
+    """
+
+    def __init__(
+        self,
+        client,
+        key: str = "llm-rate-limit",
+        max_rate: float = 60,
+        min_rate: float = 1,
+        burst: int = 1,
+        decrease_factor: float = 0.5,
+        increase_step: float = 1,
+        decrease_cooldown: float = 5,
+        increase_interval: float = 10,
+        state_ttl: int = 24 * 3600,
+        clock=None,
+    ):
+        self.client = client
+        self.key = key
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.decrease_cooldown = decrease_cooldown
+        self.increase_interval = increase_interval
+        self.state_ttl = state_ttl
+        self.clock = clock
+        self._acquire = client.register_script(ACQUIRE_SCRIPT)
+        self._adapt = client.register_script(ADAPT_SCRIPT)
+
+    def _now(self) -> float:
+        # 0 tells the scripts to use the Redis server clock, shared by every worker
+        return self.clock() if self.clock is not None else 0
+
+    def try_acquire(self):
+        """(allowed, seconds until a slot frees up) without blocking."""
+        allowed, retry_after = self._acquire(
+            keys=[self.key], args=[self.max_rate, self.burst, self.state_ttl, self._now()],
+        )
+        return bool(int(allowed)), float(retry_after)
+
+    def acquire(self, timeout: float = None):
+        """Block until a request may be sent; raises RateLimitTimeout after `timeout` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            allowed, retry_after = self.try_acquire()
+            if allowed:
+                return
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < retry_after:
+                    raise RateLimitTimeout(f"No LLM request slot within {timeout}s", retry_after=retry_after)
+            time.sleep(retry_after)
+
+    def _record(self, event: str) -> float:
+        return float(self._adapt(keys=[self.key], args=[
+            self.max_rate, self.min_rate, event, self.decrease_factor, self.increase_step,
+            self.decrease_cooldown, self.increase_interval, self.state_ttl, self._now(),
+        ]))
+
+    def record_throttled(self) -> float:
+        return self._record('throttled')
+
+    def record_success(self) -> float:
+        return self._record('success')
+
+    def current_rate(self) -> float:
+        rate = self.client.hget(self.key, 'rate')
+        return float(rate) if rate is not None else float(self.max_rate)
+
+
+class RateLimitedLLMService(ILLMService):
+    """
+    Sends every call of the wrapped ILLMService through a shared RedisRateLimiter.
+
+    Calls wait up to `max_wait` seconds for a slot, then raise RateLimitTimeout so
+    the job is put back in the queue. A call rejected by the provider's quota
+    shrinks the shared rate and is retried, up to `max_retries` times.
+    """
+
+    def __init__(self, llm_service: ILLMService, limiter: RedisRateLimiter,
+                 max_wait: float = None, max_retries: int = 3):
+        self.llm_service = llm_service
+        self.limiter = limiter
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+
+    @property
+    def model_name(self):
+        return self.llm_service.model_name
+
+    def prompt_template(self, stage: str) -> str:
+        return self.llm_service.prompt_template(stage)
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        return self.llm_service.retrieve_context(stage, retriever)
+
+    def _call(self, call):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(timeout=self.max_wait)
+            try:
+                result = call()
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limit_error(e):
+                    raise
+                self.limiter.record_throttled()
+                continue
+            self.limiter.record_success()
+            return result
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        return self._call(lambda: self.llm_service.evaluate_cv(cv_content, retriever, on_chunk=on_chunk))
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        return self._call(lambda: self.llm_service.evaluate_project(project_content, retriever, on_chunk=on_chunk))
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        return self._call(
+            lambda: self.llm_service.generate_summary(cv_evaluation, project_evaluation, on_chunk=on_chunk)
+        )
+
+    def evaluate_candidate(self, cv_content: str, project_content: str, retriever) -> EvaluationResult:
+        return self._call(lambda: self.llm_service.evaluate_candidate(cv_content, project_content, retriever))
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+from core.application.interfaces import EvaluationResult
+
+
+class CandidateEvaluation(BaseModel):
+    """JSON schema the model must answer with in single-call evaluation mode."""
+
+    cv_match_rate: float = Field(ge=0.0, le=1.0, description="How well the CV matches the job, 0.0 to 1.0")
+    cv_feedback: str = Field(min_length=1, description="Feedback on the CV against the CV rubric")
+    project_score: float = Field(ge=1.0, le=5.0, description="Project report score, 1.0 to 5.0")
+    project_feedback: str = Field(min_length=1, description="Feedback on the project report against its rubric")
+    overall_summary: str = Field(min_length=1, description="3-5 sentence summary of the candidate")
+
+    def to_result(self, prompt_tokens: int = 0) -> EvaluationResult:
+        return EvaluationResult(prompt_tokens=prompt_tokens, **self.model_dump())
@@ -0,0 +1,56 @@
+import hashlib
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from core.domain.models import EvaluationJob
+from core.infra.hashing import content_hash
+from core.infra.persistence.django_repository import DjangoEvaluationRepository
+from core.infra.roles import normalize_job_title
+
+IN_FLIGHT_STATUSES = ('queued', 'processing')
+
+
+def evaluation_dedupe_key(job_title: str, cv, project_report, owner_id=None) -> str:
+    """
+    Key of an evaluation request: its owner, the normalized job title and both
+    uploads' content hashes. Requests are only shared within one owner, so a user
+    never receives another user's feedback.
+    """
+    parts = [str(owner_id or ''), normalize_job_title(job_title)] + [
+        upload.sha256 or content_hash(upload.file.path) for upload in (cv, project_report)
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def find_duplicate(dedupe_key: str, include_completed: bool = True):
+    """The in-flight job for `dedupe_key`, else (unless excluded) its latest completed one."""
+    jobs = EvaluationJob.objects.filter(dedupe_key=dedupe_key)
+    job = jobs.filter(status__in=IN_FLIGHT_STATUSES).first()
+    if job is None and include_completed:
+        job = jobs.filter(status='completed').order_by('-updated_at').first()
+    return job
+
+
+def create_or_attach(dedupe_key: str, force: bool = False, **fields):
+    """
+    Single-flight job creation: returns (job, created). An identical request that
+    is queued or processing is attached to, unless its worker was lost: such a
+    stale job is failed and replaced. A completed one is reused unless `force` is
+    set. Two concurrent creates race on the unique in-flight constraint, and the
+    loser attaches to the winner's job.
+    """
+    DjangoEvaluationRepository().fail_stale(
+        EvaluationJob.objects.filter(dedupe_key=dedupe_key), getattr(settings, 'EVALUATION_STALE_JOB_SECONDS', 600),
+    )
+    existing = find_duplicate(dedupe_key, include_completed=not force)
+    if existing is not None:
+        return existing, False
+    try:
+        with transaction.atomic():
+            return EvaluationJob.objects.create(dedupe_key=dedupe_key, **fields), True
+    except IntegrityError:
+        existing = find_duplicate(dedupe_key, include_completed=False)
+        if existing is None:
+            raise
+        return existing, False
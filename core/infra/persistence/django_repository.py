@@ -1,9 +1,100 @@
+import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
 from core.application.interfaces import IEvaluationRepository
-from core.domain.models import EvaluationJob
+from core.domain.models import EvaluationCheckpoint, EvaluationJob
+from core.infra.persistence.result_cache import invalidate_result
+
+STALE_JOB_MESSAGE = "An error occurred: the evaluation worker stopped responding"
+
+def stale_in_flight(stale_after: float) -> Q:
+    """
+    In-flight jobs with no write for `stale_after` seconds whose worker is presumed
+    lost: processing ones, and queued ones a worker already started, i.e. deferred
+    retries. A job that was never started may still be waiting in the broker
+    behind a backlog, so it is never stale.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=stale_after)
+    return Q(updated_at__lt=cutoff) & (Q(status='processing') | Q(status='queued', started_at__isnull=False))
 
 class DjangoEvaluationRepository(IEvaluationRepository):
     def get_by_id(self, job_id: str):
         return EvaluationJob.objects.get(id=job_id)
 
-    def update(self, job):
-        job.save()
+    def update(self, job, fields=None):
+        if fields is not None:
+            # auto_now is only applied to fields that are listed
+            fields = [*fields, 'updated_at']
+        job.save(update_fields=fields)
+        invalidate_result(job.id)
+
+    def transition(self, job, from_status: str, to_status: str, fields=()) -> bool:
+        # UPDATE ... WHERE status = from_status: the database decides which caller wins
+        now = timezone.now()
+        updated = EvaluationJob.objects.filter(id=job.id, status=from_status).update(
+            status=to_status, updated_at=now, **{field: getattr(job, field) for field in fields},
+        )
+        if not updated:
+            return False
+        job.status = to_status
+        job.updated_at = now
+        invalidate_result(job.id)
+        return True
+
+    def get_checkpoints(self, job_id: str) -> dict:
+        return dict(EvaluationCheckpoint.objects.filter(job_id=job_id).values_list('stage', 'payload'))
+
+    def save_checkpoint(self, job_id: str, stage: str, payload):
+        # A single upsert rather than update_or_create's read-then-write transaction
+        EvaluationCheckpoint.objects.bulk_create(
+            [EvaluationCheckpoint(job_id=job_id, stage=stage, payload=payload)],
+            update_conflicts=True, unique_fields=['job', 'stage'], update_fields=['payload'],
+        )
+
+    def clear_checkpoints(self, job_id: str):
+        EvaluationCheckpoint.objects.filter(job_id=job_id).delete()
+
+    def save_progress(self, job_id: str, progress: dict):
+        EvaluationJob.objects.filter(id=job_id).update(progress=progress, updated_at=timezone.now())
+        invalidate_result(job_id)
+
+    def requeue_failed(self, job_ids) -> list:
+        """
+        Move failed jobs back to 'queued'; returns the ids that were requeued. Each
+        row is switched with a conditional update so concurrent retries of the same
+        job only requeue it once. A job whose identical request is already running
+        again under another job is left failed.
+        """
+        requeued = []
+        for job_id in job_ids:
+            try:
+                with transaction.atomic():
+                    updated = EvaluationJob.objects.filter(id=job_id, status='failed').update(
+                        status='queued', overall_summary=None, dispatched_at=None, updated_at=timezone.now(),
+                    )
+            except IntegrityError:
+                continue
+            if updated:
+                invalidate_result(job_id)
+                requeued.append(job_id)
+        return requeued
+
+    def fail_stale(self, jobs, stale_after: float, message: str = STALE_JOB_MESSAGE) -> list:
+        """
+        Fail the stale jobs among `jobs`; returns the ids that were failed. The
+        staleness test is repeated in each conditional update, so a job that its
+        worker writes to in the meantime is left alone.
+        """
+        stale = stale_in_flight(stale_after)
+        failed = []
+        for job_id in jobs.filter(stale).values_list('id', flat=True):
+            updated = EvaluationJob.objects.filter(stale, id=job_id).update(
+                status='failed', overall_summary=message, updated_at=timezone.now(),
+            )
+            if updated:
+                invalidate_result(job_id)
+                failed.append(job_id)
+        return failed
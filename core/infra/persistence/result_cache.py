@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_result_cache():
+    """Cache holding serialized results of finished jobs, shared by web and worker processes."""
+    return caches[getattr(settings, 'RESULT_CACHE_ALIAS', 'default')]
+
+
+def result_cache_key(job_id) -> str:
+    return f"evaluation-result:{job_id}"
+
+
+def invalidate_result(job_id):
+    get_result_cache().delete(result_cache_key(job_id))
@@ -0,0 +1,148 @@
+import datetime
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from core.domain.models import EvaluationBatch, EvaluationJob
+from core.infra.persistence.django_repository import DjangoEvaluationRepository
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+
+class FairShareScheduler:
+    """
+    Database-backed dispatch of bulk evaluation jobs.
+
+    Interactive jobs go to their own Celery queue as soon as they are created.
+    Bulk jobs wait in the database until one of `max_in_flight` bulk slots is
+    free; free slots are handed out round-robin across owners, so a 300-CV batch
+    takes turns with other users' jobs instead of running ahead of all of them.
+    """
+
+    # Order of an owner's waiting jobs; unscored jobs follow scored ones
+    ordering = (F('prescreen_score').desc(nulls_last=True), 'created_at', 'id')
+
+    def __init__(self, max_in_flight: int = None, interactive_concurrency: int = None,
+                 default_job_seconds: float = None, stale_after: float = None, prescreen_deadline: float = None):
+        self.max_in_flight = max_in_flight or getattr(settings, 'EVALUATION_BULK_MAX_IN_FLIGHT', 4)
+        self.interactive_concurrency = interactive_concurrency or getattr(
+            settings, 'EVALUATION_INTERACTIVE_CONCURRENCY', 2)
+        self.default_job_seconds = default_job_seconds or getattr(settings, 'EVALUATION_DEFAULT_JOB_SECONDS', 30)
+        self.stale_after = stale_after or getattr(settings, 'EVALUATION_STALE_JOB_SECONDS', 600)
+        self.prescreen_deadline = prescreen_deadline or getattr(settings, 'EVALUATION_PRESCREEN_DEADLINE', 900)
+
+    def waiting(self):
+        """Bulk jobs not yet handed to Celery, except those of a batch still being pre-screened."""
+        screening = EvaluationBatch.objects.filter(prescreened_at__isnull=True).exclude(prescreen='off')
+        return EvaluationJob.objects.filter(priority=BULK, status='queued', dispatched_at__isnull=True).exclude(
+            batch__in=screening)
+
+    def in_flight(self):
+        return EvaluationJob.objects.filter(priority=BULK, dispatched_at__isnull=False).exclude(
+            status__in=EvaluationJob.TERMINAL_STATUSES)
+
+    def reap_stale(self) -> list:
+        """
+        Fail jobs whose worker was lost (killed by the hard time limit, or a crashed
+        process), so they stop holding a bulk slot; returns their ids.
+        """
+        return DjangoEvaluationRepository().fail_stale(EvaluationJob.objects.all(), self.stale_after)
+
+    def release_stalled_prescreens(self) -> int:
+        """
+        Release batches still unscored `prescreen_deadline` seconds after they were
+        created: their pre-screen task was lost (a crashed worker, or the hard time
+        limit), so it never released them. Their jobs are dispatched unranked.
+        """
+        deadline = timezone.now() - datetime.timedelta(seconds=self.prescreen_deadline)
+        return EvaluationBatch.objects.filter(prescreened_at__isnull=True, created_at__lt=deadline).exclude(
+            prescreen='off').update(prescreened_at=timezone.now())
+
+    def select(self, slots: int) -> list:
+        """Up to `slots` waiting job ids, one per owner per round, least-served owners first."""
+        jobs_by_owner = {}
+        for job_id, owner_id in self.waiting().order_by(*self.ordering).values_list('id', 'owner_id'):
+            owner_jobs = jobs_by_owner.setdefault(owner_id, [])
+            if len(owner_jobs) < slots:
+                owner_jobs.append(job_id)
+
+        running = dict(self.in_flight().values('owner').annotate(count=Count('id')).values_list('owner', 'count'))
+        owners = sorted(jobs_by_owner, key=lambda owner_id: running.get(owner_id, 0))
+
+        selected = []
+        for round_index in range(slots):
+            for owner_id in owners:
+                if round_index < len(jobs_by_owner[owner_id]):
+                    selected.append(jobs_by_owner[owner_id][round_index])
+                    if len(selected) == slots:
+                        return selected
+        return selected
+
+    @staticmethod
+    def ahead_of(job) -> Q:
+        """Waiting jobs that `ordering` puts before `job`."""
+        earlier = Q(created_at__lt=job.created_at)
+        if job.prescreen_score is None:
+            return Q(prescreen_score__isnull=False) | (Q(prescreen_score__isnull=True) & earlier)
+        return Q(prescreen_score__gt=job.prescreen_score) | (Q(prescreen_score=job.prescreen_score) & earlier)
+
+    def dispatch(self, send) -> list:
+        """
+        Fill the free bulk slots, calling `send(job_id)` for each job claimed. A job
+        is claimed with a conditional update, so concurrent runs never send it twice.
+        """
+        slots = self.max_in_flight - self.in_flight().count()
+        if slots <= 0:
+            return []
+
+        dispatched = []
+        for job_id in self.select(slots):
+            claimed = EvaluationJob.objects.filter(id=job_id, dispatched_at__isnull=True).update(
+                dispatched_at=timezone.now(),
+            )
+            if claimed:
+                send(job_id)
+                dispatched.append(job_id)
+        return dispatched
+
+    def queue_position(self, job):
+        """Number of jobs expected to start before `job`, or None once it is no longer queued."""
+        if job.status != 'queued':
+            return None
+        queued = EvaluationJob.objects.filter(status='queued', priority=job.priority)
+        if job.priority != BULK:
+            return queued.filter(created_at__lt=job.created_at).count()
+
+        handed_over = queued.filter(dispatched_at__isnull=False)
+        if job.dispatched_at is not None:
+            return handed_over.filter(dispatched_at__lt=job.dispatched_at).count()
+
+        # Round-robin: every other owner gets up to `rank` turns before this job's turn
+        waiting = self.waiting()
+        own = waiting.filter(owner__isnull=True) if job.owner_id is None else waiting.filter(owner_id=job.owner_id)
+        others = waiting.exclude(id__in=own.values('id'))
+        rank = own.filter(self.ahead_of(job)).count()
+        other_turns = sum(
+            min(count, rank) for count in others.values('owner').annotate(count=Count('id')).values_list('count', flat=True)
+        )
+        return handed_over.count() + rank + other_turns
+
+    def average_job_seconds(self, sample: int = 50) -> float:
+        """Mean processing time of recently completed jobs."""
+        rows = EvaluationJob.objects.filter(status='completed', started_at__isnull=False).order_by(
+            '-updated_at').values_list('started_at', 'updated_at')[:sample]
+        durations = [(finished - started).total_seconds() for started, finished in rows]
+        return sum(durations) / len(durations) if durations else self.default_job_seconds
+
+    def queue_info(self, job) -> dict:
+        position = self.queue_position(job)
+        if position is None:
+            return {'queue_position': None, 'estimated_start': None}
+        concurrency = self.max_in_flight if job.priority == BULK else self.interactive_concurrency
+        wait = (position // concurrency) * self.average_job_seconds()
+        return {
+            'queue_position': position,
+            'estimated_start': timezone.now() + datetime.timedelta(seconds=wait),
+        }
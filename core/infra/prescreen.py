@@ -0,0 +1,117 @@
+import hashlib
+import logging
+
+import numpy as np
+
+from core.domain.models import EvaluationJob, UploadedFile
+
+logger = logging.getLogger(__name__)
+
+PRESCREEN_MODES = ('rank', 'filter')
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class PreScreener:
+    """
+    Cheap first stage of a batch evaluation: every CV is embedded once and scored
+    by cosine similarity against its role's job description. In 'rank' mode the
+    scores only order the batch, so the LLM evaluates the closest matches first;
+    in 'filter' mode jobs below `percentile` are also moved to `prescreened_out`
+    and never reach the LLM. A CV's embedding is stored on its upload and shared
+    by uploads of the same file, so re-submitted CVs are not embedded again.
+    """
+
+    def __init__(self, embeddings, parser, evaluation_repository, model: str = "", role_contexts=None,
+                 event_publisher=None, percentile: float = 50, min_batch: int = 20, max_chars: int = 8000):
+        self.embeddings = embeddings
+        self.parser = parser
+        self.evaluation_repository = evaluation_repository
+        self.model = model
+        self.role_contexts = role_contexts
+        self.event_publisher = event_publisher
+        self.percentile = percentile
+        self.min_batch = min_batch
+        self.max_chars = max_chars
+        self._role_vectors = {}
+
+    def role_vector(self, job_title: str) -> np.ndarray:
+        """Embedding of the role's job description, else of the bare title; cached per text."""
+        role = self.role_contexts.get(job_title) if self.role_contexts is not None else None
+        text = role.job_description if role is not None and role.job_description else job_title
+        key = hashlib.sha256(f"{self.model}\n{text}".encode("utf-8")).hexdigest()
+        if key not in self._role_vectors:
+            vector = np.asarray(self.embeddings.embed_query(text[:self.max_chars]), dtype=np.float32)
+            self._role_vectors[key] = _unit(vector)
+        return self._role_vectors[key]
+
+    def cv_vectors(self, uploads) -> dict:
+        """Unit embedding per upload id: stored, shared by an identical upload, or embedded now in one request."""
+        vectors = {}
+        missing = []
+        for upload in uploads:
+            if upload.embedding is not None and upload.embedding_model == self.model:
+                vectors[upload.id] = np.frombuffer(upload.embedding, dtype=np.float32)
+            else:
+                missing.append(upload)
+
+        shared = {}
+        hashes = {upload.sha256 for upload in missing if upload.sha256}
+        if hashes:
+            shared = dict(UploadedFile.objects.filter(
+                sha256__in=hashes, embedding_model=self.model, embedding__isnull=False,
+            ).values_list('sha256', 'embedding'))
+        to_embed = []
+        for upload in missing:
+            if upload.sha256 in shared:
+                upload.embedding = bytes(shared[upload.sha256])
+            else:
+                to_embed.append(upload)
+
+        if to_embed:
+            texts = [self.parser.extract(upload.file.path).text[:self.max_chars] for upload in to_embed]
+            embedded = _unit(np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32))
+            for upload, vector in zip(to_embed, embedded):
+                upload.embedding = vector.tobytes()
+
+        for upload in missing:
+            upload.embedding_model = self.model
+            vectors[upload.id] = np.frombuffer(upload.embedding, dtype=np.float32)
+        if missing:
+            UploadedFile.objects.bulk_update(missing, ['embedding', 'embedding_model'])
+        return vectors
+
+    def score(self, jobs) -> list:
+        """Set and save `prescreen_score` on each job."""
+        if not jobs:
+            return jobs
+        vectors = self.cv_vectors({job.cv_id: job.cv for job in jobs}.values())
+        for job in jobs:
+            job.prescreen_score = float(vectors[job.cv_id] @ self.role_vector(job.job_title))
+        EvaluationJob.objects.bulk_update(jobs, ['prescreen_score'])
+        return jobs
+
+    def run(self, batch, mode: str) -> dict:
+        """Score the batch's queued jobs and, in 'filter' mode, screen out the lowest scoring ones."""
+        jobs = self.score(list(batch.jobs.filter(status='queued').select_related('cv')))
+        screened_out = []
+        # Too few CVs make the percentile meaningless; they are only ranked
+        if mode == 'filter' and len(jobs) >= self.min_batch:
+            threshold = np.percentile([job.prescreen_score for job in jobs], self.percentile)
+            for job in jobs:
+                if job.prescreen_score < threshold and self._screen_out(job):
+                    screened_out.append(job.id)
+        return {'scored': len(jobs), 'prescreened_out': screened_out}
+
+    def _screen_out(self, job) -> bool:
+        if not self.evaluation_repository.transition(job, 'queued', 'prescreened_out'):
+            return False
+        if self.event_publisher is not None:
+            try:
+                self.event_publisher.publish(str(job.id), job.status)
+            except Exception:
+                logger.exception("Could not publish status of job %s", job.id)
+        return True
@@ -0,0 +1,95 @@
+import json
+import os
+import re
+
+from core.application.interfaces import IRoleContextRegistry, RoleContext
+
+ROLE_CONTEXTS_FILE = "role_contexts.json"
+
+# Context section -> reference document it is read from
+SECTION_FILES = {
+    'job_description': 'job_description.txt',
+    'cv_rubric': 'cv_scoring_rubric.txt',
+    'case_study_brief': 'case_study_brief.txt',
+    'project_rubric': 'project_scoring_rubric.txt',
+}
+ROLES_DIR = "roles"
+
+_ROLE_LINE = re.compile(r"^\s*Role:\s*(.+?)\s*$", re.MULTILINE)
+
+
+def normalize_job_title(job_title: str) -> str:
+    return " ".join(job_title.split()).casefold()
+
+
+def role_title(job_description: str) -> str:
+    """The role a job description is for: its `Role:` line, else its heading."""
+    match = _ROLE_LINE.search(job_description)
+    if match:
+        return match.group(1)
+    heading = job_description.strip().splitlines()[0] if job_description.strip() else ""
+    return re.sub(r"\s*job description\s*$", "", heading, flags=re.IGNORECASE)
+
+
+def _read_sections(directory: str) -> dict:
+    sections = {}
+    for section, filename in SECTION_FILES.items():
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                sections[section] = f.read()
+    return sections
+
+
+def build_role_contexts(documents_dir: str) -> dict:
+    """
+    One context bundle per role, keyed by normalized title. The top-level
+    reference documents form the default role; each `roles/<name>/` directory
+    with a job description adds a role, and any document it lacks (e.g. a shared
+    rubric) is taken from the top level.
+    """
+    shared = _read_sections(documents_dir)
+    role_sections = [shared] if 'job_description' in shared else []
+    roles_dir = os.path.join(documents_dir, ROLES_DIR)
+    if os.path.isdir(roles_dir):
+        for name in sorted(os.listdir(roles_dir)):
+            own = _read_sections(os.path.join(roles_dir, name))
+            if 'job_description' in own:
+                role_sections.append({**shared, **own})
+
+    bundles = {}
+    for sections in role_sections:
+        title = role_title(sections['job_description'])
+        bundles[normalize_job_title(title)] = {
+            'title': title,
+            **{section: sections.get(section, "") for section in SECTION_FILES},
+        }
+    return bundles
+
+
+def write_role_contexts(persist_directory: str, bundles: dict, corpus_version: str):
+    """Write atomically so workers never load a half-written registry."""
+    os.makedirs(persist_directory, exist_ok=True)
+    path = os.path.join(persist_directory, ROLE_CONTEXTS_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump({'corpus_version': corpus_version, 'roles': bundles}, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+class RoleContextRegistry(IRoleContextRegistry):
+    """Context bundles written by `ingest`, held in memory and looked up by normalized job title."""
+
+    def __init__(self, persist_directory: str = "./chroma_db"):
+        try:
+            with open(os.path.join(persist_directory, ROLE_CONTEXTS_FILE), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        self.version = data.get('corpus_version', "")
+        self.roles = {key: RoleContext(**bundle) for key, bundle in data.get('roles', {}).items()}
+
+    def get(self, job_title: str):
+        return self.roles.get(normalize_job_title(job_title))
+
+    def __len__(self):
+        return len(self.roles)
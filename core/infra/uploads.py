@@ -0,0 +1,154 @@
+import hashlib
+import os
+import posixpath
+import re
+import zipfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+# Leading bytes of the accepted document formats. DOCX is a ZIP container, so a
+# ZIP file only counts as DOCX if it also has word/ parts (see `annotate`).
+MAGIC_NUMBERS = (
+    (b'%PDF-', 'application/pdf', '.pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword', '.doc'),
+    (b'PK\x03\x04', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document', '.docx'),
+)
+MAGIC_LENGTH = max(len(magic) for magic, _, _ in MAGIC_NUMBERS)
+# <directory>/ab/abcdef....<extension>, where abcdef... is the content's SHA-256
+CONTENT_ADDRESSED_NAME = re.compile(r'(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})(?:\.\w+)?$')
+
+
+def sniff(head: bytes):
+    """(content type, extension) of a file from its first bytes, or (None, None) if unknown."""
+    for magic, content_type, extension in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return content_type, extension
+    return None, None
+
+
+class UploadDigest:
+    """SHA-256, size and sniffed type of a file, fed one chunk at a time."""
+
+    def __init__(self):
+        self._sha256 = hashlib.sha256()
+        self.head = b''
+        self.size = 0
+
+    def update(self, chunk: bytes):
+        self._sha256.update(chunk)
+        if len(self.head) < MAGIC_LENGTH:
+            self.head += chunk[:MAGIC_LENGTH - len(self.head)]
+        self.size += len(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    @property
+    def content_type(self):
+        return sniff(self.head)[0]
+
+    @property
+    def extension(self):
+        return sniff(self.head)[1]
+
+    @classmethod
+    def of(cls, file):
+        """Digest of a Django File, read in chunks and rewound afterwards."""
+        digest = cls()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        file.seek(0)
+        return digest
+
+
+def is_word_document(file) -> bool:
+    """Whether a ZIP container has word/ parts, i.e. is a DOCX rather than e.g. an xlsx or jar."""
+    try:
+        file.seek(0)
+        with zipfile.ZipFile(file) as archive:
+            return any(name.startswith('word/') for name in archive.namelist())
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        file.seek(0)
+
+
+def annotate(file, digest: UploadDigest):
+    content_type, extension = digest.content_type, digest.extension
+    if extension == '.docx' and not is_word_document(file):
+        content_type, extension = None, None
+    file.sha256 = digest.sha256
+    file.sniffed_content_type = content_type
+    file.sniffed_extension = extension
+    return file
+
+
+def digest_upload(file):
+    """Hash and sniff `file` unless the upload handler already did it while receiving it."""
+    if getattr(file, 'sha256', None) is None:
+        annotate(file, UploadDigest.of(file))
+    return file
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams every upload to a temporary file, hashing and sniffing each chunk on
+    the way, so memory use does not grow with the upload size and the file is
+    read only once. The resulting file carries `sha256`, `sniffed_content_type`
+    and `sniffed_extension`.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = UploadDigest()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        return annotate(super().file_complete(file_size), self.digest)
+
+
+def content_addressed_name(instance, filename) -> str:
+    """
+    Directory and fallback extension of an upload. ContentAddressedStorage names
+    the file after its content: uploads/ab/abcdef....pdf.
+    """
+    return f"uploads/{filename}"
+
+
+def sha256_of_name(name: str):
+    """SHA-256 a content-addressed name was built from, or None for any other name."""
+    match = CONTENT_ADDRESSED_NAME.search(name or '')
+    return match.group(2) if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage where a name identifies its content. A file is saved as
+    <directory>/ab/abcdef....<extension>, from its SHA-256 and its sniffed (else
+    given) extension, whether it comes from `Model.save()` or `FieldFile.save()`.
+    Saving a name that already exists keeps the stored copy instead of writing a
+    second one.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest_upload(content)
+        extension = content.sniffed_extension or os.path.splitext(name)[1].lower()
+        name = posixpath.join(posixpath.dirname(name), content.sha256[:2], content.sha256 + extension)
+        return super().save(name, content, max_length)
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
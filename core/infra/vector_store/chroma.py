@@ -1,11 +1,24 @@
 from langchain_community.vectorstores import Chroma
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from core.application.interfaces import IVectorStore
+from core.infra.vector_store.context_cache import CachedRetriever
+from core.infra.vector_store.manifest import read_manifest
+
+EMBEDDING_MODEL = "models/embedding-001"
 
 class ChromaVectorStore(IVectorStore):
     def __init__(self, persist_directory="./chroma_db"):
-        self.embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+        self.persist_directory = persist_directory
+        self.embeddings = GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
         self.vector_store = Chroma(persist_directory=persist_directory, embedding_function=self.embeddings)
 
+    def get_version(self) -> str:
+        """Corpus version from the manifest written by the `ingest` command, empty if never ingested."""
+        return read_manifest(self.persist_directory).get("corpus_version", "")
+
+    def count(self) -> int:
+        """Number of stored chunks; a cheap local call used by health checks."""
+        return self.vector_store._collection.count()
+
     def get_retriever(self):
-        return self.vector_store.as_retriever()
+        return CachedRetriever(self.vector_store.as_retriever(), version=self.get_version())
@@ -0,0 +1,58 @@
+import threading
+
+
+class RetrievalContextCache:
+    """
+    Process-wide cache of retrieved reference documents.
+
+    Entries are keyed by query and only kept for a single corpus version: as soon
+    as a lookup arrives with a different version (i.e. `ingest` ran again) the
+    previous entries are dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    def get_or_retrieve(self, version: str, query: str, retrieve):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries = {}
+            if query in self._entries:
+                return list(self._entries[query])
+
+        documents = list(retrieve(query))
+
+        with self._lock:
+            if version == self._version:
+                self._entries[query] = documents
+        return list(documents)
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._entries = {}
+
+
+retrieval_context_cache = RetrievalContextCache()
+
+
+class CachedRetriever:
+    """Retriever wrapper that serves repeated queries from a RetrievalContextCache."""
+
+    def __init__(self, retriever, version: str, cache: RetrievalContextCache = retrieval_context_cache):
+        self.retriever = retriever
+        self.version = version
+        self.cache = cache
+
+    def get_relevant_documents(self, query: str):
+        return self.cache.get_or_retrieve(self.version, query, self.retriever.invoke)
+
+    def invoke(self, query: str):
+        return self.get_relevant_documents(query)
+
+    def warm(self, queries):
+        for query in queries:
+            self.get_relevant_documents(query)
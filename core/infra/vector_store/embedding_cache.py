@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import threading
+from array import array
+from urllib.request import pathname2url
+
+
+class EmbeddingCache:
+    """
+    Persistent chunk embeddings keyed by chunk hash and embedding model.
+
+    Batches are written as soon as they are embedded, so an interrupted ingest
+    resumes without paying for the same vectors again. `read_only` opens an
+    existing cache without creating or writing anything.
+    """
+
+    def __init__(self, path: str, read_only: bool = False):
+        self._lock = threading.Lock()
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " chunk_hash TEXT NOT NULL,"
+                " model TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " PRIMARY KEY (chunk_hash, model))"
+            )
+
+    def get_many(self, chunk_hashes, model: str) -> dict:
+        found = {}
+        chunk_hashes = list(chunk_hashes)
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(chunk_hashes), 500):
+                batch = chunk_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT chunk_hash, vector FROM embeddings WHERE model = ? AND chunk_hash IN ({placeholders})",
+                    [model, *batch],
+                )
+                for chunk_hash, blob in rows:
+                    found[chunk_hash] = array('f', blob).tolist()
+        return found
+
+    def put_many(self, vectors: dict, model: str):
+        rows = [(chunk_hash, model, array('f', vector).tobytes()) for chunk_hash, vector in vectors.items()]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (chunk_hash, model, vector) VALUES (?, ?, ?)", rows
+            )
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,93 @@
+import glob
+import hashlib
+import math
+import os
+import random
+import threading
+import time
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from core.application.interfaces import IVectorStore
+from core.infra.vector_store.context_cache import CachedRetriever, RetrievalContextCache
+from core.infra.vector_store.manifest import corpus_version
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic, offline embeddings: a unit vector seeded by the text's hash."""
+
+    def __init__(self, size: int = 64):
+        self.size = size
+
+    def _embed(self, text: str):
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+        rng = random.Random(seed)
+        vector = [rng.gauss(0, 1) for _ in range(self.size)]
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class FakeRetriever:
+    def __init__(self, store, k: int = 4):
+        self.store = store
+        self.k = k
+
+    def invoke(self, query: str):
+        self.store._sleep()
+        query_vector = self.store.embeddings.embed_query(query)
+        scored = sorted(
+            zip(self.store.vectors, self.store.documents),
+            key=lambda item: -sum(a * b for a, b in zip(query_vector, item[0])),
+        )
+        return [document for _, document in scored[:self.k]]
+
+    def get_relevant_documents(self, query: str):
+        return self.invoke(query)
+
+
+class FakeVectorStore(IVectorStore):
+    """
+    In-memory IVectorStore over the reference documents using FakeEmbeddings.
+
+    Every uncached retrieval sleeps for `latency` plus uniform `jitter` seconds to
+    stand in for the query-embedding round trip.
+    """
+
+    def __init__(self, documents_dir: str = "./documents", latency: float = 0.0, jitter: float = 0.0,
+                 seed=None, embeddings=None):
+        self.embeddings = embeddings or FakeEmbeddings()
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.documents = []
+        for path in sorted(glob.glob(os.path.join(documents_dir, "**", "*.txt"), recursive=True)):
+            with open(path, encoding="utf-8") as f:
+                self.documents.append(Document(page_content=f.read(), metadata={"source": path}))
+        self.vectors = self.embeddings.embed_documents([doc.page_content for doc in self.documents])
+        self.version = corpus_version(
+            hashlib.sha256(doc.page_content.encode()).hexdigest() for doc in self.documents
+        )
+        self.cache = RetrievalContextCache()
+
+    def _sleep(self):
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_version(self) -> str:
+        return self.version
+
+    def count(self) -> int:
+        return len(self.documents)
+
+    def get_retriever(self):
+        return CachedRetriever(FakeRetriever(self), version=self.version, cache=self.cache)
@@ -0,0 +1,170 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.infra.vector_store.manifest import corpus_version, write_manifest
+
+# Rough characters-per-token ratio used for dry-run cost estimates.
+CHARS_PER_TOKEN = 4
+
+
+def chunk_id(document) -> str:
+    """Content hash of a chunk, scoped to its source file."""
+    source = document.metadata.get("source", "")
+    return hashlib.sha256(f"{source}\n{document.page_content}".encode()).hexdigest()
+
+
+class IncrementalIngestor:
+    """
+    Brings a vector store in line with a set of chunks using content-hash ids:
+    only new or changed chunks are embedded, chunks that disappeared are deleted
+    and unchanged chunks are left alone. Writes a manifest whose corpus version
+    other components use to invalidate their caches.
+
+    With an `embeddings` client, new chunks are embedded here in batches of
+    `batch_size`, at most `max_workers` batches at a time, and every batch is
+    stored in `embedding_cache` before it is written to the vector store.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        persist_directory: str,
+        embeddings=None,
+        model: str = "",
+        embedding_cache=None,
+        batch_size: int = 32,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+    ):
+        self.vector_store = vector_store
+        self.persist_directory = persist_directory
+        self.embeddings = embeddings
+        self.model = model
+        self.embedding_cache = embedding_cache
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def existing_ids(self) -> set:
+        return set(self.vector_store.get(include=[])["ids"])
+
+    def plan(self, chunks) -> dict:
+        chunks_by_id = {}
+        for chunk in chunks:
+            chunk_hash = chunk_id(chunk)
+            chunk.metadata["chunk_hash"] = chunk_hash
+            chunks_by_id[chunk_hash] = chunk
+
+        existing = self.existing_ids()
+        return {
+            "chunks": chunks_by_id,
+            "to_add": [chunk_hash for chunk_hash in chunks_by_id if chunk_hash not in existing],
+            "to_delete": sorted(existing - set(chunks_by_id)),
+            "corpus_version": corpus_version(chunks_by_id),
+        }
+
+    def estimate(self, chunks) -> dict:
+        """What a run would embed, without calling the embedding API or writing anything."""
+        plan = self.plan(chunks)
+        to_add = plan["to_add"]
+        cached = self.cached_vectors(to_add)
+        to_embed = [chunk_hash for chunk_hash in to_add if chunk_hash not in cached]
+        chars = sum(len(plan["chunks"][chunk_hash].page_content) for chunk_hash in to_embed)
+        return {
+            "added": len(to_add),
+            "deleted": len(plan["to_delete"]),
+            "unchanged": len(plan["chunks"]) - len(to_add),
+            "from_cache": len(cached),
+            "to_embed": len(to_embed),
+            "batches": -(-len(to_embed) // self.batch_size),
+            "estimated_tokens": chars // CHARS_PER_TOKEN,
+            "corpus_version": plan["corpus_version"],
+        }
+
+    def run(self, chunks) -> dict:
+        started = time.monotonic()
+        plan = self.plan(chunks)
+        chunks_by_id = plan["chunks"]
+        to_add = plan["to_add"]
+
+        embedded = from_cache = 0
+        if to_add:
+            embedded, from_cache = self.add(to_add, [chunks_by_id[chunk_hash] for chunk_hash in to_add])
+        if plan["to_delete"]:
+            self.vector_store.delete(ids=plan["to_delete"])
+        write_manifest(self.persist_directory, {
+            "corpus_version": plan["corpus_version"],
+            "chunks": {
+                chunk_hash: {"source": chunk.metadata.get("source", "")}
+                for chunk_hash, chunk in chunks_by_id.items()
+            },
+        })
+
+        elapsed = time.monotonic() - started
+        return {
+            "added": len(to_add),
+            "deleted": len(plan["to_delete"]),
+            "unchanged": len(chunks_by_id) - len(to_add),
+            "embedded": embedded,
+            "from_cache": from_cache,
+            "seconds": elapsed,
+            "chunks_per_second": len(to_add) / elapsed if elapsed else 0.0,
+            "corpus_version": plan["corpus_version"],
+        }
+
+    def cached_vectors(self, chunk_hashes) -> dict:
+        if self.embedding_cache is None:
+            return {}
+        return self.embedding_cache.get_many(chunk_hashes, self.model)
+
+    def add(self, ids, chunks):
+        """Write new chunks; returns (embedded, served from cache) counts."""
+        if self.embeddings is None:
+            self.vector_store.add_documents(chunks, ids=ids)
+            return len(ids), 0
+
+        chunks_by_id = dict(zip(ids, chunks))
+        cached = self.cached_vectors(ids)
+        if cached:
+            self.write_vectors(list(cached), [chunks_by_id[chunk_hash] for chunk_hash in cached], list(cached.values()))
+
+        missing = [chunk_hash for chunk_hash in ids if chunk_hash not in cached]
+        batches = [missing[start:start + self.batch_size] for start in range(0, len(missing), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest-embed") as executor:
+            futures = [
+                executor.submit(self.embed_and_cache, batch, [chunks_by_id[chunk_hash] for chunk_hash in batch])
+                for batch in batches
+            ]
+            for future in as_completed(futures):
+                batch_ids, vectors = future.result()
+                self.write_vectors(batch_ids, [chunks_by_id[chunk_hash] for chunk_hash in batch_ids], vectors)
+
+        return len(missing), len(cached)
+
+    def embed_and_cache(self, batch_ids, chunks):
+        """Embed one batch and persist it straight away so a later failure doesn't lose it."""
+        vectors = self.embed_batch(chunks)
+        if self.embedding_cache is not None:
+            self.embedding_cache.put_many(dict(zip(batch_ids, vectors)), self.model)
+        return batch_ids, vectors
+
+    def embed_batch(self, chunks):
+        texts = [chunk.page_content for chunk in chunks]
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embeddings.embed_documents(texts)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_backoff * 2 ** attempt)
+
+    def write_vectors(self, ids, chunks, vectors):
+        self.vector_store._collection.upsert(
+            ids=list(ids),
+            embeddings=[list(vector) for vector in vectors],
+            documents=[chunk.page_content for chunk in chunks],
+            metadatas=[chunk.metadata for chunk in chunks],
+        )
@@ -0,0 +1,31 @@
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = "manifest.json"
+
+
+def corpus_version(chunk_ids) -> str:
+    """Deterministic version of a corpus: unchanged content keeps the same version."""
+    digest = hashlib.sha256()
+    for chunk_id in sorted(chunk_ids):
+        digest.update(chunk_id.encode())
+    return digest.hexdigest()
+
+
+def read_manifest(persist_directory: str) -> dict:
+    try:
+        with open(os.path.join(persist_directory, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_manifest(persist_directory: str, manifest: dict):
+    """Write atomically so readers never see a half-written manifest."""
+    os.makedirs(persist_directory, exist_ok=True)
+    path = os.path.join(persist_directory, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
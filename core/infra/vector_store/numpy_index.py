@@ -0,0 +1,140 @@
+import glob
+import json
+import os
+
+import numpy as np
+from langchain_core.documents import Document
+
+from core.application.interfaces import IVectorStore
+from core.infra.vector_store.context_cache import CachedRetriever
+
+INDEX_FILE = "vector_index.json"
+DTYPES = ("float16", "float32")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def collection_contents(collection):
+    """(ids, vectors, documents, metadatas) of every chunk in a Chroma collection, ordered by id."""
+    contents = collection.get(include=["embeddings", "documents", "metadatas"])
+    rows = sorted(zip(contents["ids"], contents["embeddings"], contents["documents"], contents["metadatas"]),
+                  key=lambda row: row[0])
+    if not rows:
+        return [], [], [], []
+    return tuple(list(column) for column in zip(*rows))
+
+
+def write_vector_index(directory: str, ids, vectors, documents, metadatas,
+                       corpus_version: str, dtype: str = "float16", model: str = ""):
+    """
+    Write the chunks as a row-normalized `dtype` matrix (`vector_index-<version>.npy`)
+    plus a JSON header with the ids, texts and metadata. The header is replaced last
+    and atomically, so a reader sees either the old index or the complete new one.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported vector index dtype {dtype!r}")
+    os.makedirs(directory, exist_ok=True)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix = _normalize(matrix).astype(dtype) if len(ids) else np.zeros((0, 0), dtype=dtype)
+
+    matrix_file = f"vector_index-{corpus_version[:16]}-{dtype}.npy"
+    tmp_path = os.path.join(directory, f"{matrix_file}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_path, os.path.join(directory, matrix_file))
+
+    header_path = os.path.join(directory, INDEX_FILE)
+    with open(f"{header_path}.tmp", "w") as f:
+        json.dump({
+            "corpus_version": corpus_version,
+            "model": model,
+            "matrix": matrix_file,
+            "ids": list(ids),
+            "documents": list(documents),
+            "metadatas": [metadata or {} for metadata in metadatas],
+        }, f)
+    os.replace(f"{header_path}.tmp", header_path)
+
+    # Workers that still map an older matrix keep reading it until they reload
+    for path in glob.glob(os.path.join(directory, "vector_index-*.npy")):
+        if os.path.basename(path) != matrix_file:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # still mapped by a reader on a platform that forbids removing it
+
+
+def read_index_header(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class NumpyRetriever:
+    def __init__(self, store, k: int = 4):
+        self.store = store
+        self.k = k
+
+    def invoke(self, query: str):
+        query_vector = _normalize(np.asarray(self.store.embeddings.embed_query(query), dtype=np.float32))
+        return self.store.search(query_vector, self.k)
+
+    def get_relevant_documents(self, query: str):
+        return self.invoke(query)
+
+
+class NumpyVectorStore(IVectorStore):
+    """
+    IVectorStore over the index written by `ingest`: the embedding matrix is
+    memory-mapped rather than loaded, and a query is one matrix-vector product
+    (cosine similarity, the rows being unit length) followed by a partial sort
+    for the top k. Meant for small corpora, where this is cheaper to open and
+    to query than a Chroma client.
+    """
+
+    def __init__(self, persist_directory="./chroma_db", embeddings=None, k: int = 4):
+        self.persist_directory = persist_directory
+        if embeddings is None:
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+            from core.infra.vector_store.chroma import EMBEDDING_MODEL
+            embeddings = GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
+        self.embeddings = embeddings
+        self.k = k
+
+        header = read_index_header(persist_directory)
+        if not header:
+            raise FileNotFoundError(f"No vector index in {persist_directory}; run `manage.py ingest`")
+        self.version = header["corpus_version"]
+        self.documents = [
+            Document(page_content=text, metadata=metadata)
+            for text, metadata in zip(header["documents"], header["metadatas"])
+        ]
+        self.matrix = np.load(os.path.join(persist_directory, header["matrix"]), mmap_mode="r")
+        if self.matrix.shape[0] != len(self.documents):
+            raise ValueError(f"Vector index in {persist_directory} has {self.matrix.shape[0]} rows "
+                             f"for {len(self.documents)} documents")
+
+    def search(self, query_vector: np.ndarray, k: int) -> list:
+        if not self.documents:
+            return []
+        # Scored in float32: float16 rows are widened, float32 ones used in place
+        scores = self.matrix.astype(np.float32, copy=False) @ query_vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self.documents[index] for index in top]
+
+    def get_version(self) -> str:
+        """Version of the index on disk, which differs from the loaded one after a new ingest."""
+        return read_index_header(self.persist_directory).get("corpus_version", "")
+
+    def count(self) -> int:
+        return len(self.documents)
+
+    def get_retriever(self):
+        return CachedRetriever(NumpyRetriever(self, k=self.k), version=self.version)
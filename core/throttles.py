@@ -1,4 +1,4 @@
-from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.throttling import SimpleRateThrottle, UserRateThrottle
 
 
 class CVUploadRateThrottle(SimpleRateThrottle):
@@ -9,3 +9,8 @@ class CVUploadRateThrottle(SimpleRateThrottle):
 class EvaluationRateThrottle(SimpleRateThrottle):
     """Rate throttle for evaluation job creation. Scope maps to REST_FRAMEWORK DEFAULT_THROTTLE_RATES 'start_evaluation'."""
     scope = 'start_evaluation'
+
+
+class BatchEvaluationRateThrottle(UserRateThrottle):
+    """Rate throttle for batch evaluation requests, counted per batch rather than per candidate. Scope maps to REST_FRAMEWORK DEFAULT_THROTTLE_RATES 'start_batch_evaluation'."""
+    scope = 'start_batch_evaluation'
@@ -71,6 +71,54 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Extracted document text, keyed by file content hash. Shared by all workers.
+    "parse": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "parse",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+    # LLM responses, keyed by model, prompt, retrieved context and document hashes.
+    # Point this at django.core.cache.backends.redis.RedisCache to share it across hosts.
+    "llm": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "llm",
+        "TIMEOUT": 7 * 24 * 3600,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+    # Serialized results of finished jobs, invalidated by the repository and the admin
+    # on update. Must be one cache shared by every web and worker host, so a per-host
+    # backend would serve stale results; the short timeout bounds a missed invalidation.
+    "results": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/1",
+        "TIMEOUT": 300,
+    },
+}
+
+# Chunk embeddings kept by `ingest` so interrupted or repeated runs don't re-embed.
+EMBEDDING_CACHE_PATH = BASE_DIR / "cache" / "embeddings.sqlite3"
+INGEST_BATCH_SIZE = 32
+INGEST_CONCURRENCY = 4
+# Used by `ingest --dry-run` to estimate cost; set to your provider's embedding price.
+EMBEDDING_PRICE_PER_1K_TOKENS = 0.0
+# Workers' retrieval backend: 'chroma', or 'numpy' for the memory-mapped index `ingest`
+# also writes (float16 halves its size; float32 keeps full precision).
+VECTOR_STORE_BACKEND = "chroma"
+VECTOR_INDEX_DTYPE = "float16"
+
+PARSE_CACHE_ALIAS = "parse"
+RESULT_CACHE_ALIAS = "results"
+
+# "memory" for an in-process LRU, the alias of a cache in CACHES, or None to disable.
+LLM_RESPONSE_CACHE = "llm"
+LLM_RESPONSE_CACHE_TTL = 7 * 24 * 3600
+LLM_RESPONSE_CACHE_MAX_ENTRIES = 1000
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -104,6 +152,96 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    'schedule-bulk-evaluations': {
+        'task': 'evaluations.tasks.schedule_bulk_jobs',
+        'schedule': 30.0,
+    },
+}
+
+# Single evaluations go to the interactive queue at once. Batch jobs wait in the
+# database and are dispatched to the bulk queue, at most EVALUATION_BULK_MAX_IN_FLIGHT
+# at a time and round-robin across users. Run workers with `-Q interactive,bulk`,
+# ideally with a dedicated worker for the interactive queue.
+EVALUATION_INTERACTIVE_QUEUE = 'interactive'
+EVALUATION_BULK_QUEUE = 'bulk'
+EVALUATION_BULK_MAX_IN_FLIGHT = 4
+# Maintenance tasks have no queue of their own; without a route they would go to
+# the default `celery` queue, which no worker consumes.
+CELERY_TASK_ROUTES = {
+    'evaluations.tasks.schedule_bulk_jobs': {'queue': EVALUATION_BULK_QUEUE},
+    'evaluations.tasks.worker_health_check': {'queue': EVALUATION_BULK_QUEUE},
+    'evaluations.tasks.reload_vector_store': {'queue': EVALUATION_BULK_QUEUE},
+}
+# Used for estimated start times: jobs processed at once per queue, and the job
+# duration assumed until there are completed jobs to average.
+EVALUATION_INTERACTIVE_CONCURRENCY = 2
+EVALUATION_DEFAULT_JOB_SECONDS = 30
+# Limits of one evaluation task, in seconds. The soft limit fails the job cleanly;
+# the hard limit kills the worker process.
+EVALUATION_TASK_TIME_LIMIT = 300
+EVALUATION_TASK_SOFT_TIME_LIMIT = 240
+# A processing job, or a started job waiting on a deferred retry, with no write for
+# this long lost its worker and is failed by `schedule_bulk_jobs`. Keep it above the hard limit plus a retry countdown.
+EVALUATION_STALE_JOB_SECONDS = 600
+
+# Job status transitions are pushed to clients waiting on /api/result/<job_id>/wait/
+# and /events/. "redis" (pub/sub, shared by web and worker processes) or "local" (same process only).
+JOB_EVENTS_BACKEND = 'redis'
+JOB_EVENTS_REDIS_URL = CELERY_BROKER_URL
+
+# Cluster-wide limit on LLM requests, shared by all workers through Redis. The rate
+# is halved when the provider answers 429/RESOURCE_EXHAUSTED and probes back up to
+# this maximum while calls succeed. None disables the limiter.
+LLM_RATE_LIMIT_PER_MINUTE = 30
+LLM_RATE_LIMIT_MIN_PER_MINUTE = 2
+LLM_RATE_LIMIT_BURST = 3
+# Longest a call waits for a request slot, in seconds. After that the job is put
+# back in the queue and retried after the limiter's expected wait (at least
+# LLM_RATE_LIMIT_RETRY_DELAY when unknown), up to EVALUATION_MAX_DEFERRALS times.
+# Keep (max retries + 1) * this per call well below EVALUATION_TASK_SOFT_TIME_LIMIT.
+LLM_RATE_LIMIT_MAX_WAIT = 20
+LLM_RATE_LIMIT_RETRY_DELAY = 30
+EVALUATION_MAX_DEFERRALS = 5
+LLM_RATE_LIMIT_REDIS_URL = CELERY_BROKER_URL
+
+# Longest a long-poll request is held open, in seconds.
+RESULT_LONG_POLL_TIMEOUT = 25
+# Longest a server-sent events stream is kept open, in seconds.
+RESULT_EVENT_STREAM_TIMEOUT = 300
+# Long-polls and event streams each hold a thread for up to their timeout. Cap how
+# many a web process holds open at once; keep it below the Gunicorn `threads`
+# setting (gunicorn.conf.py) so ordinary requests always find a free thread.
+RESULT_MAX_OPEN_STREAMS = 6
+
+# 'multi_call': separate CV, project and summary LLM calls.
+# 'single_call': one call answering with a JSON schema covering all three.
+EVALUATION_MODE = 'multi_call'
+# Run the CV and project report LLM evaluations concurrently within a job (multi_call mode).
+EVALUATION_PARALLEL_LLM_CALLS = True
+# Minimum seconds between writes of streamed partial LLM output to a running job.
+EVALUATION_PROGRESS_WRITE_INTERVAL = 1.0
+
+# Budgets for PDF text extraction; longer documents are truncated and flagged on the job.
+PDF_MAX_PAGES = 30
+PDF_MAX_CHARS = 100_000
+# Seconds before a PDF extraction child process is killed.
+PDF_EXTRACTION_TIMEOUT = 30
+
+# Token budget per prompt input; longer candidate documents keep their chunks most
+# relevant to the rubric, longer reference context keeps its leading chunks.
+PROMPT_TOKEN_BUDGETS = {
+    'cv_text': 4000,
+    'project_report_text': 6000,
+    'job_description': 1500,
+    'cv_rubric': 1500,
+    'case_study_brief': 1500,
+    'project_rubric': 1500,
+    'cv_evaluation': 1000,
+    'project_evaluation': 1000,
+}
+# Approximate size of the chunks long inputs are split into for ranking.
+PROMPT_CHUNK_TOKENS = 200
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -115,6 +253,8 @@ REST_FRAMEWORK = {
 }
 
 FILE_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024
+# Uploads stream to a temporary file, hashed and type-sniffed chunk by chunk
+FILE_UPLOAD_HANDLERS = ['core.infra.uploads.HashingFileUploadHandler']
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024
 
 SESSION_COOKIE_SECURE = True
@@ -136,8 +276,31 @@ REST_FRAMEWORK.setdefault('DEFAULT_THROTTLE_RATES', {
     'user': '200/minute',
     'upload_cv': '5/minute',
     'start_evaluation': '2/minute',
+    'start_batch_evaluation': '2/minute',
 })
 
+# Maximum number of candidates accepted in one POST /api/evaluate/batch/ request.
+EVALUATION_BATCH_MAX_SIZE = 500
+
+# Embedding pre-screen of batch CVs before the LLM runs: None (off), 'rank'
+# (evaluate the closest CVs first) or 'filter' (also mark CVs below the
+# percentile `prescreened_out`). A batch request's `prescreen` overrides it.
+EVALUATION_PRESCREEN = None
+EVALUATION_PRESCREEN_PERCENTILE = 50
+# Smaller batches are only ranked, never filtered
+EVALUATION_PRESCREEN_MIN_BATCH = 20
+# Characters of CV text embedded
+EVALUATION_PRESCREEN_MAX_CHARS = 8000
+# Hard time limit of the pre-screen task, in seconds. A batch still unscored this
+# long after it was created lost its task and is released unranked by
+# `schedule_bulk_jobs`. Keep the deadline above the limit plus a wait in the bulk queue.
+EVALUATION_PRESCREEN_TIME_LIMIT = 300
+EVALUATION_PRESCREEN_DEADLINE = 900
+
+# GET /api/jobs/ page size (default and upper bound of ?page_size=)
+JOB_LIST_PAGE_SIZE = 50
+JOB_LIST_MAX_PAGE_SIZE = 200
+
 AXES_FAILURE_LIMIT = 5
 AXES_COOLOFF_DURATION = 1
 AXES_LOCK_OUT_AT_FAILURE = True
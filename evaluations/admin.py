@@ -1,3 +1,27 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.domain.models import EvaluationJob
+from core.infra.persistence.result_cache import invalidate_result
+from evaluations.tasks import retry_jobs
+
+
+@admin.register(EvaluationJob)
+class EvaluationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job_title', 'status', 'priority', 'owner', 'created_at', 'updated_at')
+    list_filter = ('status', 'priority')
+    search_fields = ('job_title',)
+    actions = ['retry_failed_jobs']
+
+    def save_model(self, request, obj, form, change):
+        # Edits bypass the repository, so the cached result is dropped here
+        super().save_model(request, obj, form, change)
+        invalidate_result(obj.id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_result(obj.id)
+
+    @admin.action(description="Retry failed jobs")
+    def retry_failed_jobs(self, request, queryset):
+        requeued = retry_jobs(list(queryset.filter(status='failed').values_list('id', flat=True)))
+        self.message_user(request, f"Requeued {len(requeued)} failed job(s).")
@@ -0,0 +1,233 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.application.use_cases.evaluate_candidate import EvaluateCandidateUseCase
+from core.infra.persistence.django_repository import DjangoEvaluationRepository
+from core.infra.roles import RoleContextRegistry
+from core.infra.cache import LRUCache
+from core.infra.events import get_job_event_bus
+from core.infra.file_parser import CachingFileParser, PdfParser
+from core.infra.llm.cache import CachedLLMService
+from core.infra.llm.google import CONTEXT_QUERIES, GoogleLLMService
+from core.infra.llm.prompt_budget import PromptBudget
+from core.infra.llm.rate_limit import RateLimitedLLMService, RedisRateLimiter
+from core.infra.prescreen import PreScreener
+from core.infra.vector_store.chroma import EMBEDDING_MODEL, ChromaVectorStore
+from core.infra.vector_store.numpy_index import NumpyVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerContainer:
+    """
+    Worker-scoped home of the evaluation pipeline's infrastructure.
+
+    The LLM client, the vector store (and its embedding client) and the parser are
+    built once per worker process and reused by every task, so their HTTP sessions
+    stay warm. The vector store is reopened when `ingest` publishes a new corpus
+    version.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._evaluation_repository = None
+        self._pdf_parser = None
+        self._llm_service = None
+        self._vector_store = None
+        self._role_contexts = None
+        self._corpus_version = None
+
+    @property
+    def evaluation_repository(self):
+        with self._lock:
+            if self._evaluation_repository is None:
+                self._evaluation_repository = DjangoEvaluationRepository()
+            return self._evaluation_repository
+
+    @property
+    def pdf_parser(self):
+        with self._lock:
+            if self._pdf_parser is None:
+                self._pdf_parser = CachingFileParser(
+                    PdfParser(
+                        max_pages=getattr(settings, 'PDF_MAX_PAGES', None),
+                        max_chars=getattr(settings, 'PDF_MAX_CHARS', None),
+                        timeout=getattr(settings, 'PDF_EXTRACTION_TIMEOUT', None),
+                    ),
+                    caches[getattr(settings, 'PARSE_CACHE_ALIAS', 'default')],
+                )
+            return self._pdf_parser
+
+    @property
+    def llm_service(self):
+        with self._lock:
+            if self._llm_service is None:
+                self._llm_service = self._build_llm_service()
+            return self._llm_service
+
+    def _build_llm_service(self):
+        budgets = getattr(settings, 'PROMPT_TOKEN_BUDGETS', None)
+        prompt_budget = None
+        if budgets:
+            prompt_budget = PromptBudget(budgets, chunk_tokens=getattr(settings, 'PROMPT_CHUNK_TOKENS', 200))
+        llm_service = GoogleLLMService(prompt_budget=prompt_budget)
+        rate = getattr(settings, 'LLM_RATE_LIMIT_PER_MINUTE', None)
+        if rate:
+            # Inside the response cache, so cache hits don't use up request slots
+            llm_service = RateLimitedLLMService(
+                llm_service, self._build_rate_limiter(rate),
+                max_wait=getattr(settings, 'LLM_RATE_LIMIT_MAX_WAIT', None),
+            )
+        cache_name = getattr(settings, 'LLM_RESPONSE_CACHE', None)
+        if not cache_name:
+            return llm_service
+        ttl = getattr(settings, 'LLM_RESPONSE_CACHE_TTL', None)
+        if cache_name == 'memory':
+            backend = LRUCache(
+                max_entries=getattr(settings, 'LLM_RESPONSE_CACHE_MAX_ENTRIES', 1000),
+                ttl=ttl,
+            )
+        else:
+            backend = caches[cache_name]
+        return CachedLLMService(llm_service, backend, timeout=ttl)
+
+    def _build_rate_limiter(self, rate):
+        import redis
+
+        url = getattr(settings, 'LLM_RATE_LIMIT_REDIS_URL', None) or settings.CELERY_BROKER_URL
+        return RedisRateLimiter(
+            redis.Redis.from_url(url),
+            max_rate=rate,
+            min_rate=getattr(settings, 'LLM_RATE_LIMIT_MIN_PER_MINUTE', 1),
+            burst=getattr(settings, 'LLM_RATE_LIMIT_BURST', 1),
+        )
+
+    @property
+    def vector_store(self):
+        with self._lock:
+            if self._vector_store is None:
+                self._load_vector_store()
+            elif self._vector_store.get_version() != self._corpus_version:
+                logger.info("Corpus version changed, reloading the vector store")
+                self._load_vector_store()
+            return self._vector_store
+
+    @property
+    def role_contexts(self):
+        # Loaded and reloaded together with the vector store, as ingest writes both
+        with self._lock:
+            self.vector_store
+            return self._role_contexts
+
+    def _load_vector_store(self):
+        if getattr(settings, 'VECTOR_STORE_BACKEND', 'chroma') == 'numpy':
+            self._vector_store = NumpyVectorStore()
+        else:
+            self._vector_store = ChromaVectorStore()
+        self._role_contexts = RoleContextRegistry()
+        self._corpus_version = self._vector_store.get_version()
+        try:
+            self._vector_store.get_retriever().warm(CONTEXT_QUERIES)
+        except Exception:
+            logger.exception("Could not warm the retrieval context cache")
+
+    def build(self):
+        """Eagerly construct every component; called when a worker process starts."""
+        self.evaluation_repository
+        self.pdf_parser
+        self.llm_service
+        self.vector_store
+
+    def reload_vector_store(self):
+        """Reopen the persisted vector store, e.g. after `manage.py ingest`."""
+        with self._lock:
+            self._load_vector_store()
+
+    def override(self, evaluation_repository=None, pdf_parser=None, llm_service=None, vector_store=None):
+        """Swap in components, e.g. the offline fakes used by the benchmark command."""
+        with self._lock:
+            if evaluation_repository is not None:
+                self._evaluation_repository = evaluation_repository
+            if pdf_parser is not None:
+                self._pdf_parser = pdf_parser
+            if llm_service is not None:
+                self._llm_service = llm_service
+            if vector_store is not None:
+                self._vector_store = vector_store
+                self._role_contexts = None
+                self._corpus_version = vector_store.get_version()
+
+    def reset(self):
+        with self._lock:
+            self._evaluation_repository = None
+            self._pdf_parser = None
+            self._llm_service = None
+            self._vector_store = None
+            self._role_contexts = None
+            self._corpus_version = None
+
+    def health_check(self) -> dict:
+        """Report whether each component is built and the vector store is readable."""
+        with self._lock:
+            components = {
+                'evaluation_repository': self._evaluation_repository is not None,
+                'pdf_parser': self._pdf_parser is not None,
+                'llm_service': self._llm_service is not None,
+                'vector_store': self._vector_store is not None,
+            }
+            vector_store = self._vector_store
+            corpus_version = self._corpus_version
+            role_contexts = self._role_contexts
+            llm_service = self._llm_service
+
+        documents = None
+        if vector_store is not None:
+            try:
+                documents = vector_store.count()
+            except Exception:
+                logger.exception("Vector store health check failed")
+                components['vector_store'] = False
+
+        return {
+            'status': 'ok' if all(components.values()) else 'degraded',
+            'components': components,
+            'corpus_version': corpus_version,
+            'documents': documents,
+            'roles': len(role_contexts) if role_contexts is not None else None,
+            'llm_cache': llm_service.stats() if isinstance(llm_service, CachedLLMService) else None,
+        }
+
+    def evaluate_candidate_use_case(self) -> EvaluateCandidateUseCase:
+        return EvaluateCandidateUseCase(
+            evaluation_repository=self.evaluation_repository,
+            cv_parser=self.pdf_parser,
+            project_parser=self.pdf_parser,
+            llm_service=self.llm_service,
+            vector_store=self.vector_store,
+            parallel_evaluation=getattr(settings, 'EVALUATION_PARALLEL_LLM_CALLS', True),
+            event_publisher=get_job_event_bus(),
+            evaluation_mode=getattr(settings, 'EVALUATION_MODE', 'multi_call'),
+            progress_interval=getattr(settings, 'EVALUATION_PROGRESS_WRITE_INTERVAL', 1.0),
+            role_contexts=self.role_contexts,
+        )
+
+    def prescreener(self) -> PreScreener:
+        vector_store = self.vector_store
+        embeddings = vector_store.embeddings
+        return PreScreener(
+            embeddings=embeddings,
+            parser=self.pdf_parser,
+            evaluation_repository=self.evaluation_repository,
+            model=getattr(embeddings, 'model', None) or EMBEDDING_MODEL,
+            role_contexts=self.role_contexts,
+            event_publisher=get_job_event_bus(),
+            percentile=getattr(settings, 'EVALUATION_PRESCREEN_PERCENTILE', 50),
+            min_batch=getattr(settings, 'EVALUATION_PRESCREEN_MIN_BATCH', 20),
+            max_chars=getattr(settings, 'EVALUATION_PRESCREEN_MAX_CHARS', 8000),
+        )
+
+
+container = WorkerContainer()
@@ -0,0 +1,211 @@
+import math
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.application.use_cases.evaluate_candidate import EvaluateCandidateUseCase
+from core.domain.models import EvaluationJob, UploadedFile
+from core.infra.file_parser import PdfParser
+from core.infra.llm.fake import FakeLLMService
+from core.infra.persistence.django_repository import DjangoEvaluationRepository
+from core.infra.vector_store.fake import FakeVectorStore
+from evaluations.container import container
+from evaluations.tasks import evaluate_documents
+
+
+def make_pdf(lines) -> bytes:
+    """Minimal single-page PDF with one text line per entry, readable by PyPDF2."""
+    escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+    stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+        "/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+    ]
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return output
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StageTimer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def wrap(self, target, stages):
+        return TimedProxy(target, stages, self)
+
+
+class TimedProxy:
+    """Forwards attribute access to `target`, timing the methods named in `stages`."""
+
+    def __init__(self, target, stages, timer):
+        self._target = target
+        self._stages = stages
+        self._timer = timer
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        stage = self._stages.get(name)
+        if stage is None or not callable(attribute):
+            return attribute
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._timer.record(stage, time.perf_counter() - started)
+        return timed
+
+
+class TimedVectorStore(TimedProxy):
+    def get_retriever(self):
+        started = time.perf_counter()
+        retriever = self._target.get_retriever()
+        self._timer.record('get_retriever', time.perf_counter() - started)
+        return self._timer.wrap(retriever, {'get_relevant_documents': 'retrieve', 'invoke': 'retrieve'})
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the parse -> retrieve -> LLM -> persist pipeline offline with fake LLM and '
+            'vector store backends, reporting jobs/s and per-stage p50/p95/p99 latencies')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=['use-case', 'task'], default='use-case',
+                            help='Run EvaluateCandidateUseCase directly or through the evaluate_documents task')
+        parser.add_argument('--concurrency', default='1,2,4,8',
+                            help='Comma-separated concurrency levels')
+        parser.add_argument('--jobs', type=int, default=40, help='Jobs per concurrency level')
+        parser.add_argument('--llm-latency', type=float, default=0.5)
+        parser.add_argument('--llm-jitter', type=float, default=0.2)
+        parser.add_argument('--retrieval-latency', type=float, default=0.05)
+        parser.add_argument('--retrieval-jitter', type=float, default=0.02)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--sequential-llm', action='store_true',
+                            help='Disable concurrent CV/project evaluation')
+        parser.add_argument('--evaluation-mode', choices=['multi_call', 'single_call'], default='multi_call',
+                            help='Three LLM calls per job, or one structured call (use-case target; the task uses EVALUATION_MODE)')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark jobs and uploads')
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        cv = UploadedFile.objects.create(file=ContentFile(make_pdf(
+            ["Backend engineer, 5 years of Python and Django."] * 40), name='benchmark_cv.pdf'))
+        report = UploadedFile.objects.create(file=ContentFile(make_pdf(
+            ["Case study: async LLM evaluation pipeline with Celery."] * 40), name='benchmark_report.pdf'))
+
+        try:
+            for concurrency in levels:
+                self.run_level(concurrency, cv, report, options)
+        finally:
+            if not options['keep']:
+                EvaluationJob.objects.filter(cv=cv).delete()
+                for upload in (cv, report):
+                    upload.release_file()
+                    upload.delete()
+            container.reset()
+
+    def build_components(self, timer, options):
+        llm_service = FakeLLMService(
+            latency=options['llm_latency'], jitter=options['llm_jitter'], seed=options['seed'],
+        )
+        vector_store = FakeVectorStore(
+            latency=options['retrieval_latency'], jitter=options['retrieval_jitter'], seed=options['seed'],
+        )
+        parser = PdfParser(
+            max_pages=getattr(settings, 'PDF_MAX_PAGES', None),
+            max_chars=getattr(settings, 'PDF_MAX_CHARS', None),
+        )
+        return {
+            'evaluation_repository': timer.wrap(DjangoEvaluationRepository(), {
+                'get_by_id': 'db_read', 'update': 'db_write', 'transition': 'db_write',
+            }),
+            'pdf_parser': timer.wrap(parser, {'extract': 'extract', 'parse': 'extract'}),
+            'llm_service': timer.wrap(llm_service, {
+                'evaluate_cv': 'llm_cv',
+                'evaluate_project': 'llm_project',
+                'generate_summary': 'llm_summary',
+                'evaluate_candidate': 'llm_candidate',
+            }),
+            'vector_store': TimedVectorStore(vector_store, {}, timer),
+        }
+
+    def run_level(self, concurrency, cv, report, options):
+        timer = StageTimer()
+        components = self.build_components(timer, options)
+        jobs = EvaluationJob.objects.bulk_create([
+            EvaluationJob(job_title='Benchmark', cv=cv, project_report=report) for _ in range(options['jobs'])
+        ])
+
+        if options['target'] == 'task':
+            container.override(**components)
+
+            def run(job_id):
+                evaluate_documents.apply(args=[job_id])
+        else:
+            use_case = EvaluateCandidateUseCase(
+                evaluation_repository=components['evaluation_repository'],
+                cv_parser=components['pdf_parser'],
+                project_parser=components['pdf_parser'],
+                llm_service=components['llm_service'],
+                vector_store=components['vector_store'],
+                parallel_evaluation=not options['sequential_llm'],
+                evaluation_mode=options['evaluation_mode'],
+            )
+
+            def run(job_id):
+                use_case.execute(job_id)
+
+        def timed_job(job_id):
+            started = time.perf_counter()
+            try:
+                run(job_id)
+            finally:
+                timer.record('job', time.perf_counter() - started)
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed_job, [str(job.id) for job in jobs]))
+        elapsed = time.perf_counter() - started
+
+        failed = EvaluationJob.objects.filter(id__in=[job.id for job in jobs]).exclude(status='completed').count()
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"concurrency={concurrency} jobs={len(jobs)} wall={elapsed:.2f}s "
+            f"throughput={len(jobs) / elapsed:.2f} jobs/s failed={failed}"
+        ))
+        self.stdout.write(f"  {'stage':<14}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, samples in sorted(timer.samples.items()):
+            samples = sorted(samples)
+            self.stdout.write(
+                f"  {stage:<14}{len(samples):>7}"
+                + "".join(f"{percentile(samples, fraction) * 1000:>10.1f}" for fraction in (0.5, 0.95, 0.99))
+            )
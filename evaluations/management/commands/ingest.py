@@ -1,22 +1,46 @@
 import os
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
+from core.infra.vector_store.chroma import EMBEDDING_MODEL
+from core.infra.vector_store.context_cache import retrieval_context_cache
+from core.infra.vector_store.embedding_cache import EmbeddingCache
+from core.infra.vector_store.ingest import IncrementalIngestor
+from core.infra.roles import build_role_contexts, write_role_contexts
+from core.infra.vector_store.numpy_index import DTYPES, collection_contents, write_vector_index
 
 load_dotenv()
 
 class Command(BaseCommand):
-    help = 'Ingests documents into the vector store'
+    help = 'Ingests documents into the vector store, embedding only new or changed chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents-dir', default='./documents')
+        parser.add_argument('--persist-directory', default='./chroma_db')
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'INGEST_BATCH_SIZE', 32),
+                            help='Chunks per embedding request')
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'INGEST_CONCURRENCY', 4),
+                            help='Embedding requests in flight at once')
+        parser.add_argument('--embedding-cache', default=str(getattr(settings, 'EMBEDDING_CACHE_PATH', './cache/embeddings.sqlite3')))
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be embedded and its estimated cost without writing anything')
+        parser.add_argument('--price-per-1k-tokens', type=float,
+                            default=getattr(settings, 'EMBEDDING_PRICE_PER_1K_TOKENS', 0.0))
+        parser.add_argument('--vector-index-dtype', choices=DTYPES,
+                            default=getattr(settings, 'VECTOR_INDEX_DTYPE', 'float16'),
+                            help='Element type of the NumPy vector index written next to the Chroma store')
 
     def handle(self, *args, **options):
         self.stdout.write("Starting document ingestion...")
 
         # Load documents
         loader = DirectoryLoader(
-            './documents',
+            options['documents_dir'],
             glob="**/*.txt",
             loader_cls=TextLoader,
             show_progress=True,
@@ -29,14 +53,71 @@ class Command(BaseCommand):
         texts = text_splitter.split_documents(documents)
 
         # Get embeddings
-        embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+        embeddings = GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
 
-        # Create ChromaDB client and collection
-        vector_store = Chroma.from_documents(
-            texts,
-            embeddings,
-            persist_directory="./chroma_db"
+        # Sync the persisted collection with the current chunks. A dry run creates
+        # nothing on disk: a missing store is an empty in-memory collection and a
+        # missing embedding cache has nothing cached.
+        dry_run = options['dry_run']
+        if dry_run and not os.path.isdir(options['persist_directory']):
+            vector_store = Chroma(embedding_function=embeddings)
+        else:
+            vector_store = Chroma(
+                persist_directory=options['persist_directory'],
+                embedding_function=embeddings,
+            )
+        if not dry_run:
+            embedding_cache = EmbeddingCache(options['embedding_cache'])
+        elif os.path.exists(options['embedding_cache']):
+            embedding_cache = EmbeddingCache(options['embedding_cache'], read_only=True)
+        else:
+            embedding_cache = None
+        ingestor = IncrementalIngestor(
+            vector_store,
+            options['persist_directory'],
+            embeddings=embeddings,
+            model=EMBEDDING_MODEL,
+            embedding_cache=embedding_cache,
+            batch_size=options['batch_size'],
+            max_workers=options['concurrency'],
         )
-        vector_store.persist()
 
-        self.stdout.write(self.style.SUCCESS('Successfully ingested documents.'))
+        try:
+            if dry_run:
+                estimate = ingestor.estimate(texts)
+                cost = estimate['estimated_tokens'] / 1000 * options['price_per_1k_tokens']
+                self.stdout.write(
+                    f"Would add {estimate['added']} ({estimate['from_cache']} from cache), "
+                    f"delete {estimate['deleted']}, keep {estimate['unchanged']} chunks."
+                )
+                self.stdout.write(
+                    f"Would embed {estimate['to_embed']} chunks in {estimate['batches']} requests, "
+                    f"~{estimate['estimated_tokens']} tokens, estimated cost {cost:.4f}."
+                )
+                return
+
+            stats = ingestor.run(texts)
+            vector_store.persist()
+            ids, vectors, documents, metadatas = collection_contents(vector_store._collection)
+            write_vector_index(
+                options['persist_directory'], ids, vectors, documents, metadatas,
+                corpus_version=stats['corpus_version'], dtype=options['vector_index_dtype'], model=EMBEDDING_MODEL,
+            )
+            roles = build_role_contexts(options['documents_dir'])
+            write_role_contexts(options['persist_directory'], roles, stats['corpus_version'])
+        finally:
+            if embedding_cache is not None:
+                embedding_cache.close()
+
+        # A new corpus version invalidates cached retrieval context in every worker
+        retrieval_context_cache.clear()
+
+        self.stdout.write(
+            f"Added {stats['added']} ({stats['embedded']} embedded, {stats['from_cache']} from cache), "
+            f"deleted {stats['deleted']}, unchanged {stats['unchanged']} chunks "
+            f"in {stats['seconds']:.1f}s ({stats['chunks_per_second']:.1f} chunks/s)."
+        )
+        self.stdout.write(f"Context bundles for {len(roles)} role(s): {', '.join(sorted(roles))}.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully ingested documents (corpus version {stats['corpus_version'][:12]})."
+        ))
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Stands in for 0001 and 0002. 0001 creates its models under the 'core_domain'
+    label, which no installed app has, so it cannot run on a new database. The
+    models now belong to the domain app (core/domain/migrations) and this app
+    keeps no migration state. A database that applied 0001 and 0002 counts this
+    migration as applied.
+    """
+
+    replaces = [
+        ("evaluations", "0001_initial"),
+        ("evaluations", "0002_rename_tables_for_clean_architecture"),
+    ]
+
+    operations = []
@@ -1,34 +1,132 @@
+import logging
+
 from celery import shared_task
+from celery.signals import worker_process_init
+from django.conf import settings
+from django.utils import timezone
 from dotenv import load_dotenv
 
-from core.application.use_cases.evaluate_candidate import EvaluateCandidateUseCase
+from core.application.interfaces import RetryLater
+from core.domain.models import EvaluationBatch, EvaluationJob
+from core.infra.events import get_job_event_bus
 from core.infra.persistence.django_repository import DjangoEvaluationRepository
-from core.infra.file_parser import PdfParser
-from core.infra.llm.google import GoogleLLMService
-from core.infra.vector_store.chroma import ChromaVectorStore
+from core.infra.persistence.scheduler import FairShareScheduler
+from evaluations.container import container
 
 load_dotenv()
 
-@shared_task(rate_limit='5/m', time_limit=300)
-def evaluate_documents(job_id):
+logger = logging.getLogger(__name__)
+
+@worker_process_init.connect
+def build_worker_container(**kwargs):
+    """
+    Build the LLM, embedding and Chroma clients once per worker process and warm
+    the retrieval cache, so tasks don't pay the setup cost on every job.
+    """
+    try:
+        container.build()
+    except Exception:
+        logger.exception("Could not build the worker container")
+
+@shared_task(
+    bind=True,
+    time_limit=getattr(settings, 'EVALUATION_TASK_TIME_LIMIT', 300),
+    soft_time_limit=getattr(settings, 'EVALUATION_TASK_SOFT_TIME_LIMIT', 240),
+    max_retries=getattr(settings, 'EVALUATION_MAX_DEFERRALS', 5),
+)
+def evaluate_documents(self, job_id):
     """
     Celery task to evaluate a candidate's documents.
-    This task acts as the Composition Root for the evaluation use case.
-    """
-    # 1. Initialize concrete implementations
-    evaluation_repo = DjangoEvaluationRepository()
-    pdf_parser = PdfParser()
-    llm_service = GoogleLLMService()
-    vector_store = ChromaVectorStore()
-
-    # 2. Initialize the use case with concrete dependencies
-    use_case = EvaluateCandidateUseCase(
-        evaluation_repository=evaluation_repo,
-        cv_parser=pdf_parser,
-        project_parser=pdf_parser,
-        llm_service=llm_service,
-        vector_store=vector_store,
+    The worker container acts as the Composition Root for the evaluation use case.
+    LLM calls are throttled cluster-wide by the container's rate limiter rather
+    than by a per-worker task rate limit. A job that gets no request slot in time
+    is queued again and retried after a countdown, up to `max_retries` times; the
+    soft time limit fails a job cleanly before the hard limit kills the worker.
+    """
+    use_case = container.evaluate_candidate_use_case()
+    try:
+        use_case.execute(job_id, can_defer=self.request.retries < self.max_retries)
+    except RetryLater as e:
+        countdown = e.retry_after or getattr(settings, 'LLM_RATE_LIMIT_RETRY_DELAY', 30)
+        raise self.retry(exc=e, countdown=max(countdown, 1))
+    finally:
+        # A finished job frees a bulk slot
+        try:
+            dispatch_bulk_jobs()
+        except Exception:
+            logger.exception("Could not dispatch bulk jobs")
+
+def enqueue_interactive(job_id):
+    """Send an interactive job straight to its own queue, ahead of any bulk backlog."""
+    EvaluationJob.objects.filter(id=job_id).update(dispatched_at=timezone.now())
+    evaluate_documents.apply_async(
+        args=[str(job_id)], queue=getattr(settings, 'EVALUATION_INTERACTIVE_QUEUE', 'interactive'),
     )
 
-    # 3. Execute the use case
-    use_case.execute(job_id)
\ No newline at end of file
+def dispatch_bulk_jobs() -> list:
+    """Hand free bulk slots to waiting jobs, round-robin across owners."""
+    queue = getattr(settings, 'EVALUATION_BULK_QUEUE', 'bulk')
+    return FairShareScheduler().dispatch(
+        lambda job_id: evaluate_documents.apply_async(args=[str(job_id)], queue=queue)
+    )
+
+@shared_task(time_limit=getattr(settings, 'EVALUATION_PRESCREEN_TIME_LIMIT', 300))
+def prescreen_batch(batch_id):
+    """
+    Embed and score a batch's CVs against the role before any of its jobs is
+    dispatched. The batch is released to the scheduler even if scoring fails, so
+    its jobs are evaluated unranked rather than left waiting.
+    """
+    batch = EvaluationBatch.objects.get(id=batch_id)
+    try:
+        result = container.prescreener().run(batch, batch.prescreen)
+        logger.info("Pre-screened batch %s: %d scored, %d screened out",
+                    batch_id, result['scored'], len(result['prescreened_out']))
+    except Exception:
+        logger.exception("Could not pre-screen batch %s", batch_id)
+    finally:
+        EvaluationBatch.objects.filter(id=batch_id).update(prescreened_at=timezone.now())
+        dispatch_bulk_jobs()
+
+@shared_task
+def schedule_bulk_jobs():
+    """
+    Periodic safety net for the bulk scheduler: fails jobs whose worker was lost,
+    releases batches whose pre-screen was lost, then dispatches in case a dispatch
+    after a finished job was missed.
+    """
+    scheduler = FairShareScheduler()
+    released = scheduler.release_stalled_prescreens()
+    if released:
+        logger.warning("Released %d batches whose pre-screen did not finish", released)
+    for job_id in scheduler.reap_stale():
+        logger.warning("Job %s stopped responding; marked as failed", job_id)
+        try:
+            get_job_event_bus().publish(str(job_id), 'failed')
+        except Exception:
+            logger.exception("Could not publish status of job %s", job_id)
+    return len(dispatch_bulk_jobs())
+
+@shared_task
+def worker_health_check():
+    """Report the state of the worker's infrastructure components."""
+    return container.health_check()
+
+@shared_task
+def reload_vector_store():
+    """Reopen the persisted vector store on the worker that runs this task."""
+    container.reload_vector_store()
+    return container.health_check()
+
+def retry_jobs(job_ids) -> list:
+    """
+    Requeue failed jobs and dispatch them again; returns the ids that were requeued.
+    Stages checkpointed by the failed attempt are not run again.
+    """
+    requeued = DjangoEvaluationRepository().requeue_failed(job_ids)
+    interactive = EvaluationJob.objects.filter(id__in=requeued, priority='interactive').values_list('id', flat=True)
+    for job_id in interactive:
+        enqueue_interactive(job_id)
+    if len(interactive) < len(requeued):
+        dispatch_bulk_jobs()
+    return requeued
@@ -1,3 +1,1205 @@
-from django.test import TestCase
+import datetime
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.application.interfaces import (
+    EvaluationResult,
+    ExtractedText,
+    IEvaluationRepository,
+    IFileParser,
+    ILLMService,
+    IVectorStore,
+    LLMOutput,
+    RoleContext,
+)
+from core.application.use_cases.evaluate_candidate import EvaluateCandidateUseCase
+from core.infra.cache import LRUCache
+from core.infra.events import LocalJobEventBus
+from core.infra.file_parser import CachingFileParser, PdfParser
+from core.infra.llm.cache import CachedLLMService
+from core.infra.llm.fake import FakeLLMService
+from core.infra.llm.prompt_budget import OMISSION_MARKER, PromptBudget, estimate_tokens
+from core.infra.llm.rate_limit import RateLimitedLLMService, RateLimitTimeout, RedisRateLimiter
+from core.domain.models import EvaluationBatch, EvaluationJob, UploadedFile
+from core.infra.persistence.django_repository import DjangoEvaluationRepository
+from core.infra.persistence.scheduler import FairShareScheduler
+from core.infra.prescreen import PreScreener
+from core.infra.roles import RoleContextRegistry, build_role_contexts, write_role_contexts
+from core.infra.vector_store.context_cache import CachedRetriever, RetrievalContextCache
+from core.infra.vector_store.embedding_cache import EmbeddingCache
+from core.infra.vector_store.fake import FakeEmbeddings, FakeVectorStore
+from core.infra.vector_store.ingest import IncrementalIngestor
+from core.infra.vector_store.manifest import read_manifest
+from core.infra.vector_store.numpy_index import NumpyVectorStore, write_vector_index
+from evaluations.container import WorkerContainer
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class InMemoryRepository(IEvaluationRepository):
+    def __init__(self, job):
+        self.job = job
+        self.statuses = []
+        self.checkpoints = {}
+
+    def get_by_id(self, job_id: str):
+        return self.job
+
+    def update(self, job, fields=None):
+        self.statuses.append(job.status)
+
+    def get_checkpoints(self, job_id: str) -> dict:
+        return dict(self.checkpoints)
+
+    def save_checkpoint(self, job_id: str, stage: str, payload):
+        self.checkpoints[stage] = payload
+
+    def clear_checkpoints(self, job_id: str):
+        self.checkpoints.clear()
+
+
+class StaticParser(IFileParser):
+    def parse(self, file_path: str) -> str:
+        return f"text of {file_path}"
+
+
+class StaticVectorStore(IVectorStore):
+    def get_retriever(self):
+        return None
+
+
+class BarrierLLMService(ILLMService):
+    """Only succeeds if evaluate_cv and evaluate_project run at the same time."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=1)
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        self.barrier.wait()
+        return "Match Rate: 0.8\nFeedback: Solid backend experience."
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        self.barrier.wait()
+        return "Score: 4.5\nFeedback: Well structured report."
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        return "Strong candidate."
+
+
+class FailOnceLLMService(ILLMService):
+    """Fails the first project evaluation and counts every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        self.calls.append('cv')
+        return "Match Rate: 0.7\nFeedback: Good fit."
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        self.calls.append('project')
+        if self.calls.count('project') == 1:
+            raise RuntimeError("quota exceeded")
+        return "Score: 4.0\nFeedback: Complete."
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        self.calls.append('summary')
+        return "Good candidate."
+
+
+def make_job():
+    return SimpleNamespace(
+        id='job-1',
+        job_title='Backend Developer',
+        status='queued',
+        cv=SimpleNamespace(file=SimpleNamespace(path='cv.pdf')),
+        project_report=SimpleNamespace(file=SimpleNamespace(path='report.pdf')),
+    )
+
+
+class EvaluateCandidateUseCaseTests(SimpleTestCase):
+    """Test the evaluation use case with in-memory collaborators."""
+
+    def build_use_case(self, job, **kwargs):
+        self.repository = InMemoryRepository(job)
+        return EvaluateCandidateUseCase(
+            evaluation_repository=self.repository,
+            cv_parser=StaticParser(),
+            project_parser=StaticParser(),
+            llm_service=BarrierLLMService(),
+            vector_store=StaticVectorStore(),
+            **kwargs,
+        )
+
+    def test_cv_and_project_evaluations_run_concurrently(self):
+        """Test that both evaluations are in flight together in parallel mode."""
+        job = make_job()
+        self.build_use_case(job).execute(job.id)
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.cv_match_rate, 0.8)
+        self.assertEqual(job.project_score, 4.5)
+        self.assertEqual(job.overall_summary, 'Strong candidate.')
+        self.assertEqual(self.repository.statuses, ['processing', 'completed'])
+
+    def test_status_transitions_are_published(self):
+        """Test that waiting clients are told about every status and progress change."""
+        job = make_job()
+        bus = LocalJobEventBus()
+        subscription = bus.subscribe(job.id)
+        self.build_use_case(job, event_publisher=bus).execute(job.id)
+
+        events = list(iter(lambda: subscription.wait(0), None))
+        self.assertEqual(events[0], ('status', 'processing'))
+        self.assertEqual(events[-1], ('status', 'completed'))
+        # Progress writes in between are announced as progress events, not transitions
+        self.assertEqual(set(events[1:-1]), {('progress', 'processing')})
+
+    def test_streamed_output_is_written_as_progress(self):
+        """Test that partial output reaches the repository while the stage is still running."""
+        job = make_job()
+        use_case = self.build_use_case(job, progress_interval=0)
+        use_case.llm_service = FakeLLMService()
+        use_case.vector_store = FakeVectorStore()
+        writes = []
+        self.repository.save_progress = lambda job_id, progress: writes.append(progress)
+
+        use_case.execute(job.id)
+
+        self.assertEqual(job.status, 'completed')
+        partial_summaries = [write['summary']['text'] for write in writes
+                             if write['summary']['status'] == 'running' and write['summary']['text']]
+        self.assertLess(len(partial_summaries[0]), len(job.overall_summary))
+        self.assertEqual(job.progress, {stage: {'status': 'done'} for stage in ('cv', 'project', 'summary')})
+
+    def test_sequential_mode_does_not_overlap_calls(self):
+        """Test that disabling parallel evaluation runs the calls one after another."""
+        job = make_job()
+        self.build_use_case(job, parallel_evaluation=False).execute(job.id)
+
+        # The barrier can never be satisfied by a single thread.
+        self.assertEqual(job.status, 'failed')
+
+    def test_single_call_mode_uses_structured_evaluation(self):
+        """Test that single-call mode makes one structured call and stores its fields."""
+        job = make_job()
+        llm_service = FakeLLMService()
+        use_case = self.build_use_case(job, evaluation_mode='single_call')
+        use_case.llm_service = mock.Mock(wraps=llm_service)
+        use_case.vector_store = FakeVectorStore()
+
+        use_case.execute(job.id)
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.cv_match_rate, 0.82)
+        self.assertEqual(job.project_score, 4.1)
+        use_case.llm_service.evaluate_candidate.assert_called_once()
+        use_case.llm_service.evaluate_cv.assert_not_called()
+
+    def test_out_of_range_result_fails_without_checkpoint(self):
+        """Test that a response outside the rubric's range fails the job and is not kept for retries."""
+        job = make_job()
+        use_case = self.build_use_case(job)
+        use_case.llm_service = FakeLLMService(cv_result="Match Rate: 82\nFeedback: Great.")
+        use_case.vector_store = FakeVectorStore()
+
+        use_case.execute(job.id)
+
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('outside 0.0-1.0', job.overall_summary)
+        self.assertNotIn('cv_result', self.repository.checkpoints)
+
+    def test_retry_resumes_from_checkpoints(self):
+        """Test that a retried job only repeats the stages that had not finished."""
+        job = make_job()
+        llm_service = FailOnceLLMService()
+        use_case = self.build_use_case(job)
+        use_case.llm_service = llm_service
+
+        use_case.execute(job.id)
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(
+            set(self.repository.checkpoints), {'cv_text', 'project_report_text', 'cv_result'}
+        )
+
+        job.status = 'queued'  # as requeue_failed does
+        use_case.execute(job.id)
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.cv_match_rate, 0.7)
+        self.assertEqual(sorted(llm_service.calls), ['cv', 'project', 'project', 'summary'])
+        self.assertEqual(self.repository.checkpoints, {})
+
+    def test_job_without_an_llm_slot_is_requeued(self):
+        """Test that a rate limit timeout puts the job back in the queue, and fails it once it cannot defer."""
+        job = make_job()
+        llm_service = FailOnceLLMService()
+        use_case = self.build_use_case(job)
+        use_case.llm_service = llm_service
+        saturated = RateLimitTimeout("No LLM request slot", retry_after=12)
+
+        with mock.patch.object(llm_service, 'evaluate_project', side_effect=saturated):
+            with self.assertRaises(RateLimitTimeout):
+                use_case.execute(job.id, can_defer=True)
+            self.assertEqual(job.status, 'queued')
+            self.assertIn('cv_result', self.repository.checkpoints)
+
+            use_case.execute(job.id)
+        self.assertEqual(job.status, 'failed')
+
+    def test_job_that_is_not_queued_is_not_evaluated(self):
+        """Test that a second delivery of a job another worker already claimed does nothing."""
+        job = make_job()
+        job.status = 'processing'
+        llm_service = FailOnceLLMService()
+        use_case = self.build_use_case(job)
+        use_case.llm_service = llm_service
+
+        use_case.execute(job.id)
+
+        self.assertEqual(job.status, 'processing')
+        self.assertEqual(self.repository.statuses, [])
+        self.assertEqual(llm_service.calls, [])
+
+
+class ContextRecordingLLMService(FakeLLMService):
+    def __init__(self):
+        super().__init__()
+        self.contexts = []
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        context = super().retrieve_context(stage, retriever)
+        self.contexts.append((stage, context))
+        return context
+
+
+class RoleContextTests(SimpleTestCase):
+    """Test per-role context bundles built by ingest."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        documents = os.path.join(self.tmpdir.name, 'documents')
+        data_engineer = os.path.join(documents, 'roles', 'data-engineer')
+        os.makedirs(data_engineer)
+        files = {
+            os.path.join(documents, 'job_description.txt'): 'Backend Developer Job Description\n\nRole: Backend Developer',
+            os.path.join(documents, 'cv_scoring_rubric.txt'): 'Shared CV rubric',
+            os.path.join(documents, 'case_study_brief.txt'): 'Backend case study',
+            os.path.join(documents, 'project_scoring_rubric.txt'): 'Shared project rubric',
+            os.path.join(data_engineer, 'job_description.txt'): 'Role: Data Engineer\nSpark, Airflow',
+            os.path.join(data_engineer, 'case_study_brief.txt'): 'Data pipeline case study',
+        }
+        for path, text in files.items():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        write_role_contexts(self.tmpdir.name, build_role_contexts(documents), 'v1')
+        self.registry = RoleContextRegistry(self.tmpdir.name)
+
+    def test_bundles_are_looked_up_by_normalized_title(self):
+        """Test that each role gets its own documents and falls back to shared ones."""
+        data_engineer = self.registry.get('  data   ENGINEER ')
+
+        self.assertEqual(len(self.registry), 2)
+        self.assertEqual(data_engineer.case_study_brief, 'Data pipeline case study')
+        self.assertEqual(data_engineer.cv_rubric, 'Shared CV rubric')
+        self.assertEqual(self.registry.get('Backend Developer').case_study_brief, 'Backend case study')
+        self.assertIsNone(self.registry.get('Product Manager'))
+
+    def test_use_case_uses_the_bundle_of_known_roles_only(self):
+        """Test that a known role skips retrieval and an unknown role falls back to it, queried by its title."""
+        contexts = {}
+        for title in ('Data Engineer', 'Product Manager'):
+            job = make_job()
+            job.job_title = title
+            llm_service = ContextRecordingLLMService()
+            vector_store = mock.Mock(wraps=FakeVectorStore())
+            EvaluateCandidateUseCase(
+                evaluation_repository=InMemoryRepository(job), cv_parser=StaticParser(),
+                project_parser=StaticParser(), llm_service=llm_service, vector_store=vector_store,
+                role_contexts=self.registry,
+            ).execute(job.id)
+            self.assertEqual(job.status, 'completed')
+            contexts[title] = (dict(llm_service.contexts), vector_store.get_retriever.call_count)
+
+        known, retrievals = contexts['Data Engineer']
+        self.assertEqual(known['project']['case_study_brief'], 'Data pipeline case study')
+        self.assertEqual(retrievals, 0)
+        unknown, retrievals = contexts['Product Manager']
+        self.assertEqual(retrievals, 1)
+        self.assertIn('Product Manager Job Description', unknown['cv'])
+
+
+class CountingRetriever:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, query):
+        self.calls.append(query)
+        return [SimpleNamespace(page_content=f"context for {query}")]
+
+
+class RetrievalContextCacheTests(SimpleTestCase):
+    """Test caching of the constant reference-context retrieval."""
+
+    def test_repeated_queries_hit_the_cache(self):
+        """Test that a warmed query is not retrieved again for the same corpus version."""
+        cache = RetrievalContextCache()
+        inner = CountingRetriever()
+        CachedRetriever(inner, version='v1', cache=cache).warm(['Case Study Brief'])
+
+        documents = CachedRetriever(inner, version='v1', cache=cache).get_relevant_documents('Case Study Brief')
+
+        self.assertEqual(documents[0].page_content, 'context for Case Study Brief')
+        self.assertEqual(inner.calls, ['Case Study Brief'])
+
+    def test_new_corpus_version_invalidates_entries(self):
+        """Test that a re-ingested corpus is retrieved again."""
+        cache = RetrievalContextCache()
+        inner = CountingRetriever()
+        CachedRetriever(inner, version='v1', cache=cache).get_relevant_documents('Case Study Brief')
+        CachedRetriever(inner, version='v2', cache=cache).get_relevant_documents('Case Study Brief')
+
+        self.assertEqual(len(inner.calls), 2)
+
+
+class VersionedVectorStore(StaticVectorStore):
+    version = 'v1'
+
+    def get_version(self):
+        return VersionedVectorStore.version
+
+    def count(self):
+        return 4
+
+    def get_retriever(self):
+        return CachedRetriever(CountingRetriever(), version=self.get_version(), cache=RetrievalContextCache())
+
+
+@mock.patch('evaluations.container.ChromaVectorStore', VersionedVectorStore)
+@mock.patch('evaluations.container.GoogleLLMService', lambda **kwargs: BarrierLLMService())
+class WorkerContainerTests(SimpleTestCase):
+    """Test per-process reuse of the evaluation infrastructure."""
+
+    def setUp(self):
+        VersionedVectorStore.version = 'v1'
+
+    def test_clients_are_reused_across_tasks(self):
+        """Test that consecutive use cases share the same client instances."""
+        container = WorkerContainer()
+        first = container.evaluate_candidate_use_case()
+        second = container.evaluate_candidate_use_case()
+
+        self.assertIs(first.llm_service, second.llm_service)
+        self.assertIs(first.vector_store, second.vector_store)
+        self.assertIs(first.cv_parser, second.cv_parser)
+
+    def test_vector_store_reloads_after_ingest(self):
+        """Test that a new corpus version reopens the vector store."""
+        container = WorkerContainer()
+        before = container.vector_store
+        VersionedVectorStore.version = 'v2'
+
+        self.assertIsNot(container.vector_store, before)
+        self.assertEqual(container.health_check()['corpus_version'], 'v2')
+
+
+class CountingParser(IFileParser):
+    version = "1"
+
+    def __init__(self):
+        self.calls = 0
+
+    def parse(self, file_path: str) -> str:
+        self.calls += 1
+        with open(file_path, 'rb') as f:
+            return f.read().decode()
+
+
+class CachingFileParserTests(SimpleTestCase):
+    """Test the content-addressed parse cache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = LocMemCache('parse-tests', {})
+        self.cache.clear()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_identical_content_is_extracted_once(self):
+        """Test that the same bytes under different paths share one extraction."""
+        inner = CountingParser()
+        parser = CachingFileParser(inner, self.cache)
+
+        first = parser.parse(self.write('cv_a.pdf', b'same cv'))
+        second = parser.parse(self.write('cv_b.pdf', b'same cv'))
+
+        self.assertEqual(first, second)
+        self.assertEqual(inner.calls, 1)
+
+    def test_parser_version_is_part_of_the_key(self):
+        """Test that a new parser version does not reuse old extractions."""
+        inner = CountingParser()
+        path = self.write('cv.pdf', b'cv')
+        CachingFileParser(inner, self.cache).parse(path)
+        inner.version = "2"
+        CachingFileParser(inner, self.cache).parse(path)
+
+        self.assertEqual(inner.calls, 2)
+
+
+class FakePagesParser(PdfParser):
+    pages = ["a" * 10, "b" * 10, "c" * 10]
+    delay = 0
+
+    def iter_pages(self, file_path: str):
+        for page in self.pages:
+            time.sleep(self.delay)
+            yield page
+
+
+def extract_with_timeout(file_path):
+    return FakePagesParser(timeout=5).extract(file_path)
+
+
+class PdfParserBudgetTests(SimpleTestCase):
+    """Test bounded PDF extraction."""
+
+    def test_page_budget_truncates(self):
+        """Test that extraction stops at the page budget and reports it."""
+        extracted = FakePagesParser(max_pages=2).extract('cv.pdf')
+
+        self.assertEqual(extracted.text, "a" * 10 + "b" * 10)
+        self.assertTrue(extracted.truncated)
+
+    def test_character_budget_truncates_mid_page(self):
+        """Test that extraction stops at the character budget."""
+        extracted = FakePagesParser(max_chars=15).extract('cv.pdf')
+
+        self.assertEqual(len(extracted.text), 15)
+        self.assertTrue(extracted.truncated)
+
+    def test_within_budget_runs_in_child_process(self):
+        """Test that a child-process extraction returns the full text."""
+        extracted = FakePagesParser(max_pages=10, timeout=5).extract('cv.pdf')
+
+        self.assertEqual(extracted.pages, 3)
+        self.assertFalse(extracted.truncated)
+
+    def test_timeout_works_inside_a_daemonic_pool_worker(self):
+        """Test that extraction with a timeout can run in a Celery prefork pool worker."""
+        from billiard.pool import Pool
+
+        with Pool(1) as pool:
+            extracted = pool.apply_async(extract_with_timeout, ('cv.pdf',)).get(timeout=10)
+
+        self.assertEqual(extracted.pages, 3)
+
+    def test_slow_extraction_times_out(self):
+        """Test that a slow PDF is abandoned after the hard timeout."""
+        parser = FakePagesParser(timeout=0.2)
+        parser.delay = 1
+
+        with self.assertRaises(TimeoutError):
+            parser.extract('cv.pdf')
+
+
+class CountingLLMService(ILLMService):
+    model_name = 'fake-model'
+
+    def __init__(self):
+        self.calls = []
+        self.rubric = 'rubric v1'
+
+    def retrieve_context(self, stage: str, retriever) -> dict:
+        return {'rubric': self.rubric}
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        self.calls.append('cv')
+        return "Match Rate: 0.5\nFeedback: ok"
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        self.calls.append('project')
+        return "Score: 3\nFeedback: ok"
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        self.calls.append('summary')
+        return "Summary"
+
+
+class CachedLLMServiceTests(SimpleTestCase):
+    """Test the LLM response cache."""
+
+    def test_repeated_evaluation_is_served_from_cache(self):
+        """Test that the same document and context only calls the model once."""
+        inner = CountingLLMService()
+        service = CachedLLMService(inner, LRUCache())
+
+        service.evaluate_cv('cv text', None)
+        result = service.evaluate_cv('cv text', None)
+
+        self.assertEqual(result, "Match Rate: 0.5\nFeedback: ok")
+        self.assertEqual(inner.calls, ['cv'])
+        self.assertEqual(service.stats()['hits'], 1)
+        self.assertEqual(service.stats()['misses'], 1)
+
+    def test_changed_context_misses(self):
+        """Test that a new rubric invalidates cached responses."""
+        inner = CountingLLMService()
+        service = CachedLLMService(inner, LRUCache())
+
+        service.evaluate_project('report', None)
+        inner.rubric = 'rubric v2'
+        service.evaluate_project('report', None)
+
+        self.assertEqual(inner.calls, ['project', 'project'])
+
+    def test_invalid_response_is_not_cached(self):
+        """Test that an out-of-range answer is asked again instead of replayed on retry."""
+        inner = CountingLLMService()
+        service = CachedLLMService(inner, LRUCache())
+
+        with mock.patch.object(inner, 'evaluate_cv', return_value="Match Rate: 7\nFeedback: ok"):
+            self.assertRaises(ValueError, EvaluationResult.parse_cv, service.evaluate_cv('cv text', None))
+        result = service.evaluate_cv('cv text', None)
+
+        self.assertEqual(EvaluationResult.parse_cv(result), (0.5, 'ok'))
+        self.assertEqual(inner.calls, ['cv'])
+        self.assertEqual(service.stats()['hits'], 0)
+
+    def test_cached_response_reports_no_prompt_tokens(self):
+        """Test that a cache hit doesn't count the original prompt against the job."""
+        service = CachedLLMService(TokenReportingLLMService(), LRUCache())
+
+        self.assertEqual(service.evaluate_cv('cv text', None).prompt_tokens, 100)
+        self.assertEqual(service.evaluate_cv('cv text', None).prompt_tokens, 0)
+
+
+class TokenReportingLLMService(CountingLLMService):
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        return LLMOutput(super().evaluate_cv(cv_content, retriever), 100)
+
+    def evaluate_project(self, project_content: str, retriever, on_chunk=None):
+        return LLMOutput(super().evaluate_project(project_content, retriever), 200)
+
+    def generate_summary(self, cv_evaluation: str, project_evaluation: str, on_chunk=None):
+        return LLMOutput(super().generate_summary(cv_evaluation, project_evaluation), 50)
+
+
+class PromptBudgetTests(SimpleTestCase):
+    """Test token-budgeted prompt assembly."""
+
+    def test_short_sections_pass_through(self):
+        """Test that inputs within their budget are left untouched."""
+        budget = PromptBudget({'cv_text': 100})
+        inputs = {'cv_text': 'Python developer', 'cv_rubric': 'x' * 10_000}
+
+        self.assertEqual(budget.assemble(inputs), inputs)
+
+    def test_long_document_keeps_chunks_relevant_to_the_rubric(self):
+        """Test that an over-budget report keeps the rubric-relevant section within budget."""
+        filler = ["Team lunch was on Friday and everyone enjoyed the weather."] * 40
+        relevant = "Error handling uses retries with exponential backoff and idempotent Celery tasks."
+        report = "\n".join(filler[:20] + [relevant] + filler[20:])
+        budget = PromptBudget({'project_report_text': 60}, chunk_tokens=20)
+
+        fitted = budget.assemble({
+            'project_report_text': report,
+            'project_rubric': 'Resilience: retries, backoff, error handling in Celery tasks.',
+        })['project_report_text']
+
+        self.assertIn(relevant, fitted)
+        self.assertIn(OMISSION_MARKER, fitted)
+        self.assertLessEqual(estimate_tokens(fitted.replace(OMISSION_MARKER, '')), 60)
+
+    def test_single_call_mode_falls_back_to_stage_calls(self):
+        """Test that a service without a structured call is evaluated with its three stage calls."""
+        job = make_job()
+        llm_service = TokenReportingLLMService()
+        EvaluateCandidateUseCase(
+            evaluation_repository=InMemoryRepository(job),
+            cv_parser=StaticParser(),
+            project_parser=StaticParser(),
+            llm_service=llm_service,
+            vector_store=StaticVectorStore(),
+            evaluation_mode='single_call',
+        ).execute(job.id)
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(llm_service.calls, ['cv', 'project', 'summary'])
+        self.assertEqual(job.prompt_tokens, 350)
+
+    def test_use_case_records_prompt_tokens(self):
+        """Test that the job stores the prompt tokens of all three calls."""
+        job = make_job()
+        EvaluateCandidateUseCase(
+            evaluation_repository=InMemoryRepository(job),
+            cv_parser=StaticParser(),
+            project_parser=StaticParser(),
+            llm_service=TokenReportingLLMService(),
+            vector_store=StaticVectorStore(),
+        ).execute(job.id)
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.prompt_tokens, 350)
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class QuotaLLMService(CountingLLMService):
+    """Answers the first `rejections` calls like a provider out of quota."""
+
+    def __init__(self, rejections):
+        super().__init__()
+        self.rejections = rejections
+
+    def evaluate_cv(self, cv_content: str, retriever, on_chunk=None):
+        if self.rejections:
+            self.rejections -= 1
+            raise RuntimeError("LLM call failed") from ResourceExhausted("429 RESOURCE_EXHAUSTED")
+        return super().evaluate_cv(cv_content, retriever)
+
+
+@skipUnless(fakeredis, "fakeredis[lua] is not installed")
+class RedisRateLimiterTests(SimpleTestCase):
+    """Test the cluster-wide adaptive LLM rate limiter against fakeredis."""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.limiter = RedisRateLimiter(
+            fakeredis.FakeRedis(), max_rate=60, min_rate=6, burst=2,
+            decrease_cooldown=5, increase_interval=10, clock=lambda: self.now,
+        )
+
+    def test_requests_are_spaced_after_the_burst(self):
+        """Test that the burst is admitted at once and the next request must wait one interval."""
+        self.assertTrue(self.limiter.try_acquire()[0])
+        self.assertTrue(self.limiter.try_acquire()[0])
+        allowed, retry_after = self.limiter.try_acquire()
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 1.0)
+        self.now += 1.0
+        self.assertTrue(self.limiter.try_acquire()[0])
+
+    def test_rate_shrinks_on_throttling_and_probes_back_up(self):
+        """Test multiplicative decrease once per cooldown and additive increase while calls succeed."""
+        self.assertEqual(self.limiter.record_throttled(), 30)
+        self.assertEqual(self.limiter.record_throttled(), 30)
+        self.now += 5
+        self.assertEqual(self.limiter.record_throttled(), 15)
+
+        self.now += 10
+        self.assertEqual(self.limiter.record_success(), 16)
+        self.assertEqual(self.limiter.record_success(), 16)
+        self.assertEqual(self.limiter.current_rate(), 16)
+
+    def test_quota_errors_are_retried_at_the_lower_rate(self):
+        """Test that a RESOURCE_EXHAUSTED call waits for a new slot instead of failing the job."""
+        inner = QuotaLLMService(rejections=1)
+        limiter = RedisRateLimiter(fakeredis.FakeRedis(), max_rate=6000, burst=1)
+        service = RateLimitedLLMService(inner, limiter, max_wait=1)
+
+        self.assertEqual(service.evaluate_cv('cv', None), "Match Rate: 0.5\nFeedback: ok")
+        self.assertEqual(limiter.current_rate(), 3000)
+
+    def test_waiting_longer_than_max_wait_raises(self):
+        """Test that a caller gives up when no slot frees up within its wait budget."""
+        self.limiter.try_acquire()
+        self.limiter.try_acquire()
+
+        with self.assertRaises(RateLimitTimeout):
+            self.limiter.acquire(timeout=0.5)
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Test the in-process LRU/TTL cache."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+
+    def test_expired_entry_is_dropped(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set('a', 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+
+
+class InMemoryChroma:
+    def __init__(self):
+        self.documents = {}
+        self.embedded = 0
+
+    def get(self, include=None):
+        return {'ids': list(self.documents)}
+
+    def add_documents(self, documents, ids):
+        self.embedded += len(documents)
+        self.documents.update(zip(ids, documents))
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            del self.documents[chunk_id]
+
+    @property
+    def _collection(self):
+        return self
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.documents.update(zip(ids, documents))
+
+
+def chunk(text, source='documents/job_description.txt'):
+    return SimpleNamespace(page_content=text, metadata={'source': source})
+
+
+class IncrementalIngestTests(SimpleTestCase):
+    """Test that ingest only embeds new or changed chunks."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = InMemoryChroma()
+
+    def ingest(self, chunks):
+        return IncrementalIngestor(self.store, self.tmpdir.name).run(chunks)
+
+    def test_unchanged_corpus_embeds_nothing(self):
+        """Test that re-running ingest on the same documents is a no-op with a stable version."""
+        first = self.ingest([chunk('Backend developer'), chunk('Python, Django')])
+        second = self.ingest([chunk('Backend developer'), chunk('Python, Django')])
+
+        self.assertEqual(self.store.embedded, 2)
+        self.assertEqual(second['unchanged'], 2)
+        self.assertEqual(first['corpus_version'], second['corpus_version'])
+
+    def test_changed_chunk_replaces_stale_one(self):
+        """Test that an edited chunk is embedded and its old version deleted."""
+        first = self.ingest([chunk('Backend developer'), chunk('Python, Django')])
+        second = self.ingest([chunk('Backend developer'), chunk('Python, FastAPI')])
+
+        self.assertEqual((second['added'], second['deleted']), (1, 1))
+        self.assertEqual(len(self.store.documents), 2)
+        self.assertNotEqual(first['corpus_version'], second['corpus_version'])
+        self.assertEqual(read_manifest(self.tmpdir.name)['corpus_version'], second['corpus_version'])
+
+
+class FlakyEmbeddings:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        if self.fail_on and any(self.fail_on in text for text in texts):
+            raise RuntimeError("embedding API unavailable")
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class BatchedIngestTests(SimpleTestCase):
+    """Test batched embedding with a persistent embedding cache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = EmbeddingCache(os.path.join(self.tmpdir.name, 'embeddings.sqlite3'))
+        self.addCleanup(self.cache.close)
+        self.chunks = [chunk(f'chunk {i}') for i in range(5)]
+
+    def ingestor(self, store, embeddings):
+        return IncrementalIngestor(
+            store, self.tmpdir.name, embeddings=embeddings, model='test-model',
+            embedding_cache=self.cache, batch_size=2, max_workers=2, max_retries=0,
+        )
+
+    def test_failed_run_resumes_from_cached_batches(self):
+        """Test that batches embedded before a failure are not embedded again."""
+        store = InMemoryChroma()
+        with self.assertRaises(RuntimeError):
+            self.ingestor(store, FlakyEmbeddings(fail_on='chunk 4')).run(self.chunks)
+
+        embeddings = FlakyEmbeddings()
+        stats = self.ingestor(InMemoryChroma(), embeddings).run(self.chunks)
+
+        self.assertEqual(stats['from_cache'], 4)
+        self.assertEqual(embeddings.embedded, ['chunk 4'])
+
+    def test_dry_run_estimates_without_embedding(self):
+        """Test that an estimate reports work without calling the API or writing the manifest."""
+        embeddings = FlakyEmbeddings()
+        estimate = self.ingestor(InMemoryChroma(), embeddings).estimate(self.chunks)
+
+        self.assertEqual((estimate['to_embed'], estimate['batches']), (5, 3))
+        self.assertEqual(embeddings.embedded, [])
+        self.assertEqual(read_manifest(self.tmpdir.name), {})
+
+    def test_dry_run_command_creates_nothing(self):
+        """Test that `ingest --dry-run` leaves no Chroma directory or embedding cache behind."""
+        documents_dir = os.path.join(self.tmpdir.name, 'documents')
+        os.makedirs(documents_dir)
+        with open(os.path.join(documents_dir, 'backend.txt'), 'w') as handle:
+            handle.write('Backend developer with Python and Django.')
+        persist_directory = os.path.join(self.tmpdir.name, 'chroma_db')
+        cache_path = os.path.join(self.tmpdir.name, 'cache', 'embeddings.sqlite3')
+
+        out = StringIO()
+        with mock.patch('evaluations.management.commands.ingest.GoogleGenerativeAIEmbeddings',
+                        return_value=FakeEmbeddings()):
+            call_command('ingest', '--dry-run', documents_dir=documents_dir,
+                         persist_directory=persist_directory, embedding_cache=cache_path, stdout=out)
+
+        self.assertIn('Would embed 1 chunks', out.getvalue())
+        self.assertFalse(os.path.exists(persist_directory))
+        self.assertFalse(os.path.exists(os.path.dirname(cache_path)))
+
+    def test_read_only_cache_serves_existing_vectors(self):
+        """Test that a read-only embedding cache returns stored vectors."""
+        self.cache.put_many({'abc': [0.5, 1.0]}, 'test-model')
+        read_only = EmbeddingCache(os.path.join(self.tmpdir.name, 'embeddings.sqlite3'), read_only=True)
+        self.addCleanup(read_only.close)
+
+        self.assertEqual(read_only.get_many(['abc', 'missing'], 'test-model'), {'abc': [0.5, 1.0]})
+
+
+class NumpyVectorStoreTests(SimpleTestCase):
+    """Test the memory-mapped vector index written by ingest."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.embeddings = FakeEmbeddings(size=32)
+        self.texts = [f'reference chunk {i}' for i in range(20)]
+
+    def write(self, version='v1', dtype='float16'):
+        write_vector_index(
+            self.tmpdir.name, [f'id-{i}' for i in range(len(self.texts))],
+            self.embeddings.embed_documents(self.texts), self.texts,
+            [{'source': 'documents/job_description.txt'}] * len(self.texts),
+            corpus_version=version, dtype=dtype,
+        )
+
+    def test_top_k_matches_exhaustive_cosine_ranking(self):
+        """Test that the vectorized search returns the same top k as ranking every chunk."""
+        self.write(dtype='float32')
+        store = NumpyVectorStore(self.tmpdir.name, embeddings=self.embeddings, k=3)
+        query = 'reference chunk 7'
+
+        query_vector = self.embeddings.embed_query(query)
+        expected = sorted(
+            self.texts, key=lambda text: -sum(a * b for a, b in zip(query_vector, self.embeddings.embed_query(text))),
+        )[:3]
+        self.assertEqual([doc.page_content for doc in store.get_retriever().invoke(query)], expected)
+        self.assertIsInstance(store.matrix, np.memmap)
+
+    def test_float16_index_and_new_version_on_disk(self):
+        """Test that a float16 index still finds exact matches and a re-ingest changes the version."""
+        self.write()
+        store = NumpyVectorStore(self.tmpdir.name, embeddings=self.embeddings)
+
+        self.assertEqual(store.matrix.dtype, np.float16)
+        self.assertEqual(store.get_retriever().invoke('reference chunk 12')[0].page_content, 'reference chunk 12')
+        self.assertEqual(store.get_version(), 'v1')
+
+        self.texts.append('new chunk')
+        self.write(version='v2')
+        self.assertEqual(store.get_version(), 'v2')
+        self.assertEqual(NumpyVectorStore(self.tmpdir.name, embeddings=self.embeddings).count(), 21)
+
+
+class OfflineBackendTests(SimpleTestCase):
+    """Test the offline LLM and vector store stand-ins used for benchmarks."""
+
+    def test_fake_embeddings_are_deterministic_unit_vectors(self):
+        embeddings = FakeEmbeddings(size=16)
+        first, second = embeddings.embed_query('rubric'), embeddings.embed_query('rubric')
+
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(sum(value * value for value in first), 1.0)
+
+    def test_use_case_completes_with_offline_backends(self):
+        """Test that the canned outputs go through the real result parsing."""
+        job = make_job()
+        use_case = EvaluateCandidateUseCase(
+            evaluation_repository=InMemoryRepository(job),
+            cv_parser=StaticParser(),
+            project_parser=StaticParser(),
+            llm_service=FakeLLMService(latency=0.01, jitter=0.01, seed=1),
+            vector_store=FakeVectorStore(),
+        )
+        use_case.execute(job.id)
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.cv_match_rate, 0.82)
+        self.assertEqual(job.project_score, 4.1)
+
+
+class FairShareSchedulerTests(TestCase):
+    """Test fair-share dispatch of bulk jobs and queue position estimates."""
+
+    def setUp(self):
+        self.upload = UploadedFile.objects.create(file='uploads/cv.pdf')
+        self.bulk_user = User.objects.create_user(username='bulk', password='x')
+        self.other_user = User.objects.create_user(username='other', password='x')
+        self.bulk_jobs = [self.make_job(self.bulk_user) for _ in range(5)]
+        self.other_jobs = [self.make_job(self.other_user) for _ in range(2)]
+
+    def make_job(self, owner):
+        return EvaluationJob.objects.create(
+            job_title='Backend Developer', cv=self.upload, project_report=self.upload,
+            owner=owner, priority='bulk',
+        )
+
+    def test_slots_are_shared_round_robin_between_owners(self):
+        """Test that a later, smaller batch is not starved by an earlier large one."""
+        sent = []
+        FairShareScheduler(max_in_flight=4).dispatch(sent.append)
+
+        owners = list(EvaluationJob.objects.filter(id__in=sent).values_list('owner__username', flat=True))
+        self.assertEqual(sorted(owners), ['bulk', 'bulk', 'other', 'other'])
+        # The slots are full until a dispatched job finishes
+        self.assertEqual(FairShareScheduler(max_in_flight=4).dispatch(sent.append), [])
+
+    def test_stale_jobs_are_failed_and_free_their_slots(self):
+        """Test that jobs whose worker was lost are failed and stop holding bulk slots."""
+        scheduler = FairShareScheduler(max_in_flight=2, stale_after=600)
+        sent = []
+        scheduler.dispatch(sent.append)
+        long_ago = timezone.now() - datetime.timedelta(seconds=900)
+        lost, alive = sent
+        EvaluationJob.objects.filter(id=lost).update(status='processing', started_at=long_ago, updated_at=long_ago)
+        EvaluationJob.objects.filter(id=alive).update(status='processing', started_at=long_ago)
+
+        self.assertEqual(scheduler.reap_stale(), [lost])
+        self.assertEqual(EvaluationJob.objects.get(id=lost).status, 'failed')
+        self.assertEqual(EvaluationJob.objects.get(id=alive).status, 'processing')
+        self.assertEqual(len(scheduler.dispatch(sent.append)), 1)
+
+    def test_jobs_waiting_in_the_broker_are_not_reaped(self):
+        """Test that a dispatched job no worker has started is left queued, while a deferred retry is reaped."""
+        scheduler = FairShareScheduler(max_in_flight=2, stale_after=600)
+        long_ago = timezone.now() - datetime.timedelta(seconds=900)
+        waiting, deferred = self.other_jobs
+        interactive = EvaluationJob.objects.create(
+            job_title='Backend Developer', cv=self.upload, project_report=self.upload, owner=self.other_user,
+        )
+        EvaluationJob.objects.filter(id__in=[waiting.id, interactive.id]).update(
+            dispatched_at=long_ago, updated_at=long_ago,
+        )
+        EvaluationJob.objects.filter(id=deferred.id).update(
+            dispatched_at=long_ago, started_at=long_ago, updated_at=long_ago,
+        )
+
+        self.assertEqual(scheduler.reap_stale(), [deferred.id])
+        self.assertEqual(EvaluationJob.objects.get(id=waiting.id).status, 'queued')
+        self.assertEqual(EvaluationJob.objects.get(id=interactive.id).status, 'queued')
+
+    def test_queue_position_counts_other_owners_turns(self):
+        """Test that a waiting job's position interleaves the other owners' jobs."""
+        scheduler = FairShareScheduler(max_in_flight=1)
+
+        self.assertEqual(scheduler.queue_position(self.other_jobs[1]), 2)
+        self.assertEqual(scheduler.queue_position(self.bulk_jobs[4]), 6)
+
+
+class DjangoEvaluationRepositoryTests(TestCase):
+    """Test targeted writes and conditional status transitions."""
+
+    def setUp(self):
+        upload = UploadedFile.objects.create(file='uploads/cv.pdf')
+        self.job = EvaluationJob.objects.create(job_title='Backend Developer', cv=upload, project_report=upload)
+        self.repository = DjangoEvaluationRepository()
+
+    def test_only_one_transition_from_a_status_wins(self):
+        """Test that two workers claiming the same queued job cannot both succeed."""
+        first = EvaluationJob.objects.get(id=self.job.id)
+        second = EvaluationJob.objects.get(id=self.job.id)
+
+        self.assertTrue(self.repository.transition(first, 'queued', 'processing'))
+        self.assertFalse(self.repository.transition(second, 'queued', 'processing'))
+        self.assertEqual(second.status, 'queued')
+        self.assertEqual(EvaluationJob.objects.get(id=self.job.id).status, 'processing')
+
+    def test_transition_writes_only_the_given_fields(self):
+        """Test that a transition leaves columns written by others untouched."""
+        stale = EvaluationJob.objects.get(id=self.job.id)
+        EvaluationJob.objects.filter(id=self.job.id).update(progress={'cv': {'status': 'done'}})
+
+        stale.cv_match_rate = 0.9
+        stale.cv_feedback = 'Strong match.'
+        self.repository.transition(stale, 'queued', 'processing', ['cv_match_rate', 'cv_feedback'])
+
+        job = EvaluationJob.objects.get(id=self.job.id)
+        self.assertEqual((job.status, job.cv_match_rate, job.cv_feedback), ('processing', 0.9, 'Strong match.'))
+        self.assertEqual(job.progress, {'cv': {'status': 'done'}})
+
+
+class KeywordEmbeddings:
+    """Counts of a few keywords, so similarities in tests are predictable."""
+    VOCABULARY = ('python', 'django', 'sql', 'sales', 'design')
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) for word in self.VOCABULARY]
+
+
+class TextByPathParser(IFileParser):
+    def __init__(self, texts):
+        self.texts = texts
+
+    def parse(self, file_path: str) -> str:
+        return self.extract(file_path).text
+
+    def extract(self, file_path: str) -> ExtractedText:
+        return ExtractedText(text=self.texts[os.path.basename(file_path)], pages=1, truncated=False)
+
+
+class PreScreenerTests(TestCase):
+    """Test the embedding pre-screen of batch CVs."""
+
+    CVS = {
+        'strong.pdf': 'python django sql',
+        'good.pdf': 'python django',
+        'sales.pdf': 'sales',
+        'design.pdf': 'design',
+    }
+
+    def setUp(self):
+        self.batch = EvaluationBatch.objects.create(job_title='Backend Developer', prescreen='filter')
+        self.report = UploadedFile.objects.create(file='uploads/report.pdf')
+        self.jobs = {}
+        for name in self.CVS:
+            cv = UploadedFile.objects.create(file=f'uploads/{name}', sha256=name.ljust(64, '0'))
+            self.jobs[name] = EvaluationJob.objects.create(
+                batch=self.batch, job_title='Backend Developer', cv=cv, project_report=self.report, priority='bulk',
+            )
+        self.embeddings = KeywordEmbeddings()
+        self.publisher = mock.Mock()
+        role = RoleContext(title='Backend Developer', job_description='python django sql',
+                           cv_rubric='', case_study_brief='', project_rubric='')
+        self.prescreener = PreScreener(
+            self.embeddings, TextByPathParser(self.CVS), DjangoEvaluationRepository(), model='keywords',
+            role_contexts=SimpleNamespace(get=lambda title: role), event_publisher=self.publisher,
+            percentile=50, min_batch=4,
+        )
+
+    def statuses(self):
+        return {name: EvaluationJob.objects.get(id=job.id).status for name, job in self.jobs.items()}
+
+    def test_filter_screens_out_cvs_below_the_percentile(self):
+        """Test that the least similar CVs end as prescreened_out and the rest stay queued."""
+        result = self.prescreener.run(self.batch, 'filter')
+
+        self.assertEqual(result['scored'], 4)
+        self.assertEqual(self.statuses(), {
+            'strong.pdf': 'queued', 'good.pdf': 'queued', 'sales.pdf': 'prescreened_out', 'design.pdf': 'prescreened_out',
+        })
+        self.assertAlmostEqual(EvaluationJob.objects.get(id=self.jobs['strong.pdf'].id).prescreen_score, 1.0, places=5)
+        self.assertEqual(self.publisher.publish.call_count, 2)
+
+    def test_ranked_batch_is_held_back_then_dispatched_best_first(self):
+        """Test that a batch waits for its scores and its best CVs are evaluated first."""
+        self.batch.prescreen = 'rank'
+        self.batch.save()
+        scheduler = FairShareScheduler(max_in_flight=2)
+        self.assertEqual(scheduler.dispatch(lambda job_id: None), [])
+
+        self.prescreener.run(self.batch, 'rank')
+        EvaluationBatch.objects.filter(id=self.batch.id).update(prescreened_at=timezone.now())
+
+        self.assertEqual(scheduler.queue_position(EvaluationJob.objects.get(id=self.jobs['good.pdf'].id)), 1)
+        self.assertEqual(scheduler.dispatch(lambda job_id: None), [self.jobs['strong.pdf'].id, self.jobs['good.pdf'].id])
+        self.assertNotIn('prescreened_out', self.statuses().values())
+
+    def test_batch_whose_prescreen_was_lost_is_released(self):
+        """Test that a batch the pre-screen task never released is dispatched after the deadline."""
+        self.batch.prescreen = 'rank'
+        self.batch.save()
+        scheduler = FairShareScheduler(max_in_flight=2, prescreen_deadline=900)
+        self.assertEqual(scheduler.release_stalled_prescreens(), 0)
+
+        EvaluationBatch.objects.filter(id=self.batch.id).update(
+            created_at=timezone.now() - datetime.timedelta(seconds=1000),
+        )
+
+        self.assertEqual(scheduler.release_stalled_prescreens(), 1)
+        self.assertEqual(len(scheduler.dispatch(lambda job_id: None)), 2)
+
+    def test_embeddings_are_stored_and_shared_by_identical_uploads(self):
+        """Test that a CV is embedded once, even when uploaded again as a new file."""
+        self.prescreener.run(self.batch, 'rank')
+        resubmitted = UploadedFile.objects.create(file='uploads/strong.pdf', sha256='strong.pdf'.ljust(64, '0'))
+        batch = EvaluationBatch.objects.create(job_title='Backend Developer', prescreen='rank')
+        EvaluationJob.objects.create(batch=batch, job_title='Backend Developer', cv=resubmitted,
+                                     project_report=self.report, priority='bulk')
+
+        self.prescreener.run(batch, 'rank')
+        self.prescreener.run(self.batch, 'rank')
+
+        self.assertEqual(len(self.embeddings.embedded), 4)
+        resubmitted.refresh_from_db()
+        self.assertEqual(resubmitted.embedding_model, 'keywords')
+        self.assertEqual(len(np.frombuffer(resubmitted.embedding, dtype=np.float32)), 5)
+
+
+class EvaluateDocumentsTaskTests(SimpleTestCase):
+    """Test the evaluation Celery task."""
+
+    def test_deferred_job_is_retried_after_the_limiter_wait(self):
+        """Test that a job put back in the queue is retried after the limiter's expected wait."""
+        from celery.exceptions import Retry
+        from evaluations.tasks import container, evaluate_documents
+
+        use_case = mock.Mock()
+        use_case.execute.side_effect = RateLimitTimeout("No LLM request slot", retry_after=12)
+        with mock.patch.object(container, 'evaluate_candidate_use_case', return_value=use_case), \
+                mock.patch('evaluations.tasks.dispatch_bulk_jobs'), \
+                mock.patch.object(evaluate_documents, 'retry', side_effect=Retry) as retry:
+            with self.assertRaises(Retry):
+                evaluate_documents.run('job-1')
+
+        use_case.execute.assert_called_once_with('job-1', can_defer=True)
+        self.assertEqual(retry.call_args.kwargs['countdown'], 12)
+
+    def test_maintenance_tasks_are_routed_to_a_consumed_queue(self):
+        """Test that the periodic and maintenance tasks go to the bulk queue instead of the default one."""
+        from cv_screening.celery import app
+
+        for name in ('schedule_bulk_jobs', 'worker_health_check', 'reload_vector_store'):
+            route = app.amqp.router.route({}, f'evaluations.tasks.{name}')
+            self.assertEqual(route['queue'].name, 'bulk')
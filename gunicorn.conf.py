@@ -0,0 +1,17 @@
+# Gunicorn settings for the web process: `gunicorn -c gunicorn.conf.py cv_screening.wsgi:application`
+#
+# /api/result/<id>/wait/ holds a request for up to RESULT_LONG_POLL_TIMEOUT (25s) and
+# /api/result/<id>/events/ for up to RESULT_EVENT_STREAM_TIMEOUT (300s). With the
+# default sync worker each one blocks a whole process, so a few clients can starve
+# the API. gthread workers give each held request a thread instead; keep `threads`
+# above RESULT_MAX_OPEN_STREAMS so ordinary requests always find one free.
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+# gthread workers heartbeat from the main thread, so a long stream does not trip this.
+timeout = 120
+graceful_timeout = 30